@@ -8,12 +8,17 @@
 from PyQt5.QtQml import qmlRegisterType, qmlRegisterUncreatableType
 
 from .src.abstract_model import VAbstractNetworkDataModel
-from .src.action import VAbstractAsynchronousAction, VAsynchronousAction, VNetworkAction, VNetworkModelAction
+from .src.action import (VAbstractAsynchronousAction, VActionError, VAsynchronousAction, VNetworkAction,
+        VNetworkModelAction)
 from .src.client import VAbstractNetworkClient
-from .src.mixin import VAbstractNetworkDataModelMixin, VChildrenLoadingInfo, isAncestor, isDescendant
+from .src.mixin import (VAbstractNetworkDataModelMixin, VChildrenLoadingInfo, VChildrenLoadingTemplate, isAncestor,
+        isDescendant)
 from .src.namespace import Vns
 from .src.pagination import (VAbstractPagination, VAllTogetherPagination, VNothingPagination,
         VPagesAccumulationPagination, VPagesReplacementPagination)
+from .src.payload_cache import VPayloadCache
+from .src.subtree import VSubtreeLoadingAction
+from .src.tracing import VActionTracer
 
 
 author = 'Volkov Semyon'
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+
+Сравнение поиска действий над удаляемыми элементами: полный перебор всех действий с проверкой isDescendant()
+и реестр действий _VActionRegistry.
+
+10000 выполняющихся действий распределены по 100 родителям (по 100 подэлементов в каждом), затем
+по очереди ищутся действия над каждым родителем и его потомками.
+
+Запуск из каталога, содержащего репозиторий: python -m <каталог репозитория>.benchmarks.bench_action_registry
+"""
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication, QModelIndex
+from PyQt5.QtGui import QStandardItem, QStandardItemModel
+
+from ..src.mixin import _VActionRegistry, isDescendant
+
+PARENTS = 100
+CHILDREN = 100
+
+
+class _Action:
+    """Минимальная замена действия: реестру нужен только индекс элемента."""
+
+    def __init__(self, index: QModelIndex):
+        self.__index = index
+
+    def getIndex(self) -> QModelIndex:
+        return self.__index
+
+
+def main():
+    app = QCoreApplication.instance() or QCoreApplication([])
+    model = QStandardItemModel()
+    for _ in range(PARENTS):
+        parentItem = QStandardItem()
+        parentItem.appendRows([QStandardItem() for _ in range(CHILDREN)])
+        model.appendRow(parentItem)
+
+    actions = []
+    for row in range(PARENTS):
+        parent = model.index(row, 0)
+        actions.extend(_Action(model.index(childRow, 0, parent)) for childRow in range(CHILDREN))
+    registry = _VActionRegistry()
+    for action in actions:
+        registry.add(action)
+
+    start = time.perf_counter()
+    scanFound = 0
+    for row in range(PARENTS):
+        scanFound += sum(1 for action in actions
+                if isDescendant(action.getIndex(), QModelIndex(), row, row, 0, 0, inclusive=True))
+    scanTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    registryFound = 0
+    for row in range(PARENTS):
+        registryFound += len(registry.actionsForItems(QModelIndex(), row, row, 0, 0))
+    registryTime = time.perf_counter() - start
+
+    assert scanFound == registryFound == len(actions)
+    print("actions: %d, parents: %d" % (len(actions), PARENTS))
+    print("full scan: %.3f s" % scanTime)
+    print("registry:  %.3f s" % registryTime)
+    del app
+
+
+if __name__ == '__main__':
+    main()
@@ -6,17 +6,50 @@
 Автор: Волков Семён.
 """
 import json
+import os
+import sys
+import threading
+import time
 import traceback
+import weakref
+import zlib
 
-from typing import Any, Dict, List
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from PyQt5.QtCore import QAbstractItemModel, QModelIndex, QObject, Qt, pyqtProperty
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from PyQt5 import sip
+from PyQt5.QtCore import (QAbstractItemModel, QModelIndex, QObject, QPersistentModelIndex, Qt, QThread, QTimer,
+                          pyqtProperty, pyqtSignal, pyqtSlot)
 from PyQt5.QtGui import QStandardItem, QStandardItemModel
+from PyQt5.QtNetwork import QNetworkReply
 
 from .action import VNetworkModelAction
-from .mixin import VAbstractNetworkDataModelMixin, VChildrenLoadingInfo, VDetailsLoadingInfo
+from .mixin import VAbstractNetworkDataModelMixin, VChildrenLoadingInfo, VChildrenLoadingTemplate, VDetailsLoadingInfo
 from .namespace import Vns
-from .pagination import VAllTogetherPagination
+from .pagination import VAbstractPagination, VAllTogetherPagination
+from .payload_cache import VPayloadCache
+from .tracing import NULL_TRACE_SPAN
+
+
+# TODO: Пока так помечаем то, что должно быть помечено через макрос Q_INVOKABLE.
+vFromQmlInvokable = pyqtSlot
+
+
+class _VBuiltChildrenNotifier(QObject):
+    """Передает в поток модели результаты фонового построения подэлементов.
+
+    Сигнал испускается из рабочего потока, а объект живет в потоке модели, поэтому обработчик вызывается через очередь
+    событий потока модели.
+    """
+
+    built = pyqtSignal(object, object, arguments=['action', 'future'])
+    """Сигнал о завершении фонового построения подэлементов.
+
+    :param action: Действие загрузки подэлементов.
+    :param Future future: Результат построения - пара (список сырых словарей, список элементов или None).
+    """
 
 
 class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemModel):
@@ -46,6 +79,23 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
     отдельно от корня модели), наследники класса могут переопределить метод :func:`_createItem()`, установив в данные
     элементов экземпляры :class:`VChildrenLoadingInfo` для соответствующей роли `Vns.ItemDataRole._ChildrenLoadingInfo`.
 
+    Вместо отдельного экземпляра :class:`VChildrenLoadingInfo` в каждом элементе можно установить один общий
+    для всех элементов одного вида экземпляр :class:`VChildrenLoadingTemplate`. Тогда контейнер с информацией
+    о загрузке подэлементов и объект пагинации будут созданы только для тех элементов, к загрузке подэлементов
+    которых действительно обращались. Например:
+
+    .. sourcecode::
+
+        # from VNetworkData import VChildrenLoadingTemplate, VPagesAccumulationPagination, Vns
+
+        FOLDER_TEMPLATE = VChildrenLoadingTemplate(Vns.LoadingPolicy.Combined, VPagesAccumulationPagination)
+
+        def _createItem(self, rawDict: dict, columns: int = None) -> QStandardItem:
+            item = super()._createItem(rawDict, columns)
+            if rawDict["type"] == "folder":
+                item.setData(self.FOLDER_TEMPLATE, Vns.ItemDataRole._ChildrenLoadingInfo)
+            return item
+
     Переопределять можно и сразу оба указанных метода, и только один из них.
 
     Если вследствие переопределения обоих методов получится так, что на одном уровне будут содержаться подэлементы,
@@ -142,6 +192,63 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
         |    |- ...
         |- ...
 
+    Перезагрузка подэлементов.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    По умолчанию при перезагрузке подэлементов все загруженные подэлементы удаляются и вставляются заново,
+    поэтому теряются их загруженные подэлементы и подробные данные, а представления перестраиваются целиком.
+
+    Если установить ключевую функцию методом :func:`setChildrenKeyFunction()`, то новые подэлементы будут
+    сопоставляться с загруженными по ключу: исчезнувшие подэлементы удаляются, новые - вставляются,
+    переставленные - перемещаются, а у изменившихся обновляются данные. Неизменные подэлементы сохраняются
+    вместе со всем, что было в них загружено. Например:
+
+    .. sourcecode::
+
+        model.setChildrenKeyFunction(lambda itemDict: itemDict["id"])
+
+    Фоновое построение подэлементов.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Если включить режим :func:`setBackgroundItemBuilding()`, то разбор ответа сервера и построение элементов
+    (методы :func:`convertToListOfDicts()`, :func:`_prepareItemDict()`, :func:`_getListOfDictsForChildren()`,
+    :func:`_createItemsTree()` и :func:`_createItem()`) выполняются в пуле потоков, а в потоке модели остается
+    только вставка готовых строк.
+
+    .. warning::
+        В этом режиме перечисленные методы не должны создавать объекты :class:`QObject` (например, пагинацию) и
+        обращаться к модели: вместо экземпляров :class:`VChildrenLoadingInfo` в элементы следует устанавливать
+        общие шаблоны :class:`VChildrenLoadingTemplate`.
+
+    Бюджет памяти.
+    ~~~~~~~~~~~~~~
+
+    Загруженные подэлементы хранятся в модели, пока их родитель не перезагрузит их, поэтому при долгом обходе
+    большой иерархии модель растет без ограничений. Если установить бюджет методом :func:`setMemoryBudget()`,
+    то при его превышении модель выгружает подэлементы элементов, загружаемые отдельно, начиная с тех, к которым
+    дольше всего не обращались: подэлементы удаляются, а загрузка подэлементов сбрасывается, чтобы они загрузились
+    заново по требованию.
+
+    Не выгружаются подэлементы на путях к видимым строкам (смотри :func:`setVisibleRows()`), к элементам,
+    над которыми совершаются действия, и к защищенным элементам (смотри :func:`setProtectedIndexes()`), например,
+    к выделенным, текущему и развернутым элементам представления.
+
+    Снимок модели.
+    ~~~~~~~~~~~~~~
+
+    Загруженное дерево можно сохранить в файл методом :func:`saveSnapshot()` (вместе с данными элементов,
+    состоянием пагинации подэлементов, признаками загруженности подробных данных и валидаторами ответов) и при
+    следующем запуске восстановить методом :func:`restoreSnapshot()`: представления сразу показывают данные
+    из снимка, а модель затем перепроверяет их в фоне. Например:
+
+    .. sourcecode::
+
+        model.setChildrenKeyFunction(lambda itemDict: itemDict["id"])
+        if not model.restoreSnapshot(path):
+            model.reloadChildren()
+        ...
+        model.saveSnapshot(path)
+
     Загрузка подробных данных об элементах.
     ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
@@ -191,8 +298,17 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
     # networkClient = pyqtProperty(type=VAbstractNetworkClient, fget=getNetworkClient, fset=setNetworkClient,
     #         notify=networkClientChanged, doc="Сетевой клиент, обеспечивающий взаимодействие с сервером.")
 
+    childrenUnloaded = pyqtSignal(QModelIndex, arguments=['parent'])
+    """Сигнал о выгрузке подэлементов для соблюдения бюджета памяти (смотри :func:`setMemoryBudget()`).
+
+    :param QModelIndex parent: Модельный индекс элемента, подэлементы которого были выгружены.
+    """
+
     ZERO_COLUMN = 0
 
+    MAX_ITEM_BUILDING_THREADS = 4
+    """Максимальное количество потоков фонового построения подэлементов."""
+
     def __init__(self, parent: QObject = None):
         super().__init__(parent)
 
@@ -202,6 +318,34 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
         self.__rootChildrenLoadingInfo = self._createRootChildrenLoadingInfo()
         self.__localDataModel = self._createLocalDataModel()
 
+        self.__payloadCache = None  # Кэш разобранных данных сетевых ответов (по умолчанию не используется).
+        self.__childrenKeyFunction = None  # Ключевая функция для сопоставления подэлементов при их перезагрузке.
+
+        # Фоновое построение подэлементов (смотри setBackgroundItemBuilding()):
+        self.__backgroundItemBuilding = False
+        self.__itemBuildingExecutor = None  # Пул потоков создается при первом фоновом построении.
+        self.__builtChildren = dict()  # Действие загрузки -> пара (список сырых словарей, список элементов или None).
+        self.__builtChildrenNotifier = _VBuiltChildrenNotifier(self)
+        self.__builtChildrenNotifier.built.connect(self._handleChildrenBuilt)
+
+        # Бюджет памяти (смотри setMemoryBudget()):
+        self.__memoryBudget = -1  # Без ограничения.
+        self.__memoryUsage = 0  # Сумма оценок размеров строк модели, хранящей локальные данные.
+        # Постоянные индексы элементов, подэлементы которых загружаются отдельно, от давнего обращения к недавнему.
+        self.__childrenAccesses = OrderedDict()
+        self.__protectedIndexes = []
+        self.__memoryBudgetTimer = QTimer(self)  # Таймер отложенной выгрузки подэлементов в конце круга цикла событий.
+        self.__memoryBudgetTimer.setSingleShot(True)
+        self.__memoryBudgetTimer.setInterval(0)
+        self.__memoryBudgetTimer.timeout.connect(self._enforceMemoryBudget)
+        # Количество элементов в модели, хранящей локальные данные (для счетчиков), None - если его надо пересчитать.
+        self.__heldItemsCount = 0
+        self.__localDataModel.rowsInserted.connect(self._handleLocalRowsInserted)
+        self.__localDataModel.rowsAboutToBeRemoved.connect(self._handleLocalRowsAboutToBeRemoved)
+        self.__localDataModel.modelReset.connect(self._recountMemoryUsage)
+        self.childrenLoadingFinished.connect(self._touchChildren)
+        self.modelReset.connect(self.__childrenAccesses.clear)
+
     def _createRootChildrenLoadingInfo(self) -> VChildrenLoadingInfo:
         """Создает и возвращает контейнер со вспомогательной (служебной) информацией о загрузке подэлементов
         корня модели.
@@ -395,7 +539,7 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
             indexWithZeroColumn = self.sibling(index.row(), self.ZERO_COLUMN, index)
             if self.__localDataModel.setData(self._mapToLocal(indexWithZeroColumn), value, role):
                 indexWithLastColumn = self.sibling(index.row(), self.columnCount(index.parent()) - 1, index)
-                self.dataChanged.emit(indexWithZeroColumn, indexWithLastColumn, [])
+                self._emitDataChanged(indexWithZeroColumn, indexWithLastColumn, [])
                 return True
             return False
         elif role == Vns.ItemDataRole._ChildrenLoadingInfo:
@@ -407,7 +551,7 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
             # TODO: Для какого индекса надо устанавливать политику: для index или для indexWithZeroColumn?
             if self.setChildrenLoadingPolicy(value, index):
                 # TODO: Какие индексы должны быть в сигнале?
-                self.dataChanged.emit(index, index, [role])
+                self._emitDataChanged(index, index, [role])
                 return True
             return False
         elif role == Vns.ItemDataRole.ChildrenLoadingState:
@@ -430,21 +574,6 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
 
         return self.__localDataModel.setData(self._mapToLocal(index), value, role)
 
-    # def sendData(self, index: QModelIndex, value, role=None) -> VAbstractAsynchronousAction:
-    #     """Запускает асинхронное изменение данных по сети в удаленном хранилище.
-    #
-    #     sendData(self, index: QModelIndex, value: dict) -> VAbstractAsynchronousAction.
-    #     sendData(self, index: QModelIndex, value: Any, role: int) -> VAbstractAsynchronousAction.
-    #     sendData(self, index: QModelIndex, value: Any, role: str) -> VAbstractAsynchronousAction.
-    #     sendData(self, index: QModelIndex, value: Any, role: list[str]) -> VAbstractAsynchronousAction.
-    #
-    #     В базовой реализации ничего не делает и возвращает действие, которое сразу испустит сигнал завершения с ошибкой.
-    #     """
-    #     assert isinstance(index, QModelIndex)  # Это только чтобы хоть как-то использовать аргумент.
-    #     assert isinstance(value, object)  # Это только чтобы хоть как-то использовать аргумент.
-    #     assert isinstance(role, object)  # Это только чтобы хоть как-то использовать аргумент.
-    #     return self._createAction()
-
     # def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
     #     """Переопределяет соответствующий родительский метод."""
     #     if self.childrenAreLoadedSeparately(parent):
@@ -492,15 +621,41 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
             то есть для случая с некорректным модельным индексом `index`.
 
             Результат этого метода для случаев с корректным модельным индексом `index` зависит от того, установлен ли
-            экземпляр :class:`VChildrenLoadingInfo` в элемент, соответствующий этому модельному индексу.
+            экземпляр :class:`VChildrenLoadingInfo` (или :class:`VChildrenLoadingTemplate`) в элемент,
+            соответствующий этому модельному индексу.
 
             Смотри описание метода :func:`_createItem()`.
+
+        .. note::
+            Если в элементе установлен шаблон :class:`VChildrenLoadingTemplate`, то по нему создается контейнер,
+            который заменяет шаблон в элементе.
         """
         if not index.isValid():
             return self.__rootChildrenLoadingInfo
 
         indexWithZeroColumn = self.sibling(index.row(), self.ZERO_COLUMN, index)
-        return self.__localDataModel.data(self._mapToLocal(indexWithZeroColumn), Vns.ItemDataRole._ChildrenLoadingInfo)
+        localIndex = self._mapToLocal(indexWithZeroColumn)
+        info = self.__localDataModel.data(localIndex, Vns.ItemDataRole._ChildrenLoadingInfo)
+        if isinstance(info, VChildrenLoadingTemplate):
+            info = info.createInfo()
+            self.__localDataModel.itemFromIndex(localIndex).setData(info, Vns.ItemDataRole._ChildrenLoadingInfo)
+        return info
+
+    @vFromQmlInvokable(result=bool)
+    @vFromQmlInvokable(QModelIndex, result=bool)
+    def childrenAreLoadedSeparately(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Переопределяет соответствующий родительский метод.
+
+        В отличие от :func:`_getChildrenLoadingInfo()` не создает контейнер по шаблону
+        :class:`VChildrenLoadingTemplate`, поэтому, например, :func:`hasChildren()` для нетронутых элементов
+        обходится без создания объектов.
+        """
+        if not parent.isValid():
+            return self._getChildrenLoadingInfo(parent) is not None
+
+        indexWithZeroColumn = self.sibling(parent.row(), self.ZERO_COLUMN, parent)
+        return self.__localDataModel.data(self._mapToLocal(indexWithZeroColumn),
+                Vns.ItemDataRole._ChildrenLoadingInfo) is not None
 
     # def clear(self):
     #     """Сбрасывает модель в незагруженное состояние."""
@@ -565,10 +720,877 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
         в элемент с модельным индексом `parent`.
 
         Возвращает True - если создание и вставка завершились успешно, иначе - возвращает False.
+
+        .. note::
+            Если подэлементы были построены в фоне (смотри :func:`setBackgroundItemBuilding()`), то вставляются
+            готовые элементы.
         """
-        listOfDicts = self.convertToListOfDicts(action.replyBodyStringData())
+        built = self.__builtChildren.pop(action, None)
+        if built is not None:
+            listOfDicts, rows = built
+            if listOfDicts is None:
+                return False
+            if rows is None:
+                return self._appendChildrenRows(parent, listOfDicts)
+            parentItem = self.__localDataModel.invisibleRootItem() if not parent.isValid() \
+                else self.__localDataModel.itemFromIndex(self._mapToLocal(parent))
+            if parentItem is None:
+                return False
+            self._insertChildrenItems(parentItem, rows)
+            return True
+
+        with self._traceSpan("decode") as span:
+            if span.isEnabled():
+                span.setArg("bytes", len(action.replyBodyRawData()))
+            listOfDicts = self._convertReplyPayload(action, self.convertToListOfDicts)
         return self._appendChildrenRows(parent, listOfDicts)
 
+    # ==== memory budget ====
+
+    def memoryBudget(self) -> int:
+        """Возвращает бюджет памяти модели в единицах оценки размеров строк (-1 - без ограничения).
+
+        Смотри :func:`setMemoryBudget()`.
+        """
+        return self.__memoryBudget
+
+    def setMemoryBudget(self, budget: int):
+        """Устанавливает бюджет памяти модели `budget` в единицах оценки размеров строк (-1 - без ограничения).
+
+        По умолчанию каждая строка весит 1, то есть бюджет задается в количестве элементов. Чтобы задавать бюджет
+        в байтах, наследники класса могут переопределить метод :func:`_estimateRowSize()`.
+        """
+        assert budget >= -1
+        if budget == self.__memoryBudget:
+            return
+        # Пока бюджета нет, использование памяти и обращения к подэлементам не отслеживаются.
+        enabling = self.__memoryBudget == -1
+        self.__memoryBudget = budget
+        if enabling or budget == -1:
+            self._recountMemoryUsage()
+            self.__childrenAccesses.clear()
+        if enabling:
+            # Уже загруженные подэлементы считаем одинаково давними (в порядке обхода модели).
+            stack = [QModelIndex()]
+            while stack:
+                parent = stack.pop()
+                for row in range(self.rowCount(parent)):
+                    index = self.index(row, self.ZERO_COLUMN, parent)
+                    if self.rowCount(index):
+                        self._touchChildren(index)
+                        stack.append(index)
+        self._scheduleMemoryBudgetEnforcement()
+
+    def memoryUsage(self) -> int:
+        """Возвращает оценку размера загруженных данных в единицах оценки размеров строк
+        (отслеживается только при установленном бюджете памяти)."""
+        return self.__memoryUsage
+
+    def protectedIndexes(self) -> List[QModelIndex]:
+        """Возвращает список модельных индексов защищенных элементов, пути к которым не выгружаются."""
+        return [QModelIndex(index) for index in self.__protectedIndexes if index.isValid()]
+
+    def setProtectedIndexes(self, indexes: List[QModelIndex]):
+        """Устанавливает список модельных индексов `indexes` защищенных элементов: подэлементы этих элементов
+        и всех их предков не выгружаются для соблюдения бюджета памяти.
+
+        Обычно сюда передают выделенные, текущий и развернутые элементы представления.
+        """
+        assert all(index.model() is self for index in indexes)
+        self.__protectedIndexes = [QPersistentModelIndex(index) for index in indexes]
+
+    @vFromQmlInvokable(QModelIndex)
+    def touchChildren(self, parent: QModelIndex):
+        """Отмечает обращение к подэлементам элемента с модельным индексом `parent`, откладывая их выгрузку
+        для соблюдения бюджета памяти."""
+        assert parent.model() is self if parent.isValid() else True
+        self._touchChildren(parent)
+
+    def _touchChildren(self, parent: QModelIndex):
+        """Переопределяет соответствующий родительский метод.
+
+        Переносит элемент в конец очереди выгрузки.
+        """
+        if not parent.isValid() or self.__memoryBudget == -1 or not self.childrenAreLoadedSeparately(parent):
+            return
+        key = QPersistentModelIndex(self.sibling(parent.row(), self.ZERO_COLUMN, parent))
+        self.__childrenAccesses.pop(key, None)
+        self.__childrenAccesses[key] = None
+
+    def _estimateRowSize(self, item: QStandardItem) -> int:
+        """Возвращает оценку размера строки с элементом `item` (без учета ее подэлементов) для бюджета памяти.
+
+        .. note::
+            Базовая реализация возвращает 1. Наследники класса могут вернуть, например, примерный размер строки
+            в байтах.
+        """
+        return 1
+
+    def _estimateSubtreeSize(self, item: QStandardItem, first: int, last: int) -> int:
+        """Возвращает оценку размера строк элемента `item` с `first` по `last` включительно вместе со всеми их
+        подэлементами."""
+        size = 0
+        stack = [item.child(row) for row in range(first, last + 1)]
+        while stack:
+            child = stack.pop()
+            if child is None:
+                continue
+            size += self._estimateRowSize(child)
+            stack.extend(child.child(row) for row in range(child.rowCount()))
+        return size
+
+    @staticmethod
+    def _countSubtreeItems(item: QStandardItem, first: int, last: int) -> int:
+        """Возвращает количество элементов в строках элемента `item` с `first` по `last` включительно вместе со всеми
+        их подэлементами."""
+        count = 0
+        stack = [item.child(row) for row in range(first, last + 1)]
+        while stack:
+            child = stack.pop()
+            if child is None:
+                continue
+            count += 1
+            stack.extend(child.child(row) for row in range(child.rowCount()))
+        return count
+
+    def _recountMemoryUsage(self):
+        """Пересчитывает оценку размера загруженных данных (количество хранимых элементов пересчитывается
+        при следующем обращении к нему)."""
+        root = self.__localDataModel.invisibleRootItem()
+        self.__memoryUsage = self._estimateSubtreeSize(root, 0, root.rowCount() - 1) \
+            if self.__memoryBudget != -1 else 0
+        self.__heldItemsCount = None
+
+    def _handleLocalRowsInserted(self, localParent: QModelIndex, first: int, last: int):
+        """Учитывает вставленные в модель, хранящую локальные данные, строки в оценке размера загруженных данных
+        и в количестве хранимых элементов."""
+        # Поддеревья вставленных строк обходятся, только если их количество понадобится (смотри getHeldItemsCount()).
+        self.__heldItemsCount = None
+        if self.__memoryBudget == -1:
+            return
+        item = self.__localDataModel.itemFromIndex(localParent) if localParent.isValid() \
+            else self.__localDataModel.invisibleRootItem()
+        self.__memoryUsage += self._estimateSubtreeSize(item, first, last)
+        if self.__memoryUsage > self.__memoryBudget:
+            self._scheduleMemoryBudgetEnforcement()
+
+    def _handleLocalRowsAboutToBeRemoved(self, localParent: QModelIndex, first: int, last: int):
+        """Исключает удаляемые из модели, хранящей локальные данные, строки из оценки размера загруженных данных
+        и из количества хранимых элементов."""
+        self.__heldItemsCount = None
+        if self.__memoryBudget == -1:
+            return
+        item = self.__localDataModel.itemFromIndex(localParent) if localParent.isValid() \
+            else self.__localDataModel.invisibleRootItem()
+        self.__memoryUsage -= self._estimateSubtreeSize(item, first, last)
+
+    def getHeldItemsCount(self) -> int:
+        """Переопределяет соответствующий родительский метод.
+
+        Возвращает количество элементов в модели, хранящей локальные данные, вместе со всеми подэлементами.
+
+        .. note::
+            Количество пересчитывается обходом модели только при обращении к нему после вставки или удаления строк,
+            чтобы не замедлять сами вставку и удаление.
+        """
+        if self.__heldItemsCount is None:
+            root = self.__localDataModel.invisibleRootItem()
+            self.__heldItemsCount = self._countSubtreeItems(root, 0, root.rowCount() - 1)
+        return self.__heldItemsCount
+
+    def _scheduleMemoryBudgetEnforcement(self):
+        """Откладывает выгрузку подэлементов до конца текущего круга цикла событий, чтобы не удалять строки
+        посреди обработки загрузки."""
+        if self.__memoryBudget != -1 and self.__memoryUsage > self.__memoryBudget:
+            self.__memoryBudgetTimer.start()
+
+    def _protectedKeys(self) -> set:
+        """Возвращает множество постоянных индексов (в нулевом столбце) элементов, подэлементы которых нельзя
+        выгружать: защищенных, выделенных и текущего элементов, родителей видимых строк, элементов, над которыми
+        совершаются действия, и всех их предков."""
+        indexes = [QModelIndex(index) for index in self.__protectedIndexes if index.isValid()]
+        indexes.extend(self.focusedIndexes())
+        indexes.extend(parent for parent, first, last in self._visibleRows())
+        indexes.extend(action.getIndex() for action in self._actions() if action.isValid())
+        keys = set()
+        for index in indexes:
+            while index.isValid():
+                key = QPersistentModelIndex(self.sibling(index.row(), self.ZERO_COLUMN, index))
+                if key in keys:
+                    break
+                keys.add(key)
+                index = index.parent()
+        return keys
+
+    def _enforceMemoryBudget(self):
+        """Выгружает подэлементы элементов, к которым дольше всего не обращались, пока оценка размера загруженных
+        данных превышает бюджет памяти."""
+        if self.__memoryBudget == -1 or self.__memoryUsage <= self.__memoryBudget:
+            return
+        protectedKeys = self._protectedKeys()
+        for key in list(self.__childrenAccesses):
+            if self.__memoryUsage <= self.__memoryBudget:
+                break
+            if not key.isValid():
+                # Элемент был удален (в том числе вместе с выгруженным ранее предком).
+                del self.__childrenAccesses[key]
+                continue
+            if key in protectedKeys:
+                continue
+            parent = QModelIndex(key)
+            if not self.rowCount(parent):
+                del self.__childrenAccesses[key]
+                continue
+            if self._resetChildren(parent):
+                del self.__childrenAccesses[key]
+                self.childrenUnloaded.emit(parent)
+
+    # ==== snapshot ====
+
+    SNAPSHOT_MAGIC = b"VND1"
+    """Сигнатура в начале файла снимка модели."""
+
+    SNAPSHOT_VERSION = 2
+    """Версия формата снимка модели."""
+
+    def saveSnapshot(self, path: str) -> bool:
+        """Сохраняет загруженное дерево модели в файл `path`.
+        Возвращает True - если снимок сохранен успешно, False - иначе.
+
+        Снимок содержит словари данных элементов, политику, пагинацию и валидаторы загрузки подэлементов
+        и признаки загруженности, возраст и валидаторы подробных данных. Снимок сжимается и записывается
+        атомарно (через временный файл), поэтому прерванное сохранение не портит предыдущий снимок.
+
+        .. warning::
+            Снимок сохраняется в формате JSON, поэтому словари данных элементов должны состоять из значений,
+            представимых в JSON, а состояние пагинаций (смотри :func:`VAbstractPagination._saveState()`) -
+            из таких же значений.
+        """
+        temporaryPath = path + ".tmp"
+        try:
+            snapshot = {
+                "version": self.SNAPSHOT_VERSION,
+                "savedAt": time.time(),
+                "root": self._saveChildrenLoadingState(self._getChildrenLoadingInfo(QModelIndex())),
+                "rows": self._saveSnapshotRows(QModelIndex(), dict()),
+            }
+            data = zlib.compress(json.dumps(snapshot, ensure_ascii=False).encode("utf-8"))
+            with open(temporaryPath, "wb") as file:
+                file.write(self.SNAPSHOT_MAGIC)
+                file.write(data)
+            os.replace(temporaryPath, path)
+        except Exception:
+            traceback.print_exc()
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+            return False
+        return True
+
+    def restoreSnapshot(self, path: str, revalidate: bool = True) -> bool:
+        """Заменяет все загруженные данные модели деревом из снимка в файле `path` (смотри :func:`saveSnapshot()`).
+        Возвращает True - если снимок восстановлен успешно, False - иначе (модель при этом не меняется).
+        Отсутствие файла `path` (например, при первом запуске приложения) ошибкой не считается.
+
+        Если `revalidate` равен True, то после восстановления модель в фоне перезагружает подэлементы
+        восстановленных элементов, если установлена ключевая функция (смотри :func:`setChildrenKeyFunction()`),
+        а подробные данные считаются устаревшими и перепроверяются для видимых элементов
+        (смотри :func:`setDetailsTimeToLive()`). Иначе подробные данные устаревают по своему времени жизни
+        с учетом возраста снимка.
+
+        .. note::
+            Элементы восстанавливаются без вызова :func:`_createItem()` (смотри :func:`_createSnapshotItem()`):
+            словари данных в снимке уже обработаны, а сведения о загрузке подэлементов и подробных данных
+            восстанавливаются из самого снимка. Пагинации подэлементов создаются по именам их классов только
+            из уже импортированных модулей.
+
+        .. note::
+            Снимок нельзя восстановить, пока над моделью совершаются действия.
+        """
+        if self._actions():
+            return False
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            if not data.startswith(self.SNAPSHOT_MAGIC):
+                return False
+            snapshot = json.loads(zlib.decompress(data[len(self.SNAPSHOT_MAGIC):]).decode("utf-8"))
+            if snapshot["version"] != self.SNAPSHOT_VERSION:
+                return False
+            # Моменты загрузки подробных данных переносим на часы этого запуска с учетом возраста снимка.
+            snapshotAge = max(time.time() - snapshot["savedAt"], 0.0)
+            restoredItems = []
+            # Дерево строится до сброса модели, чтобы испорченный снимок не оставил модель наполовину восстановленной.
+            items = self._restoreSnapshotRows(snapshot["rows"], max(self.columnCount(), 1), snapshotAge, revalidate,
+                    restoredItems, dict())
+        except FileNotFoundError:  # Снимок еще не сохранялся.
+            return False
+        except Exception:
+            traceback.print_exc()
+            return False
+
+        self.beginResetModel()
+        root = self.__localDataModel.invisibleRootItem()
+        root.removeRows(0, root.rowCount())
+        root.appendRows(items)
+        rootInfo = self._getChildrenLoadingInfo(QModelIndex())
+        self._restoreChildrenLoadingState(rootInfo, snapshot["root"])
+        self.endResetModel()
+
+        # Постоянные индексы, созданные во время сброса модели, становятся недействительными после него.
+        restoredParents = [QPersistentModelIndex(self._mapFromLocal(item.index())) for item in restoredItems]
+        for key in restoredParents:
+            self._touchChildren(QModelIndex(key))
+        self._scheduleMemoryBudgetEnforcement()
+        if revalidate:
+            QTimer.singleShot(0, lambda: self._revalidateRestoredChildren([None] + restoredParents))
+        return True
+
+    def _saveChildrenLoadingState(self, info: VChildrenLoadingInfo) -> dict or None:
+        """Возвращает состояние загрузки подэлементов из информации `info` для снимка модели
+        или None, если подэлементы еще не загружались."""
+        if not info.pagination.hasLoadedData():
+            return None
+        return {"policy": int(info.policy), "pagination": info.pagination._saveState(),
+                "validators": self._encodeSnapshotValidators(info.validators)}
+
+    def _restoreChildrenLoadingState(self, info: VChildrenLoadingInfo, state: dict or None):
+        """Восстанавливает состояние загрузки подэлементов `state` из снимка модели в информацию `info`."""
+        info.inReloading = False
+        info.pageStates.clear()
+        info.state = Vns.LoadingState.Idle
+        if state is None:
+            info.pagination._resetAll()
+            info.validators = dict()
+            return
+        info.policy = Vns.LoadingPolicy(state["policy"])
+        info.pagination._restoreState(state["pagination"])
+        info.validators = self._decodeSnapshotValidators(state["validators"])
+
+    @staticmethod
+    def _encodeSnapshotValidators(validators: Dict[bytes, bytes]) -> Dict[str, str]:
+        """Возвращает валидаторы `validators` в виде, представимом в JSON (байты без потерь переводятся в latin-1)."""
+        return {name.decode("latin-1"): value.decode("latin-1") for name, value in validators.items()}
+
+    @staticmethod
+    def _decodeSnapshotValidators(validators: Dict[str, str]) -> Dict[bytes, bytes]:
+        """Возвращает валидаторы, сохраненные методом :func:`_encodeSnapshotValidators()`."""
+        return {name.encode("latin-1"): value.encode("latin-1") for name, value in validators.items()}
+
+    @staticmethod
+    def _snapshotPaginationClass(name: str) -> type:
+        """Возвращает класс пагинации по имени `name` вида "модуль:класс" из снимка модели.
+
+        Модуль не импортируется (ищется только среди уже импортированных), чтобы снимок не мог выполнить чужой код.
+        """
+        moduleName, _, qualName = name.partition(":")
+        value = sys.modules[moduleName]
+        for attribute in qualName.split("."):
+            value = getattr(value, attribute)
+        if not (isinstance(value, type) and issubclass(value, VAbstractPagination)):
+            raise TypeError("%s is not a pagination class" % name)
+        return value
+
+    def _saveSnapshotChildrenLoading(self, index: QModelIndex, paginationClasses: Dict[int, type]) -> dict or None:
+        """Возвращает описание загрузки подэлементов элемента с модельным индексом `index` для снимка модели
+        или None, если подэлементы элемента не загружаются отдельно.
+
+        :param paginationClasses: Классы пагинаций уже сохраненных шаблонов (идентификатор шаблона -> класс).
+        """
+        localIndex = self._mapToLocal(self.sibling(index.row(), self.ZERO_COLUMN, index))
+        info = self.__localDataModel.data(localIndex, Vns.ItemDataRole._ChildrenLoadingInfo)
+        if isinstance(info, VChildrenLoadingTemplate):
+            paginationClass = paginationClasses.get(id(info))
+            if paginationClass is None:
+                factory = info.paginationFactory
+                paginationClass = factory if isinstance(factory, type) else type(factory())
+                paginationClasses[id(info)] = paginationClass
+            template, state = True, None  # По шаблону подэлементы еще не загружались.
+        elif isinstance(info, VChildrenLoadingInfo):
+            paginationClass = type(info.pagination)
+            template, state = False, self._saveChildrenLoadingState(info)
+        else:
+            return None
+        return {"template": template, "policy": int(info.policy),
+                "paginationClass": "%s:%s" % (paginationClass.__module__, paginationClass.__qualname__),
+                "state": state}
+
+    def _saveSnapshotRows(self, parent: QModelIndex, paginationClasses: Dict[int, type]) -> List[dict]:
+        """Возвращает список узлов снимка модели для подэлементов элемента с модельным индексом `parent`.
+
+        Каждый узел - это словарь с словарем данных элемента (`item`), описанием загрузки подэлементов (`children`,
+        смотри :func:`_saveSnapshotChildrenLoading()`), описанием подробных данных (`details`) и списком узлов
+        подэлементов (`rows`).
+        """
+        rows = []
+        for row in range(self.rowCount(parent)):
+            index = self.index(row, self.ZERO_COLUMN, parent)
+            details = None
+            info = self._getDetailsLoadingInfo(index)
+            if info is not None:
+                details = {"timeToLive": info.timeToLive, "loaded": info.loaded}
+                if info.loaded:
+                    details["age"] = time.monotonic() - info.loadedAt
+                    details["validators"] = self._encodeSnapshotValidators(info.validators)
+            rows.append({
+                "item": self.data(index, Vns.ItemDataRole.ItemDict),
+                "children": self._saveSnapshotChildrenLoading(index, paginationClasses),
+                "details": details,
+                "rows": self._saveSnapshotRows(index, paginationClasses),
+            })
+        return rows
+
+    def _createSnapshotItem(self, itemDict: dict, columns: int) -> QStandardItem:
+        """Создает и возвращает элемент с уже обработанным словарем данных `itemDict` из снимка модели
+        (смотри :func:`restoreSnapshot()`) и `columns` столбцами."""
+        item = QStandardItem()
+        item.setData(itemDict, Vns.ItemDataRole.ItemDict)
+        item.setColumnCount(columns)
+        return item
+
+    def _restoreSnapshotRows(self, rows: List[dict], columns: int, snapshotAge: float, revalidate: bool,
+            restoredItems: List[QStandardItem],
+            templates: Dict[tuple, VChildrenLoadingTemplate]) -> List[QStandardItem]:
+        """Создает и возвращает элементы (вместе с их подэлементами) из узлов снимка модели `rows`.
+
+        Элементы с восстановленными отдельно загруженными подэлементами добавляются в список `restoredItems`.
+
+        :param columns: Количество столбцов элементов - количество столбцов их родителя.
+        :param templates: Уже созданные шаблоны загрузки подэлементов ((политика, класс пагинации) -> шаблон),
+                          чтобы элементы одного вида, как и до сохранения, разделяли один шаблон.
+        """
+        now = time.monotonic()
+        items = []
+        for row in rows:
+            item = self._createSnapshotItem(row["item"], columns)
+            children = row["children"]
+            if children is not None:
+                policy = Vns.LoadingPolicy(children["policy"])
+                paginationClass = self._snapshotPaginationClass(children["paginationClass"])
+                if children["template"]:
+                    info = templates.get((policy, paginationClass))
+                    if info is None:
+                        info = templates[(policy, paginationClass)] = VChildrenLoadingTemplate(policy, paginationClass)
+                else:
+                    info = VChildrenLoadingInfo(policy, paginationClass())
+                    self._restoreChildrenLoadingState(info, children["state"])
+                    if children["state"] is not None:
+                        restoredItems.append(item)
+                item.setData(info, Vns.ItemDataRole._ChildrenLoadingInfo)
+            details = row["details"]
+            if details is not None:
+                info = VDetailsLoadingInfo()
+                info.timeToLive = details["timeToLive"]
+                if details["loaded"]:
+                    info.loaded = True
+                    info.validators = self._decodeSnapshotValidators(details["validators"])
+                    info.loadedAt = now - details["age"] - snapshotAge
+                    info.expiresAt = now if revalidate else self._detailsExpirationTime(info)
+                item.setData(info, Vns.ItemDataRole._DetailsLoadingInfo)
+            if row["rows"]:
+                item.appendRows(self._restoreSnapshotRows(row["rows"], item.columnCount(), snapshotAge, revalidate,
+                        restoredItems, templates))
+            items.append(item)
+        return items
+
+    def _revalidateRestoredChildren(self, keys: List[QPersistentModelIndex or None]):
+        """Перезагружает в фоне подэлементы восстановленных из снимка элементов (None - корень модели).
+
+        Перезагружаются только подэлементы элементов, которые сопоставляются по ключу (смотри
+        :func:`_reconcilesChildren()`), чтобы не терять восстановленные поддеревья. Как и при обычной перезагрузке,
+        при постраничной пагинации перезагружается только первая порция. Загрузки проходят через очередь загрузок
+        подэлементов (смотри :func:`setMaxConcurrentChildrenLoads()`).
+        """
+        for key in keys:
+            if key is not None and not key.isValid():
+                continue  # Элемент был удален, пока ждал перепроверки.
+            parent = QModelIndex(key) if key is not None else QModelIndex()
+            if self._reconcilesChildren(parent) and (self._canReloadChildren(parent, Vns.LoadingPolicy.Automatically)
+                    or self._canReloadChildren(parent, Vns.LoadingPolicy.Manually)):
+                self.reloadChildren(parent)
+
+    # ==== building of children in background ====
+
+    def backgroundItemBuilding(self) -> bool:
+        """Возвращает True - если подэлементы строятся в пуле потоков, False - иначе."""
+        return self.__backgroundItemBuilding
+
+    def setBackgroundItemBuilding(self, enabled: bool):
+        """Включает (`enabled` = True) или выключает построение подэлементов в пуле потоков.
+
+        В этом режиме по завершении сетевого ответа разбор его тела и построение элементов выполняются в пуле
+        из не более чем :attr:`MAX_ITEM_BUILDING_THREADS` потоков, а в потоке модели выполняется только вставка
+        готовых строк. Результаты построения для действий, ставших недействительными (например, из-за удаления
+        элемента или сброса модели), отбрасываются.
+
+        Смотри предупреждение в описании класса о методах, выполняемых в рабочих потоках.
+
+        При выключении режима пул потоков завершается (уже запущенные построения доводятся до конца).
+        """
+        self.__backgroundItemBuilding = enabled
+        if not enabled and self.__itemBuildingExecutor is not None:
+            self.__itemBuildingExecutor.shutdown(wait=False)
+            self.__itemBuildingExecutor = None
+
+    def _startBuildingChildren(self, parent: QModelIndex, action: VNetworkModelAction) -> bool:
+        """Переопределяет соответствующий родительский метод.
+
+        Тело и кодировка ответа, а также разобранные данные из кэша (смотри :func:`setPayloadCache()`) считываются
+        в потоке модели, а в рабочем потоке выполняются только разбор тела и построение элементов.
+        """
+        if not self.__backgroundItemBuilding or action in self.__builtChildren:
+            return False
+        if action.replyErrorType() != QNetworkReply.NoError:
+            return False
+        parentItem = self.__localDataModel.invisibleRootItem() if not parent.isValid() \
+            else self.__localDataModel.itemFromIndex(self._mapToLocal(parent))
+        if parentItem is None:
+            return False
+
+        convert = self.convertToListOfDicts
+        cache = self.__payloadCache
+        key = self._payloadCacheKey(action, convert) if cache is not None else None
+        cachedListOfDicts = cache.getCopy(key) if key is not None else None
+        action.replyBodyRawData()
+        action._replyBodyEncoding()  # Заголовки ответа читаем в потоке модели.
+
+        # При сопоставлении подэлементов по ключу элементы создаются только для новых подэлементов.
+        info = self._getChildrenLoadingInfo(parent)
+        buildRows = not (self._reconcilesChildren(parent)
+                         and (info.inReloading or info.pagination.mustRemoveLoadedDataWhenLoadingNewData()))
+        columns = parentItem.columnCount()
+        if columns < 1:
+            columns = 1
+
+        def build() -> Tuple[List[dict], List[QStandardItem] or None]:
+            listOfDicts = cachedListOfDicts
+            if listOfDicts is None:
+                with self._countingTime("parse"):
+                    listOfDicts = self._parseReplyPayload(action, convert)
+                if key is not None:
+                    cache.put(key, listOfDicts)
+            rows = None
+            if buildRows:
+                rows = []
+                for rawDict in listOfDicts:
+                    assert isinstance(rawDict, dict)
+                    childItem = self._createItemsTree(rawDict, columns)
+                    if childItem:
+                        rows.append(childItem)
+            return listOfDicts, rows
+
+        if self.__itemBuildingExecutor is None:
+            self.__itemBuildingExecutor = ThreadPoolExecutor(
+                    max_workers=min(self.MAX_ITEM_BUILDING_THREADS, os.cpu_count() or 1),
+                    thread_name_prefix="VNetworkDataItemBuilding")
+            # Пул завершается вместе с моделью, даже если режим так и не был выключен.
+            weakref.finalize(self, self.__itemBuildingExecutor.shutdown, wait=False)
+        notifier = self.__builtChildrenNotifier
+
+        def notify(future: Future):
+            # Модель (а вместе с ней и объект-уведомитель) могла быть удалена, пока элементы строились.
+            if sip.isdeleted(notifier):
+                return
+            try:
+                notifier.built.emit(action, future)
+            except RuntimeError:  # Объект-уведомитель удален между проверкой и испусканием сигнала.
+                pass
+
+        future = self.__itemBuildingExecutor.submit(build)
+        future.add_done_callback(notify)
+        return True
+
+    def _handleChildrenBuilt(self, action: VNetworkModelAction, future: Future):
+        """Принимает в потоке модели результат фонового построения подэлементов и завершает загрузку."""
+        if sip.isdeleted(action) or action.getModel() is not self:
+            return
+        try:
+            self.__builtChildren[action] = future.result()
+        except:
+            print(traceback.format_exc())
+            self.__builtChildren[action] = (None, None)
+        try:
+            # Для недействительного действия результат не используется и отбрасывается ниже.
+            self._finishLoadingChildren(action)
+        finally:
+            self.__builtChildren.pop(action, None)
+
+    def _insertChildrenItems(self, item: QStandardItem, rows: List[QStandardItem]):
+        """Добавляет готовые элементы `rows` в качестве подэлементов в элемент `item`, испуская сигналы модели."""
+        if not rows:
+            return
+        with self._traceSpan("insert", rows=len(rows)), self._countingTime("insert"):
+            parent = self._mapFromLocal(self.__localDataModel.indexFromItem(item))
+            first = item.rowCount()
+            last = first + len(rows) - 1
+            self.beginInsertRows(parent, first, last)
+            item.appendRows(self._sortChildrenItems(rows))
+            self.endInsertRows()
+
+    # ==== reconciliation of children ====
+
+    def childrenKeyFunction(self) -> Callable[[dict], Hashable] or None:
+        """Возвращает ключевую функцию, по которой сопоставляются подэлементы при их перезагрузке,
+        или None, если подэлементы при перезагрузке заменяются целиком."""
+        return self.__childrenKeyFunction
+
+    def setChildrenKeyFunction(self, key: Callable[[dict], Hashable] or None):
+        """Устанавливает ключевую функцию `key`, по которой сопоставляются подэлементы при их перезагрузке
+        (None - подэлементы при перезагрузке заменяются целиком).
+
+        Ключевая функция применяется как к сырым словарям из ответа сервера, так и к словарям уже загруженных
+        элементов (хранимым под ролью `Vns.ItemDataRole.ItemDict`), поэтому она должна использовать данные,
+        которые не меняются методом :func:`_prepareItemDict()` (например, идентификатор элемента).
+        Ключи подэлементов одного элемента должны быть уникальны, иначе подэлементы заменяются целиком.
+
+        .. note::
+            Подэлементы, сопоставленные по ключу, располагаются в порядке ответа сервера,
+            метод :func:`_sortChildrenItems()` к ним не применяется.
+        """
+        self.__childrenKeyFunction = key
+
+    def _reconcilesChildren(self, parent: QModelIndex) -> bool:
+        """Переопределяет соответствующий родительский метод.
+
+        Возвращает True, если установлена ключевая функция (смотри :func:`setChildrenKeyFunction()`).
+        """
+        return self.__childrenKeyFunction is not None
+
+    def _reconcileChildren(self, parent: QModelIndex, action: VNetworkModelAction) -> bool:
+        """Переопределяет соответствующий родительский метод.
+
+        Сопоставляет подэлементы, созданные из данных действия `action`, с загруженными подэлементами элемента
+        с модельным индексом `parent` по ключевой функции (смотри :func:`setChildrenKeyFunction()`).
+
+        Возвращает True - если сопоставление завершилось успешно, иначе - возвращает False.
+        """
+        built = self.__builtChildren.pop(action, None)
+        if built is not None:
+            listOfDicts = built[0]
+            if listOfDicts is None:
+                return False
+        else:
+            with self._traceSpan("decode") as span:
+                if span.isEnabled():
+                    span.setArg("bytes", len(action.replyBodyRawData()))
+                listOfDicts = self._convertReplyPayload(action, self.convertToListOfDicts)
+
+        if not parent.isValid():
+            parentItem = self.__localDataModel.invisibleRootItem()
+        else:
+            parentItem = self.__localDataModel.itemFromIndex(self._mapToLocal(parent))
+
+        if parentItem is None:
+            return False
+
+        try:
+            if self._reconcileChildrenOfItem(parent, parentItem, listOfDicts):
+                return True
+        except:
+            print(traceback.format_exc())
+
+        # Сопоставление прервано на полпути - заменяем подэлементы целиком, чтобы не оставлять частично
+        # сопоставленное дерево.
+        self._removeChildren(parent)
+        try:
+            return self._appendChildrenRowsToItem(parentItem, listOfDicts, True)
+        except:
+            print(traceback.format_exc())
+            return False
+
+    def _reconcileChildrenOfItem(self, parent: QModelIndex, item: QStandardItem, listOfDicts: List[dict]) -> bool:
+        """Сопоставляет подэлементы из списка сырых словарей `listOfDicts` с подэлементами элемента `item`
+        (с модельным индексом `parent`) и применяет разницу минимальным количеством удалений, перемещений
+        и вставок строк, а также сигналов об изменении данных.
+
+        Сначала строятся новые подэлементы и обработанные словари сохраняемых подэлементов, и только затем
+        изменяется модель, поэтому ошибка при построении не оставляет частично сопоставленных подэлементов.
+
+        Возвращает True - если сопоставление завершилось успешно, иначе - возвращает False.
+        """
+        key = self.__childrenKeyFunction
+        assert key is not None
+
+        oldKeys = [key(item.child(row).data(Vns.ItemDataRole.ItemDict)) for row in range(item.rowCount())]
+        newKeys = [key(rawDict) for rawDict in listOfDicts]
+        oldKeySet = set(oldKeys)
+        if len(oldKeySet) != len(oldKeys) or len(set(newKeys)) != len(newKeys):
+            # Неоднозначное сопоставление - заменяем подэлементы целиком.
+            self._removeChildren(parent)
+            return self._appendChildrenRowsToItem(item, listOfDicts, True)
+
+        # Заранее создаем новые элементы, чтобы не сопоставлять те, которые создать невозможно.
+        columns = item.columnCount()
+        if columns < 1:
+            columns = 1
+        newItems = dict()
+        keptItems = dict()  # Ключ сохраняемого подэлемента -> (обработанный словарь, список словарей его подэлементов).
+        with self._traceSpan("item build") as span:
+            for newKey, rawDict in zip(newKeys, listOfDicts):
+                assert isinstance(rawDict, dict)
+                if newKey not in oldKeySet:
+                    newItems[newKey] = self._createItemsTree(rawDict, columns)
+                else:
+                    keptItems[newKey] = (self._prepareItemDict(rawDict), self._getListOfDictsForChildren(rawDict))
+            span.setArg("rows", len(newItems))
+        newDicts = [(newKey, rawDict) for newKey, rawDict in zip(newKeys, listOfDicts)
+                    if newKey in oldKeySet or newItems[newKey] is not None]
+        newPositions = {newKey: position for position, (newKey, rawDict) in enumerate(newDicts)}
+
+        # Удаляем исчезнувшие подэлементы (снизу вверх, чтобы номера остальных строк не менялись).
+        removedRows = [row for row, oldKey in enumerate(oldKeys) if oldKey not in newPositions]
+        for first, count in reversed(self._contiguousRuns(removedRows)):
+            self._removeRows(first, count, parent)
+
+        # Перемещаем только подэлементы, не входящие в наибольшую возрастающую по новым позициям подпоследовательность.
+        current = [oldKey for oldKey in oldKeys if oldKey in newPositions]
+        stable = self._longestIncreasingSubsequence([newPositions[oldKey] for oldKey in current])
+        target = [newKey for newKey, rawDict in newDicts if newKey in oldKeySet]
+        for i, movedKey in enumerate(target):
+            if newPositions[movedKey] in stable:
+                continue
+            sourceRow = current.index(movedKey)
+            current.pop(sourceRow)
+            destinationRow = current.index(target[i - 1]) + 1 if i else 0
+            current.insert(destinationRow, movedKey)
+            if destinationRow != sourceRow:
+                # Номер позиции назначения задается так же, как для beginMoveRows(), то есть до перемещения.
+                ok = self._moveRow(parent, sourceRow, parent,
+                        destinationRow if destinationRow < sourceRow else destinationRow + 1)
+                assert ok
+
+        # Вставляем новые подэлементы (сверху вниз, поэтому строки выше вставляемых уже на своих местах).
+        insertedRows = [position for position, (newKey, rawDict) in enumerate(newDicts) if newKey not in oldKeySet]
+        for first, count in self._contiguousRuns(insertedRows):
+            rows = [newItems[newKey] for newKey, rawDict in newDicts[first:first + count]]
+            with self._traceSpan("insert", rows=count), self._countingTime("insert"):
+                self.beginInsertRows(parent, first, first + count - 1)
+                item.insertRows(first, rows)
+                self.endInsertRows()
+
+        # Обновляем данные сохраненных подэлементов, сигналы об изменении которых объединяются.
+        with self._dataChangedBatch():
+            for row, (newKey, rawDict) in enumerate(newDicts):
+                if newKey not in oldKeySet:
+                    continue
+                index = self.index(row, self.ZERO_COLUMN, parent)
+                itemDict = self.data(index, Vns.ItemDataRole.ItemDict)
+                assert isinstance(itemDict, dict)
+                newItemDict, listOfChildren = keptItems[newKey]
+                # Поля, отсутствующие в новом словаре (например, загруженные подробные данные), сохраняются.
+                if any(field not in itemDict or itemDict[field] != value for field, value in newItemDict.items()):
+                    itemDict = dict(itemDict)
+                    itemDict.update(newItemDict)
+                    self._setData(index, itemDict, Vns.ItemDataRole.ItemDict)
+                if self._getChildrenLoadingInfo(index) is None:
+                    # Подэлементы сохраненного подэлемента загружаются вместе с ним - сопоставляем и их.
+                    childItem = item.child(row)
+                    if listOfChildren or childItem.rowCount():
+                        if not self._reconcileChildrenOfItem(index, childItem, listOfChildren or []):
+                            return False
+        return True
+
+    @staticmethod
+    def _contiguousRuns(rows: List[int]) -> List[Tuple[int, int]]:
+        """Разбивает возрастающий список номеров строк `rows` на непрерывные участки
+        и возвращает список пар (первая строка, количество строк)."""
+        runs = []
+        for row in rows:
+            if runs and runs[-1][0] + runs[-1][1] == row:
+                runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+            else:
+                runs.append((row, 1))
+        return runs
+
+    @staticmethod
+    def _longestIncreasingSubsequence(values: List[int]) -> set:
+        """Возвращает множество значений наибольшей возрастающей подпоследовательности списка различных чисел
+        `values` (за время O(n log n))."""
+        tails = []  # Номера значений, которыми заканчиваются возрастающие подпоследовательности каждой длины.
+        previous = [-1] * len(values)
+        for i, value in enumerate(values):
+            low, high = 0, len(tails)
+            while low < high:
+                middle = (low + high) // 2
+                if values[tails[middle]] < value:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low:
+                previous[i] = tails[low - 1]
+            if low == len(tails):
+                tails.append(i)
+            else:
+                tails[low] = i
+        result = set()
+        i = tails[-1] if tails else -1
+        while i != -1:
+            result.add(values[i])
+            i = previous[i]
+        return result
+
+    def payloadCache(self) -> VPayloadCache or None:
+        """Возвращает кэш разобранных данных сетевых ответов или None, если кэш не используется."""
+        return self.__payloadCache
+
+    def setPayloadCache(self, cache: VPayloadCache or None):
+        """Устанавливает кэш разобранных данных сетевых ответов `cache`.
+
+        Один и тот же кэш (например, :func:`VPayloadCache.globalInstance()`) можно установить в несколько моделей,
+        загружающих данные с одних и тех же адресов. Тогда повторная загрузка тех же данных (с теми же валидаторами)
+        не будет заново разбирать тело ответа. Чтобы отключить кэш, передайте None.
+
+        .. warning::
+            Результат методов :func:`convertToListOfDicts()` и :func:`convertToDict()` кэшируется отдельно для каждой
+            их реализации, поэтому он должен зависеть только от тела ответа, но не от состояния модели.
+        """
+        self.__payloadCache = cache
+
+    def _convertReplyPayload(self, action: VNetworkModelAction, convert: Callable[[str], Any]) -> Any:
+        """Преобразует тело сетевого ответа действия `action` с помощью метода `convert` (например,
+        :func:`convertToListOfDicts()` или :func:`convertToDict()`) и возвращает результат.
+
+        Если установлен кэш разобранных данных и у ответа есть валидаторы, то результат берется из кэша (в виде
+        изменяемой поверхностной копии), а при его отсутствии - сохраняется в кэш.
+        """
+        cache = self.__payloadCache
+        key = None
+        if cache is not None:
+            key = self._payloadCacheKey(action, convert)
+            if key is not None:
+                payload = cache.getCopy(key)
+                if payload is not None:
+                    return payload
+        with self._countingTime("parse"):
+            payload = self._parseReplyPayload(action, convert)
+        if key is not None:
+            cache.put(key, payload)
+        return payload
+
+    @staticmethod
+    def _payloadCacheKey(action: VNetworkModelAction, convert: Callable[[str], Any]) -> Tuple or None:
+        """Возвращает ключ кэша разобранных данных для ответа действия `action`, преобразуемого методом `convert`,
+        или None, если у ответа нет валидаторов."""
+        return VPayloadCache.makeKey(action.replyUrl().toString(), bytes(action.replyRawHeader(b"ETag")),
+                bytes(action.replyRawHeader(b"Last-Modified")), getattr(convert, '__func__', convert))
+
+    def _parseReplyPayload(self, action: VNetworkModelAction, convert: Callable[[str], Any]) -> Any:
+        """Разбирает тело сетевого ответа действия `action` с помощью метода `convert` и возвращает результат.
+
+        Если `convert` - это непереопределенный метод :func:`convertToListOfDicts()` или :func:`convertToDict()`,
+        то тело разбирается однократным конвейером действия :func:`VNetworkAction.replyPayload()` (без промежуточного
+        декодирования в текст), иначе в `convert` передается текст тела ответа.
+        """
+        func = getattr(convert, '__func__', convert)
+        if func is VAbstractNetworkDataModel.convertToListOfDicts:
+            if not action.replyBodyRawData():
+                return convert("")
+            return self._listOfDictsFromPayload(action.replyPayload())
+        if func is VAbstractNetworkDataModel.convertToDict:
+            if not action.replyBodyRawData():
+                return convert("")
+            return self._dictFromPayload(action.replyPayload())
+        return convert(action.replyBodyStringData())
+
     def convertToListOfDicts(self, string: str) -> List[dict]:
         """Преобразует строку `string` в список сырых словарей и возвращает его.
 
@@ -578,11 +1600,15 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
             print("{}: VAbstractNetworkDataModel.convertToListOfDicts(): ERROR! String is empty.".format(type(self)))  # TODO: Исправить вывод ошибки.
             return []
 
-        lst = json.loads(string)
-        if isinstance(lst, dict):
-            lst = [lst]
-        assert isinstance(lst, list)
-        return lst
+        return self._listOfDictsFromPayload(json.loads(string))
+
+    @staticmethod
+    def _listOfDictsFromPayload(payload: Any) -> List[dict]:
+        """Приводит разобранные данные `payload` к списку сырых словарей и возвращает его."""
+        if isinstance(payload, dict):
+            payload = [payload]
+        assert isinstance(payload, list)
+        return payload
 
     def _appendChildrenRow(self, parent: QModelIndex, rawDict: dict) -> bool:
         """Создает элемент из сырого словаря `rawDict` и добавляет его в качестве подэлемента в элемент
@@ -625,20 +1651,18 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
             columns = 1
 
         rows = []
-        for rawDict in listOfDicts:
-            assert isinstance(rawDict, dict)
-            childItem = self._createItemsTree(rawDict, columns)
-            if childItem:
-                rows.append(childItem)
+        with self._traceSpan("item build") if emitSignals else NULL_TRACE_SPAN as span:
+            for rawDict in listOfDicts:
+                assert isinstance(rawDict, dict)
+                childItem = self._createItemsTree(rawDict, columns)
+                if childItem:
+                    rows.append(childItem)
+            span.setArg("rows", len(rows))
         if rows:
             if emitSignals:
-                parent = self._mapFromLocal(self.__localDataModel.indexFromItem(item))
-                first = item.rowCount()
-                last = first + len(rows) - 1
-                self.beginInsertRows(parent, first, last)
-            item.appendRows(self._sortChildrenItems(rows))
-            if emitSignals:
-                self.endInsertRows()
+                self._insertChildrenItems(item, rows)
+            else:
+                item.appendRows(self._sortChildrenItems(rows))
         return True
 
     def _createItemsTree(self, rawDict: dict, columns: int = None) -> QStandardItem or None:
@@ -739,7 +1763,7 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
             return False
         itemDict = self.data(index, role=Vns.ItemDataRole.ItemDict)
         assert isinstance(itemDict, dict)
-        detailsDict = self._prepareDetailsDict(self.convertToDict(action.replyBodyStringData()))
+        detailsDict = self._prepareDetailsDict(self._convertReplyPayload(action, self.convertToDict))
         itemDict.update(detailsDict)
         return self._setData(index, itemDict, role=Vns.ItemDataRole.ItemDict)
 
@@ -752,9 +1776,13 @@ class VAbstractNetworkDataModel(VAbstractNetworkDataModelMixin, QAbstractItemMod
             print("{}: VAbstractNetworkDataModel.convertToDict(): ERROR! String is empty.".format(type(self)))  # TODO: Исправить вывод ошибки.
             return {}
 
-        rawDict = json.loads(string)
-        assert isinstance(rawDict, dict)
-        return rawDict
+        return self._dictFromPayload(json.loads(string))
+
+    @staticmethod
+    def _dictFromPayload(payload: Any) -> dict:
+        """Приводит разобранные данные `payload` к сырому словарю и возвращает его."""
+        assert isinstance(payload, dict)
+        return payload
 
     def _prepareDetailsDict(self, rawDict: dict) -> dict:
         """Осуществляет обработку сырого словаря `rawDict`, содержащего подробные данные об элементе
@@ -831,6 +1859,10 @@ class _VAbstractNetworkDataExpandedModel(VAbstractNetworkDataModel):
 
         self.__nextDynamicRole = Vns.ItemDataRole.Custom  # Следующая за последней используемой динамической ролью.
         self.__dynamicRoleNames = dict()
+        # Поля элементов, построенных в рабочих потоках (смотри setBackgroundItemBuilding()), роли для которых
+        # будут сгенерированы в потоке модели (словарь используется как упорядоченное множество).
+        self.__builtFieldNames = dict()
+        self.__builtFieldNamesLock = threading.Lock()
 
         # self.modelReset.connect(self._resetDynamicRoleNames)
         # self.modelReset.connect(self._resetDynamicRole)
@@ -862,12 +1894,38 @@ class _VAbstractNetworkDataExpandedModel(VAbstractNetworkDataModel):
         return roleNames
 
     def _createItem(self, rawDict: dict, columns: int = None) -> QStandardItem:
-        """Переопределяет соответствующий родительский метод."""
+        """Переопределяет соответствующий родительский метод.
+
+        .. note::
+            В рабочем потоке роли не генерируются, так как таблицы ролей читаются потоком модели без блокировок:
+            поля элемента лишь запоминаются, а роли для них генерируются в потоке модели перед вставкой
+            построенных элементов (смотри :func:`_handleChildrenBuilt()`).
+        """
         item = super()._createItem(rawDict, columns)
         itemDict = item.data(Vns.ItemDataRole.ItemDict)
+        if QThread.currentThread() is self.thread():
+            self._generateDynamicRoleNames(itemDict)
+        else:
+            with self.__builtFieldNamesLock:
+                self.__builtFieldNames.update(dict.fromkeys(itemDict))
+        return item
+
+    def _createSnapshotItem(self, itemDict: dict, columns: int) -> QStandardItem:
+        """Переопределяет соответствующий родительский метод."""
+        item = super()._createSnapshotItem(itemDict, columns)
         self._generateDynamicRoleNames(itemDict)
         return item
 
+    def _handleChildrenBuilt(self, action: VNetworkModelAction, future: Future):
+        """Переопределяет соответствующий родительский метод.
+
+        Генерирует роли для полей элементов, построенных в рабочих потоках, до их вставки в модель.
+        """
+        with self.__builtFieldNamesLock:
+            fieldNames, self.__builtFieldNames = self.__builtFieldNames, dict()
+        self._generateDynamicRoleNames(fieldNames)
+        super()._handleChildrenBuilt(action, future)
+
     def _generateDynamicRoleNames(self, itemDict: Dict[str, Any]):
         """Генерирует динамические роли из ключей словаря `itemDict`."""
         for key in itemDict:
@@ -924,7 +1982,7 @@ class _VAbstractNetworkDataExpandedModel(VAbstractNetworkDataModel):
                 assert isinstance(roleName, str)
                 itemDict = super().data(index, Vns.ItemDataRole.ItemDict)
                 assert isinstance(itemDict, dict)
-                return itemDict.get(roleName, default=None)
+                return itemDict.get(roleName)
             # elif role == Qt.DisplayRole:
             #     displayRoleName = self.roleNames()[role].decode("utf-8")
             #     assert isinstance(displayRoleName, str)
@@ -951,6 +2009,10 @@ class _VAbstractNetworkDataExpandedModel(VAbstractNetworkDataModel):
         # if role is None:
         #     role = Qt.EditRole
 
+        if role == Vns.ItemDataRole.ItemDict and isinstance(value, dict):
+            # Новые поля (например, после сопоставления подэлементов или загрузки подробных данных) получают роли.
+            self._generateDynamicRoleNames(value)
+
         if index.isValid():
             if Vns.ItemDataRole.Custom <= role < self.__nextDynamicRole:
                 roleName = self.roleNames()[role].decode("utf-8")
@@ -5,20 +5,42 @@
 Этот файл принадлежит проекту "VNetworkData".
 Автор: Волков Семён.
 """
-from typing import Any, List, Tuple, Union
+import asyncio
+import codecs
+import json
+import traceback
+
+from concurrent.futures import Future
+from typing import Any, Callable, Iterable, List, Tuple, Union
 
 from PyQt5.QtCore import (QAbstractItemModel, QByteArray, QEventLoop, QModelIndex, QPersistentModelIndex, QObject,
-                          QTimer, pyqtSignal, pyqtSlot)
+                          QTimer, QUrl, pyqtSignal, pyqtSlot)
 from PyQt5.QtNetwork import QNetworkReply
 
 from .client import VAbstractNetworkClient
 from .namespace import Vns
+from .tracing import VActionTracer
 
 
 # TODO: Пока так помечаем то, что должно быть помечено через макрос Q_INVOKABLE.
 vFromQmlInvokable = pyqtSlot
 
 
+class VActionError(Exception):
+    """Исключение, которым разрешаются будущие результаты действий, завершившихся с ошибкой.
+
+    Смотри :func:`VAbstractAsynchronousAction.toConcurrentFuture()` и
+    :func:`VAbstractAsynchronousAction.toAsyncioFuture()`.
+    """
+
+    def __init__(self, errorType: int, informativeText: str, detailedText: str = ""):
+        super().__init__(informativeText)
+
+        self.errorType = errorType
+        self.informativeText = informativeText
+        self.detailedText = detailedText
+
+
 class VAbstractAsynchronousAction(QObject):
     """Абстрактное асинхронное действие.
 
@@ -127,6 +149,233 @@ class VAbstractAsynchronousAction(QObject):
         self.finished.disconnect(event_loop.quit)
         self.destroyed.disconnect(event_loop.quit)  # TODO: Не упадет ли прога здесь, если действие уже удалилось?
 
+    # ==== future/promise interop ====
+
+    def _whenResolved(self, onFinished: Callable[[], None], onInvalidated: Callable[[], None]) -> Callable[[], None]:
+        """Вызывает `onFinished` после завершения действия или `onInvalidated` после его инвалидации
+        (или удаления без завершения). Каждый из обработчиков вызывается не более одного раза и только один из них.
+
+        Если действие уже завершено или уже недействительно, то обработчик вызывается на следующем круге
+        цикла событий Qt.
+
+        Возвращает функцию, после вызова которой обработчики больше не вызываются (и отключаются от сигналов).
+        """
+        resolved = False
+        connections = []
+
+        def handle(handler: Callable[[], None]):
+            nonlocal resolved
+            if resolved:
+                return
+            resolved = True
+            handler()
+
+        def forget():
+            nonlocal resolved
+            resolved = True
+            for signal, connection in connections:
+                try:
+                    signal.disconnect(connection)
+                except (TypeError, RuntimeError):  # Уже отключен или действие уже удалено.
+                    pass
+            connections.clear()
+
+        if self.isFinished():
+            QTimer.singleShot(0, lambda: handle(onFinished))
+            return forget
+        if not self.isValid():
+            QTimer.singleShot(0, lambda: handle(onInvalidated))
+            return forget
+        connections.append((self.finished, self.finished.connect(lambda: handle(onFinished))))
+        connections.append((self.invalidated, self.invalidated.connect(lambda: handle(onInvalidated))))
+        connections.append((self.destroyed, self.destroyed.connect(lambda: handle(onInvalidated))))
+        return forget
+
+    def _actionError(self) -> VActionError:
+        """Возвращает исключение :class:`VActionError` с данными об ошибке действия."""
+        return VActionError(self.errorType(), self.errorInformativeText(), self.errorDetailedText())
+
+    def toConcurrentFuture(self) -> Future:
+        """Возвращает экземпляр :class:`concurrent.futures.Future`, связанный с данным действием.
+
+        Будущий результат разрешается в цикле событий Qt:
+          - после завершения действия без ошибки результатом становится само действие;
+          - после завершения действия с ошибкой устанавливается исключение :class:`VActionError`;
+          - после инвалидации действия будущий результат отменяется.
+
+        .. note::
+            Отмена будущего результата не отменяет само действие.
+        """
+        future = Future()
+
+        def handleFinished():
+            if future.done():
+                return
+            if self.isError():
+                future.set_exception(self._actionError())
+            else:
+                future.set_result(self)
+
+        self._whenResolved(handleFinished, future.cancel)
+        return future
+
+    def toAsyncioFuture(self, loop: asyncio.AbstractEventLoop = None) -> asyncio.Future:
+        """Возвращает экземпляр :class:`asyncio.Future`, связанный с данным действием и циклом событий `loop`
+        (по умолчанию - с выполняющимся циклом событий asyncio; без `loop` метод следует вызывать из сопрограммы
+        или обратного вызова этого цикла, иначе возбуждается :class:`RuntimeError`).
+
+        Правила разрешения будущего результата такие же, как и в :func:`toConcurrentFuture()`.
+        Результат передается в цикл событий `loop` потокобезопасно, поэтому цикл событий asyncio может работать
+        как в цикле событий Qt, так и в отдельном потоке. Если будущий результат уже разрешен или отменен
+        (например, по истечении :func:`asyncio.wait_for()`) или цикл `loop` уже закрыт, то результат действия
+        никуда не передается.
+        """
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def setResult(result):
+            if not future.done():
+                future.set_result(result)
+
+        def setException(exception: Exception):
+            if not future.done():
+                future.set_exception(exception)
+
+        def resolve(callback: Callable, *args):
+            if future.done() or loop.is_closed():
+                return
+            try:
+                loop.call_soon_threadsafe(callback, *args)
+            except RuntimeError:  # Цикл событий закрылся в другом потоке после проверки.
+                pass
+
+        def handleFinished():
+            if self.isError():
+                resolve(setException, self._actionError())
+            else:
+                resolve(setResult, self)
+
+        forget = self._whenResolved(handleFinished, lambda: resolve(future.cancel))
+        future.add_done_callback(lambda future: forget())
+        return future
+
+    def _forwardTo(self, target: 'VAsynchronousAction'):
+        """Переносит результат данного действия (завершенность, ошибку или инвалидацию) в действие `target`."""
+        def handleFinished():
+            if self.isError():
+                target.setError(self.errorType(), self.errorInformativeText(), self.errorDetailedText())
+            target.setFinished()
+
+        self._whenResolved(handleFinished, target.setInvalidated)
+
+    def then(self, callback: Callable[['VAbstractAsynchronousAction'], Any],
+            parent: QObject = None) -> 'VAbstractAsynchronousAction':
+        """Возвращает новое действие, которое будет выполнено после успешного завершения данного действия.
+
+        После успешного завершения данного действия вызывается `callback` с данным действием в качестве аргумента.
+        Если `callback` вернет экземпляр :class:`VAbstractAsynchronousAction`, то новое действие завершится
+        (или станет недействительным) вместе с ним, иначе - новое действие завершится сразу.
+
+        Если данное действие завершится с ошибкой, то `callback` не вызывается, а новое действие завершается
+        с той же ошибкой. Если данное действие станет недействительным, то и новое действие станет недействительным.
+
+        Пример:
+
+        .. sourcecode::
+
+            model.reloadChildren(parent).then(lambda action: model.reloadDetails(model.index(0, 0, parent)))
+        """
+        result = VAsynchronousAction(parent=parent)
+
+        def handleFinished():
+            if self.isError():
+                self._forwardTo(result)
+                return
+            try:
+                nextAction = callback(self)
+            except Exception as exception:
+                result.setError(Vns.ErrorType.UnknownError, str(exception), traceback.format_exc())
+                result.setFinished()
+                return
+            if isinstance(nextAction, VAbstractAsynchronousAction):
+                nextAction._forwardTo(result)
+            else:
+                result.setFinished()
+
+        self._whenResolved(handleFinished, result.setInvalidated)
+        return result
+
+    @staticmethod
+    def all(actions: Iterable['VAbstractAsynchronousAction'], parent: QObject = None) -> 'VAbstractAsynchronousAction':
+        """Возвращает действие, которое завершится после завершения всех действий `actions`.
+
+        Если одно из действий завершится с ошибкой, то возвращаемое действие сразу завершится с той же ошибкой.
+        Если одно из действий станет недействительным, то и возвращаемое действие станет недействительным.
+        Если список действий пуст, то возвращаемое действие завершится на следующем круге цикла событий Qt.
+        """
+        actions = list(actions)
+        result = VAsynchronousAction(parent=parent)
+        remaining = len(actions)
+
+        def handleFinished(action: VAbstractAsynchronousAction):
+            nonlocal remaining
+            if not result.isValid() or result.isFinished():
+                return
+            remaining -= 1
+            if action.isError():
+                # Завершаем сразу: отложенный перенос результата завершил бы действие повторно при второй ошибке.
+                result.setError(action.errorType(), action.errorInformativeText(), action.errorDetailedText())
+                result.setFinished()
+            elif remaining == 0:
+                result.setFinished()
+
+        def handleInvalidated():
+            if result.isValid() and not result.isFinished():
+                result.setInvalidated()
+
+        if not actions:
+            QTimer.singleShot(0, result.setFinished)
+        for action in actions:
+            action._whenResolved(lambda action=action: handleFinished(action), handleInvalidated)
+        return result
+
+    @staticmethod
+    def any(actions: Iterable['VAbstractAsynchronousAction'], parent: QObject = None) -> 'VAbstractAsynchronousAction':
+        """Возвращает действие, которое завершится после первого успешного завершения одного из действий `actions`.
+
+        Если ни одно из действий не завершится успешно, то возвращаемое действие завершится с ошибкой последнего
+        завершившегося с ошибкой действия, а если все действия станут недействительными (или список действий пуст),
+        то и возвращаемое действие станет недействительным.
+        """
+        actions = list(actions)
+        result = VAsynchronousAction(parent=parent)
+        remaining = len(actions)
+        lastError = None
+
+        def handleResolved(action: VAbstractAsynchronousAction = None):
+            nonlocal remaining, lastError
+            if not result.isValid() or result.isFinished():
+                return
+            remaining -= 1
+            if action is not None:
+                if not action.isError():
+                    result.setFinished()
+                    return
+                lastError = action._actionError()
+            if remaining == 0:
+                if lastError is None:
+                    result.setInvalidated()
+                else:
+                    result.setError(lastError.errorType, lastError.informativeText, lastError.detailedText)
+                    result.setFinished()
+
+        if not actions:
+            QTimer.singleShot(0, result.setInvalidated)
+        for action in actions:
+            action._whenResolved(lambda action=action: handleResolved(action), handleResolved)
+        return result
+
 
 class VAsynchronousAction(VAbstractAsynchronousAction):
     """Асинхронное действие.
@@ -144,6 +393,8 @@ class VAsynchronousAction(VAbstractAsynchronousAction):
         self.__errorType = Vns.ErrorType.NoError
         self.__errorInformativeText = ""
         self.__errorDetailedText = ""
+        self.__tracer = None
+        self.__traceId = 0
 
         # TODO: Delete me!
         def printError():
@@ -168,6 +419,31 @@ class VAsynchronousAction(VAbstractAsynchronousAction):
         """Устанавливает тип действия."""
         self.__type = type
 
+    def typeName(self) -> str:
+        """Возвращает название типа действия (для отладки и трассировки)."""
+        try:
+            return Vns.ActionType(self.__type).name
+        except ValueError:
+            return str(self.__type)
+
+    def tracer(self) -> VActionTracer or None:
+        """Возвращает трассировщик действия или None, если трассировка не ведется."""
+        return self.__tracer
+
+    def setTracer(self, tracer: VActionTracer, **args):
+        """Устанавливает трассировщик `tracer` и начинает в нем асинхронный промежуток жизненного цикла действия,
+        который закончится при завершении или инвалидации действия.
+
+        Именованные аргументы `args` сохраняются в аргументах промежутка.
+
+        .. warning:: Трассировщик можно установить только один раз и только для выполняющегося действия.
+        """
+        assert self.__tracer is None
+        assert self.__isValid and not self.__isFinished
+        self.__tracer = tracer
+        if tracer is not None:
+            self.__traceId = tracer.beginAsync(self.typeName(), "action", **args)
+
     @vFromQmlInvokable(result=bool)
     def isValid(self) -> bool:
         """Переопределяет соответствующий родительский метод.
@@ -182,6 +458,8 @@ class VAsynchronousAction(VAbstractAsynchronousAction):
         assert self.__isValid  # Сигнал должен испускаться ровно 1 раз!
         if self.__isValid:
             self.__isValid = False
+            if self.__tracer is not None:
+                self.__tracer.endAsync(self.__traceId, self.typeName(), "action", invalidated=True)
             self.invalidated.emit()
 
     # @vFromQmlInvokable(result=bool)
@@ -207,6 +485,8 @@ class VAsynchronousAction(VAbstractAsynchronousAction):
         assert not self.__isFinished  # Сигнал должен испускаться ровно 1 раз!
         if not self.__isFinished:
             self.__isFinished = True
+            if self.__tracer is not None:
+                self.__tracer.endAsync(self.__traceId, self.typeName(), "action", errorType=int(self.__errorType))
             self.finished.emit()
 
     @vFromQmlInvokable(result=bool)
@@ -266,7 +546,199 @@ class VAsynchronousAction(VAbstractAsynchronousAction):
     #     self.setError(Vns.ErrorType.NoError, "", "")
 
 
-class VNetworkAction(VAsynchronousAction):
+class _VNetworkReplyReader:
+    """Примесь, позволяющая несколько раз считывать (кэширует) тело и заголовки ответа на сетевой запрос
+    :class:`QNetworkReply`, возвращаемого методом :func:`_reply()`.
+
+    Тело ответа обрабатывается однократно: оно считывается один раз (:func:`replyBodyRawData()`), декодируется
+    в текст не более одного раза (:func:`replyBodyStringData()`) и разбирается парсером не более одного раза
+    (:func:`replyPayload()`). Все промежуточные результаты кэшируются.
+
+    Общая часть сетевого действия :class:`VNetworkAction` и облегченной записи внутреннего действия загрузки
+    модели :class:`_VModelLoadRecord`.
+    """
+
+    __slots__ = ()  # Атрибуты объявляются в классах-наследниках (если они используют __slots__).
+
+    def _reply(self) -> QNetworkReply:
+        """Возвращает экземпляр сетевого ответа :class:`QNetworkReply` или None.
+
+        .. warning::
+            Это абстрактный метод, который должны переопределить наследники класса.
+        """
+        raise NotImplementedError()
+
+    def _resetReplyData(self):
+        """Сбрасывает кэшированные данные сетевого ответа."""
+        self.__replyBody = None
+        self.__replyBodyEncoding = None
+        self.__replyString = None
+        self.__replyPayload = None
+        self.__replyPayloadParser = None
+
+    def _replyIsFinished(self) -> bool:
+        """Возвращает True - если есть экземпляр сетевого ответа и он завершен, иначе - возвращает False."""
+        reply = self._reply()
+        return bool(reply and reply.isFinished())
+
+    def replyBodyRawData(self) -> bytes:
+        """Возвращает тело сетевого ответа в бинарном виде.
+        Если ответ еще не готов - возвращает пустую байтовую последовательность.
+        """
+        if self.__replyBody is None:
+            if not self._replyIsFinished():
+                return b""
+            self.__replyBody = bytes(self._reply().readAll())
+        return self.__replyBody
+
+    def _replyBodyEncoding(self) -> str:
+        """Возвращает (кэшированную) кодировку тела сетевого ответа."""
+        if self.__replyBodyEncoding is None:
+            self.__replyBodyEncoding = self.replyEncoding(default="utf-8")
+        return self.__replyBodyEncoding
+
+    def replyBodyStringData(self) -> str:
+        """Возвращает тело сетевого ответа в виде текста. Если ответ еще не готов - возвращает пустую строку."""
+        if self.__replyString is None:
+            if not self._replyIsFinished():
+                return ""
+            self.__replyString = self.replyBodyRawData().decode(self._replyBodyEncoding())
+        return self.__replyString
+
+    def _replyBodyIsUtf8(self) -> bool:
+        """Возвращает True - если тело сетевого ответа закодировано в UTF-8 (или в совместимой с ней ASCII),
+        иначе - возвращает False."""
+        try:
+            return codecs.lookup(self._replyBodyEncoding()).name in ("utf-8", "ascii")
+        except LookupError:
+            return False
+
+    def replyPayload(self, parser: Callable[[Union[str, bytes]], Any] = json.loads, acceptsBytes: bool = True) -> Any:
+        """Возвращает тело сетевого ответа, разобранное парсером `parser` (по умолчанию - json).
+        Если ответ еще не готов - возвращает None.
+
+        Результат разбора кэшируется, поэтому повторные вызовы с тем же парсером не разбирают тело заново.
+
+        Если `acceptsBytes` равен True (т.е. парсер принимает байты в UTF-8), тело закодировано в UTF-8 и еще не было
+        декодировано в текст, то парсеру передаются байты, и декодированный текст не создается и не хранится.
+
+        .. warning::
+            Возвращается один и тот же объект, поэтому его изменения видны всем, кто его получает.
+        """
+        if self.__replyPayloadParser is not parser:
+            if not self._replyIsFinished():
+                return None
+            if acceptsBytes and self.__replyString is None and self._replyBodyIsUtf8():
+                self.__replyPayload = parser(self.replyBodyRawData())
+            else:
+                self.__replyPayload = parser(self.replyBodyStringData())
+            self.__replyPayloadParser = parser
+        return self.__replyPayload
+
+    def replyAbort(self):
+        """Если есть экземпляр ответа на сетевой запрос:
+        Немедленно прерывает выполнение сетевого запроса и закрывает все сетевые подключения.
+        Загрузка уже выполненного запроса также прерывается.
+        Затем испускает сигнал завершения ответа на сетевой запрос.
+        """
+        reply = self._reply()
+        if reply is None:
+            return
+        reply.abort()
+
+    def replyUrl(self) -> QUrl:
+        """Возвращает адрес, с которого был получен сетевой ответ (с учетом перенаправлений)."""
+        reply = self._reply()
+        if reply is None:
+            return QUrl()
+        return reply.url()
+
+    def replyAttribute(self, code: int) -> Any:
+        """replyAttribute(self, code: QNetworkRequest.Attribute) -> Any."""
+        reply = self._reply()
+        if reply is None:
+            return None
+        return reply.attribute(code)
+
+    def replyErrorType(self) -> int:
+        """replyErrorType(self) -> QNetworkReply.NetworkError."""
+        reply = self._reply()
+        if reply is None:
+            return QNetworkReply.UnknownNetworkError
+        return reply.error()
+
+    def replyErrorString(self) -> str:
+        """replyErrorString(self) -> str."""
+        reply = self._reply()
+        if reply is None:
+            return ""
+        return reply.errorString()
+
+    # def replyHttpStatusCode(self) -> Any:
+    #     """replyHttpStatusCode(self) -> int or None.
+    #     Возвращает Http-статус сетевого ответа, если он (статус) есть, иначе - возвращает None.
+    #     """
+    #     if self._reply() is None:
+    #         return None
+    #     # return self._reply().attribute(QNetworkRequest.HttpStatusCodeAttribute)
+    #     return self._reply().attribute(self._reply().request().HttpStatusCodeAttribute)
+
+    def replyHeader(self, header: int) -> Any:
+        """replyHeader(self, header: QNetworkRequest.KnownHeaders) -> Any."""
+        reply = self._reply()
+        if reply is None:
+            return None
+        return reply.header(header)
+
+    def replyHasRawHeader(self, headerName: Union[QByteArray, bytes, bytearray]) -> bool:
+        """replyHasRawHeader(self, headerName: Union[QByteArray, bytes, bytearray]) -> bool."""
+        reply = self._reply()
+        if reply is None:
+            return False
+        return reply.hasRawHeader(headerName)
+
+    def replyRawHeader(self, headerName: Union[QByteArray, bytes, bytearray]) -> QByteArray:
+        """replyRawHeader(self, headerName: Union[QByteArray, bytes, bytearray]) -> QByteArray."""
+        reply = self._reply()
+        if reply is None:
+            return QByteArray()
+        return reply.rawHeader(headerName)
+
+    def replyRawHeaderList(self) -> List[QByteArray]:
+        """replyRawHeaderList(self) -> List[QByteArray]."""
+        reply = self._reply()
+        if reply is None:
+            return []
+        return reply.rawHeaderList()
+
+    def replyRawHeaderPairs(self) -> List[Tuple[QByteArray, QByteArray]]:
+        """replyRawHeaderPairs(self) -> List[Tuple[QByteArray, QByteArray]]."""
+        reply = self._reply()
+        if reply is None:
+            return []
+        return reply.rawHeaderPairs()
+
+    def replyContentType(self, default=None):
+        """Определяет и возвращает MIME-тип содержимого (со всеми вспомогательными данными, напр., кодировкой)
+        из http-заголовка `Content-type` в сетевом ответе.
+        Если тип содержимого определить невозможно, возвращает `default`.
+        """
+        reply = self._reply()
+        if reply is None:
+            return default
+        return VAbstractNetworkClient.contentTypeFrom(reply=reply, default=default)
+
+    def replyEncoding(self, default: str = "utf-8") -> str:
+        """Определяет и возвращает кодировку содержимого из http-заголовка `Content-type` в сетевом ответе.
+        Если кодировку определить невозможно, возвращает `default`.
+        """
+        reply = self._reply()
+        if reply is None:
+            return default
+        return VAbstractNetworkClient.encodingFrom(reply=reply, default=default)
+
+
+class VNetworkAction(VAsynchronousAction, _VNetworkReplyReader):
     """Асинхронное сетевое действие, являющееся адаптером для ответа на сетевой запрос :class:`QNetworkReply`.
 
     Позволяет несколько раз считывать (кэширует) тело ответа на сетевой запрос.
@@ -309,8 +781,9 @@ class VNetworkAction(VAsynchronousAction):
     def __init__(self, reply: QNetworkReply = None, type: int = Vns.ActionType.Custom, parent: QObject = None):
         super().__init__(type=type, parent=parent)
 
-        self.__replyBody = b""
         self.__reply = reply
+        self.__networkWaitTraceId = 0
+        self._resetReplyData()
         if self.__reply:
             self.__reply.setParent(self)
             # assert self.__reply.isRunning() \
@@ -318,11 +791,30 @@ class VNetworkAction(VAsynchronousAction):
             #     else True  # Такое мудреное утверждение из-за багов в Qt при отключенной сети!
         self._createReplyConnections()
 
+    def setTracer(self, tracer: VActionTracer, **args):
+        """Переопределяет соответствующий родительский метод.
+
+        Дополнительно записывает асинхронный промежуток ожидания сетевого ответа с количеством полученных байтов.
+        """
+        super().setTracer(tracer, **args)
+        if tracer is not None and self.__reply is not None and self.__reply.isRunning():
+            self.__networkWaitTraceId = tracer.beginAsync("network wait", "network",
+                    url=self.__reply.url().toString())
+
+    def _handleReplyFinished(self):
+        """Завершает промежуток трассировки ожидания сетевого ответа (если он есть) и испускает сигнал
+        `replyFinished`."""
+        if self.__networkWaitTraceId:
+            self.tracer().endAsync(self.__networkWaitTraceId, "network wait", "network",
+                    bytes=self.__reply.bytesAvailable(), networkError=int(self.__reply.error()))
+            self.__networkWaitTraceId = 0
+        self.replyFinished.emit()
+
     def _createReplyConnections(self):
         """Соединяет сигналы сетевого ответа со своими сигналами."""
         if self.__reply:
             self.__reply.error.connect(self.replyErrorOccured)
-            self.__reply.finished.connect(self.replyFinished)
+            self.__reply.finished.connect(self._handleReplyFinished)
             self.__reply.downloadProgress.connect(self.replyDownloadProgress)
             self.__reply.uploadProgress.connect(self.replyUploadProgress)
 
@@ -330,7 +822,7 @@ class VNetworkAction(VAsynchronousAction):
         """Разединяет сигналы сетевого ответа со своими сигналами."""
         if self.__reply:
             self.__reply.error.disconnect(self.replyErrorOccured)
-            self.__reply.finished.disconnect(self.replyFinished)
+            self.__reply.finished.disconnect(self._handleReplyFinished)
             self.__reply.downloadProgress.disconnect(self.replyDownloadProgress)
             self.__reply.uploadProgress.disconnect(self.replyUploadProgress)
 
@@ -351,7 +843,7 @@ class VNetworkAction(VAsynchronousAction):
             self.__reply.deleteLater()
         self.__reply = value
         self.__reply.setParent(self)
-        self.__replyBody = b""
+        self._resetReplyData()
         self._createReplyConnections()
 
     # def setFinished(self):
@@ -366,107 +858,6 @@ class VNetworkAction(VAsynchronousAction):
     #         else True
     #     super().setFinished()
 
-    def replyBodyRawData(self) -> bytes:
-        """Возвращает тело сетевого ответа в бинарном виде.
-        Если ответ еще не готов - возвращает пустую байтовую последовательность.
-        """
-        if not self.__replyBody:
-            if self.__reply and self.__reply.isFinished():
-                self.__replyBody = bytes(self.__reply.readAll())
-        return self.__replyBody
-
-    def replyBodyStringData(self) -> str:
-        """Возвращает тело сетевого ответа в виде текста. Если ответ еще не готов - возвращает пустую строку."""
-        if self.__reply and self.__reply.isFinished():
-            encoding = VAbstractNetworkClient.encodingFrom(self.__reply, default="utf-8")
-            return self.replyBodyRawData().decode(encoding)
-        return ""
-
-    def replyAbort(self):
-        """Если есть экземпляр ответа на сетевой запрос:
-        Немедленно прерывает выполнение сетевого запроса и закрывает все сетевые подключения.
-        Загрузка уже выполненного запроса также прерывается.
-        Затем испускает сигнал завершения ответа на сетевой запрос.
-        """
-        if self.__reply is None:
-            return
-        self.__reply.abort()
-
-    def replyAttribute(self, code: int) -> Any:
-        """replyAttribute(self, code: QNetworkRequest.Attribute) -> Any."""
-        if self.__reply is None:
-            return None
-        return self.__reply.attribute(code)
-
-    def replyErrorType(self) -> int:
-        """replyErrorType(self) -> QNetworkReply.NetworkError."""
-        if self.__reply is None:
-            return QNetworkReply.UnknownNetworkError
-        return self.__reply.error()
-
-    def replyErrorString(self) -> str:
-        """replyErrorString(self) -> str."""
-        if self.__reply is None:
-            return ""
-        return self.__reply.errorString()
-
-    # def replyHttpStatusCode(self) -> Any:
-    #     """replyHttpStatusCode(self) -> int or None.
-    #     Возвращает Http-статус сетевого ответа, если он (статус) есть, иначе - возвращает None.
-    #     """
-    #     if self.__reply is None:
-    #         return None
-    #     # return self.__reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
-    #     return self.__reply.attribute(self.__reply.request().HttpStatusCodeAttribute)
-
-    def replyHeader(self, header: int) -> Any:
-        """replyHeader(self, header: QNetworkRequest.KnownHeaders) -> Any."""
-        if self.__reply is None:
-            return None
-        return self.__reply.header(header)
-
-    def replyHasRawHeader(self, headerName: Union[QByteArray, bytes, bytearray]) -> bool:
-        """replyHasRawHeader(self, headerName: Union[QByteArray, bytes, bytearray]) -> bool."""
-        if self.__reply is None:
-            return False
-        return self.__reply.hasRawHeader(headerName)
-
-    def replyRawHeader(self, headerName: Union[QByteArray, bytes, bytearray]) -> QByteArray:
-        """replyRawHeader(self, headerName: Union[QByteArray, bytes, bytearray]) -> QByteArray."""
-        if self.__reply is None:
-            return QByteArray()
-        return self.__reply.rawHeader(headerName)
-
-    def replyRawHeaderList(self) -> List[QByteArray]:
-        """replyRawHeaderList(self) -> List[QByteArray]."""
-        if self.__reply is None:
-            return []
-        return self.__reply.rawHeaderList()
-
-    def replyRawHeaderPairs(self) -> List[Tuple[QByteArray, QByteArray]]:
-        """replyRawHeaderPairs(self) -> List[Tuple[QByteArray, QByteArray]]."""
-        if self.__reply is None:
-            return []
-        return self.__reply.rawHeaderPairs()
-
-    def replyContentType(self, default=None):
-        """Определяет и возвращает MIME-тип содержимого (со всеми вспомогательными данными, напр., кодировкой)
-        из http-заголовка `Content-type` в сетевом ответе.
-        Если тип содержимого определить невозможно, возвращает `default`.
-        """
-        if self.__reply is None:
-            return default
-        return VAbstractNetworkClient.contentTypeFrom(reply=self.__reply, default=default)
-
-    def replyEncoding(self, default: str = "utf-8") -> str:
-        """Определяет и возвращает кодировку содержимого из http-заголовка `Content-type` в сетевом ответе.
-        Если кодировку определить невозможно, возвращает `default`.
-        """
-        if self.__reply is None:
-            return default
-        return VAbstractNetworkClient.encodingFrom(reply=self.__reply, default=default)
-
-
 class VNetworkModelAction(VNetworkAction):
     """Асинхронное сетевое действие модели.
 
@@ -501,3 +892,213 @@ class VNetworkModelAction(VNetworkAction):
     def setIndex(self, index: QModelIndex):
         """Устанавливает индекс элемента, над которым совершается действие."""
         self.__persistentIndex = QPersistentModelIndex(index)
+
+
+class _VModelLoadRecord(_VNetworkReplyReader):
+    """Облегченная запись внутреннего действия загрузки модели.
+
+    Используется моделью вместо :class:`VNetworkModelAction` для загрузок, результат которых никто, кроме самой модели,
+    не сохраняет (например, для загрузок, запущенных представлениями через `fetchMore()`).
+    В отличие от действия, запись не является QObject-ом, не имеет сигналов и повторно используется через пул
+    :class:`_VModelLoadRecordPool`.
+
+    Запись поддерживает ту часть интерфейса :class:`VNetworkModelAction`, которая используется при загрузке данных
+    в модели и пагинациях, поэтому может передаваться в методы `_appendChildren()`, `_updateDetails()`,
+    `_updateAfterLoadingData()` и т.п. вместо действия.
+
+    Если действие все же понадобится вызывающей стороне, его можно получить с помощью метода :func:`materialize()`.
+    """
+
+    __slots__ = ('__model', '__persistentIndex', '__reply', '__type', '__isValid', '__isFinished', '__errorType',
+                 '__errorInformativeText', '__errorDetailedText', '__onReplyFinished', '__followers', '__tracer',
+                 '__traceId', '_VNetworkReplyReader__replyBody', '_VNetworkReplyReader__replyBodyEncoding',
+                 '_VNetworkReplyReader__replyString', '_VNetworkReplyReader__replyPayload',
+                 '_VNetworkReplyReader__replyPayloadParser', '__weakref__')
+
+    def __init__(self):
+        self.__model = None
+        self.__reply = None
+        self.__onReplyFinished = None
+        self.__followers = []
+        self._reset()
+
+    def _reset(self):
+        """Сбрасывает запись в начальное состояние (кроме модели, сетевого ответа и обработчика его завершения)."""
+        self.__persistentIndex = QPersistentModelIndex()
+        self.__type = Vns.ActionType.Custom
+        self.__isValid = True
+        self.__isFinished = False
+        self.__errorType = Vns.ErrorType.NoError
+        self.__errorInformativeText = ""
+        self.__errorDetailedText = ""
+        self.__followers.clear()
+        self.__tracer = None
+        self.__traceId = 0
+        self._resetReplyData()
+
+    def _start(self, model: QAbstractItemModel, index: QModelIndex, reply: QNetworkReply, type: int,
+            onReplyFinished: Callable[['_VModelLoadRecord'], None]):
+        """Начинает использование записи для действия типа `type` над элементом с индексом `index` модели `model`
+        с ответом на сетевой запрос `reply`. После завершения ответа будет вызван `onReplyFinished` с записью
+        в качестве аргумента.
+
+        Берет на себя ответственность за удаление ответа на сетевой запрос.
+        """
+        self._reset()
+        self.__model = model
+        self.__persistentIndex = QPersistentModelIndex(index)
+        self.__reply = reply
+        self.__type = type
+        self.__onReplyFinished = onReplyFinished
+        # Чтобы ответ удалился вместе с моделью, как и действие, родителем которого является модель.
+        reply.setParent(model)
+        reply.finished.connect(self._handleReplyFinished)
+
+    def _release(self):
+        """Освобождает сетевой ответ и ссылки на модель перед возвращением записи в пул."""
+        if self.__reply is not None:
+            self.__reply.finished.disconnect(self._handleReplyFinished)
+            self.__reply.deleteLater()
+        self.__reply = None
+        self.__model = None
+        self.__onReplyFinished = None
+        self._reset()
+
+    def _handleReplyFinished(self):
+        """Обрабатывает завершение ответа на сетевой запрос."""
+        self.__onReplyFinished(self)
+
+    def _reply(self) -> QNetworkReply:
+        """Переопределяет соответствующий родительский метод."""
+        return self.__reply
+
+    def getModel(self) -> QAbstractItemModel:
+        """Возвращает модель, в которой совершается действие."""
+        return self.__model
+
+    def getIndex(self) -> QModelIndex:
+        """Возвращает индекс элемента, над которым совершается действие."""
+        return QModelIndex(self.__persistentIndex)
+
+    def getType(self) -> int:
+        """Возвращает тип действия."""
+        return self.__type
+
+    def typeName(self) -> str:
+        """Возвращает название типа действия (для отладки и трассировки)."""
+        try:
+            return Vns.ActionType(self.__type).name
+        except ValueError:
+            return str(self.__type)
+
+    def isValid(self) -> bool:
+        """Возвращает True - если действие действительно, иначе - возвращает False."""
+        return self.__isValid
+
+    def isRunning(self) -> bool:
+        """Возвращает True - если действие все еще обрабатывается, иначе - возвращает False."""
+        return not self.__isFinished
+
+    def isFinished(self) -> bool:
+        """Возвращает True - если действие было завершено, иначе - возвращает False."""
+        return self.__isFinished
+
+    def isError(self) -> bool:
+        """Возвращает True - если произошла ошибка, иначе - возвращает False."""
+        return self.__errorType != Vns.ErrorType.NoError
+
+    def errorType(self) -> int:
+        """Возвращает тип ошибки."""
+        return self.__errorType
+
+    def errorInformativeText(self) -> str:
+        """Возвращает общеописательный текст ошибки."""
+        return self.__errorInformativeText
+
+    def errorDetailedText(self) -> str:
+        """Возвращает подробный текст ошибки."""
+        return self.__errorDetailedText
+
+    def setError(self, errorType: int, informativeText: str, detailedText: str = ""):
+        """Устанавливает данные об ошибке, но не устанавливает завершенность действия."""
+        self.__errorType = errorType
+        self.__errorInformativeText = informativeText
+        self.__errorDetailedText = detailedText
+
+    def tracer(self) -> VActionTracer or None:
+        """Возвращает трассировщик действия или None, если трассировка не ведется."""
+        return self.__tracer
+
+    def setTracer(self, tracer: VActionTracer, **args):
+        """Устанавливает трассировщик `tracer` и начинает в нем асинхронный промежуток жизненного цикла действия."""
+        assert self.__tracer is None
+        self.__tracer = tracer
+        if tracer is not None:
+            self.__traceId = tracer.beginAsync(self.typeName(), "action", lightweight=True, **args)
+
+    def setInvalidated(self):
+        """Помечает действие недействительным, инвалидирует действия-последователи и прерывает сетевой запрос."""
+        assert not self.__isFinished
+        assert self.__isValid
+        self.__isValid = False
+        if self.__tracer is not None:
+            self.__tracer.endAsync(self.__traceId, self.typeName(), "action", invalidated=True)
+        followers, self.__followers = self.__followers, []
+        for follower in followers:
+            follower.setInvalidated()
+        self.replyAbort()
+
+    def setFinished(self):
+        """Помечает действие завершенным и завершает действия-последователи с той же ошибкой (если она есть)."""
+        assert self.__isValid
+        assert not self.__isFinished
+        self.__isFinished = True
+        if self.__tracer is not None:
+            self.__tracer.endAsync(self.__traceId, self.typeName(), "action", errorType=int(self.__errorType))
+        followers, self.__followers = self.__followers, []
+        for follower in followers:
+            if self.isError():
+                follower.setError(self.__errorType, self.__errorInformativeText, self.__errorDetailedText)
+            follower.setFinished()
+
+    def materialize(self, parent: QObject = None) -> VNetworkModelAction:
+        """Создает и возвращает полноценное действие :class:`VNetworkModelAction`, которое завершится
+        (или станет недействительным) вместе с данной записью.
+
+        .. note::
+            Сетевой ответ остается во владении записи, поэтому у возвращаемого действия его нет.
+        """
+        assert self.__isValid and not self.__isFinished
+        action = VNetworkModelAction(model=self.__model, index=self.getIndex(), type=self.__type, parent=parent)
+        self.__followers.append(action)
+        return action
+
+
+class _VModelLoadRecordPool:
+    """Пул облегченных записей внутренних действий загрузки модели :class:`_VModelLoadRecord`."""
+
+    DEFAULT_MAX_SIZE = 64
+    """Максимальное количество хранимых в пуле свободных записей по умолчанию."""
+
+    def __init__(self, maxSize: int = DEFAULT_MAX_SIZE):
+        super().__init__()
+
+        self.__maxSize = maxSize
+        self.__records = []
+
+    def acquire(self, model: QAbstractItemModel, index: QModelIndex, reply: QNetworkReply, type: int,
+            onReplyFinished: Callable[[_VModelLoadRecord], None]) -> _VModelLoadRecord:
+        """Возвращает свободную (или новую) запись, начавшую использоваться с указанными параметрами.
+
+        Смотри :func:`_VModelLoadRecord._start()`.
+        """
+        record = self.__records.pop() if self.__records else _VModelLoadRecord()
+        record._start(model, index, reply, type, onReplyFinished)
+        return record
+
+    def release(self, record: _VModelLoadRecord):
+        """Освобождает запись `record` и, если пул не переполнен, возвращает ее в пул."""
+        assert record not in self.__records
+        record._release()
+        if len(self.__records) < self.__maxSize:
+            self.__records.append(record)
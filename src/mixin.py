@@ -5,34 +5,59 @@
 Этот файл принадлежит проекту "VNetworkData".
 Автор: Волков Семён.
 """
-from typing import Callable
+import bisect
+import heapq
+import math
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
 
 from PyQt5.QtCore import (QAbstractItemModel, QCoreApplication, QEventLoop, QModelIndex, QPersistentModelIndex,
-                          QTimer, Qt, pyqtSignal, pyqtSlot)
+                          QThread, QTimer, Qt, pyqtBoundSignal, pyqtProperty, pyqtSignal, pyqtSlot)
 from PyQt5.QtNetwork import QNetworkReply
 
-from .action import VAbstractAsynchronousAction, VNetworkModelAction
+from .action import (VAbstractAsynchronousAction, VAsynchronousAction, VNetworkModelAction, _VModelLoadRecord,
+                     _VModelLoadRecordPool)
 from .namespace import Vns
 from .pagination import VAbstractPagination
+from .subtree import VSubtreeLoadingAction
+from .tracing import NULL_TRACE_SPAN, VActionTracer
 
 
 # TODO: Пока так помечаем то, что должно быть помечено через макрос Q_INVOKABLE.
 vFromQmlInvokable = pyqtSlot
 
 
+def _ancestryPathOf(index: QModelIndex) -> Tuple[Tuple[int, int], ...] or None:
+    """Возвращает путь от корня до элемента с модельным индексом `index` в виде кортежа пар (строка, столбец),
+    если модель индекса поддерживает кэширование путей (смотри :func:`VAbstractNetworkDataModelMixin._ancestryPath()`),
+    иначе - возвращает None."""
+    model = index.model()
+    if isinstance(model, VAbstractNetworkDataModelMixin):
+        return model._ancestryPath(index)
+    return None
+
+
 # TODO: Перенести в кокой-нибудь пакет с названием utils.py.
 def _pathFromRoot(index: QModelIndex, showDisplayData: bool = True) -> str:
     """Возвращает путь от корня до элемента с модельным индексом `index`."""
-    if index.isValid():
-        # TODO: Надо избавиться от рекурсии - надо переписать с помощью цикла while!
+    parts = []
+    if not showDisplayData:
+        path = _ancestryPathOf(index) if index.isValid() else ()
+        if path is not None:
+            parts = ["({},{})".format(row, column) for row, column in reversed(path)]
+            index = QModelIndex()
+    while index.isValid():
         if showDisplayData:
-            return "{parent} -> ({row},{column})'{name}'".format(
-                    parent=_pathFromRoot(index.parent()), row=index.row(), column=index.column(),
-                    name=index.data(Qt.DisplayRole))
+            parts.append("({row},{column})'{name}'".format(
+                    row=index.row(), column=index.column(), name=index.data(Qt.DisplayRole)))
         else:
-            return "{parent} -> ({row},{column})".format(
-                    parent=_pathFromRoot(index.parent()), row=index.row(), column=index.column())
-    return "(-1,-1)'InvalidIndex'"
+            parts.append("({row},{column})".format(row=index.row(), column=index.column()))
+        index = index.parent()
+    parts.append("(-1,-1)'InvalidIndex'")
+    return " -> ".join(reversed(parts))
 
 
 # TODO: Перенести в кокой-нибудь пакет с названием utils.py.
@@ -46,6 +71,12 @@ def isAncestor(ancestor: QModelIndex, descendant: QModelIndex) -> bool:
     if ancestor.model() is not descendant.model():
         return False
 
+    descendantPath = _ancestryPathOf(descendant)
+    if descendantPath is not None:
+        # Сравнение префиксов путей от корня.
+        ancestorPath = _ancestryPathOf(ancestor)
+        return len(ancestorPath) < len(descendantPath) and descendantPath[:len(ancestorPath)] == ancestorPath
+
     parent = descendant.parent()
     while parent.isValid():
         if parent == ancestor:
@@ -71,6 +102,18 @@ def isDescendant(descendant: QModelIndex, parent: QModelIndex, top: int, bottom:
     if parent.isValid() and parent.model() is not descendant.model():
         return False
 
+    descendantPath = _ancestryPathOf(descendant)
+    if descendantPath is not None:
+        # Сравнение префиксов путей от корня.
+        parentPath = _ancestryPathOf(parent) if parent.isValid() else ()
+        depth = len(parentPath)
+        if len(descendantPath) <= (depth if inclusive else depth + 1):
+            return False
+        if descendantPath[:depth] != parentPath:
+            return False
+        row, column = descendantPath[depth]
+        return top <= row <= bottom and left <= column <= right
+
     ancestor = descendant
     if not inclusive:
         ancestor = descendant.parent()
@@ -93,8 +136,36 @@ class VChildrenLoadingInfo:
 
         self.inReloading = False  # Позволяет отличить перезагрузку подэлементов от прочих видов загрузок подэлементов.
         self.state = Vns.LoadingState.Idle
+        self.loadingStartedAt = 0.0  # Время начала последней загрузки подэлементов (по time.perf_counter()).
         self.policy = policy
         self.pagination = pagination
+        self.pageStates = dict()  # Номер страницы -> состояние ее загрузки при параллельной загрузке страниц.
+        self.validators = dict()  # Валидаторы последнего успешного ответа: имя заголовка -> его значение (bytes).
+
+
+class VChildrenLoadingTemplate:
+    """Шаблон загрузки подэлементов - общее для всех элементов одного вида (уровня) описание политики загрузки
+    и пагинации их подэлементов.
+
+    Один экземпляр шаблона устанавливается в данные всех элементов одного вида вместо отдельных экземпляров
+    :class:`VChildrenLoadingInfo`. Контейнер :class:`VChildrenLoadingInfo` (вместе с объектом пагинации) создается
+    по шаблону только при первом обращении к нему, поэтому элементы, подэлементы которых никто не загружал,
+    не держат собственных объектов.
+    """
+
+    def __init__(self, policy: Vns.LoadingPolicy, paginationFactory: Callable[[], VAbstractPagination]):
+        """
+        :param policy: Политика загрузки подэлементов.
+        :param paginationFactory: Функция (или класс) без аргументов, создающая пагинацию подэлементов.
+        """
+        super().__init__()
+
+        self.policy = policy
+        self.paginationFactory = paginationFactory
+
+    def createInfo(self) -> VChildrenLoadingInfo:
+        """Создает и возвращает контейнер со вспомогательной (служебной) информацией о загрузке подэлементов."""
+        return VChildrenLoadingInfo(self.policy, self.paginationFactory())
 
 
 class VDetailsLoadingInfo:
@@ -105,6 +176,251 @@ class VDetailsLoadingInfo:
 
         self.loaded = False  # Загружены ли подробные данные об элементе.
         self.state = Vns.LoadingState.Idle
+        self.timeToLive = None  # Время жизни подробных данных (в миллисекундах), None - как у модели.
+        self.loadedAt = 0.0  # Момент последней успешной загрузки подробных данных (по time.monotonic()).
+        self.expiresAt = math.inf  # Момент устаревания загруженных подробных данных (по time.monotonic()).
+        self.revalidating = False  # Идет ли фоновая перепроверка устаревших подробных данных.
+        self.revalidationFailures = 0  # Количество неудачных фоновых перепроверок подряд.
+        self.validators = dict()  # Валидаторы последнего успешного ответа: имя заголовка -> его значение (bytes).
+
+
+class _VTimeHistogram:
+    """Гистограмма длительностей (счетчик производительности модели) с корзинами по границам :attr:`BOUNDS`.
+
+    Значения добавляются и из рабочих потоков (например, при фоновом построении подэлементов), поэтому изменения
+    гистограммы защищены блокировкой.
+    """
+
+    BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+    """Верхние границы корзин (в миллисекундах); последняя корзина не ограничена сверху."""
+
+    __slots__ = ('__lock', '__counts', '__count', '__total')
+
+    def __init__(self):
+        super().__init__()
+
+        self.__lock = threading.Lock()
+        self.__counts = [0] * (len(self.BOUNDS) + 1)
+        self.__count = 0
+        self.__total = 0.0  # Сумма длительностей (в секундах).
+
+    def count(self) -> int:
+        """Возвращает количество добавленных длительностей."""
+        return self.__count
+
+    def total(self) -> float:
+        """Возвращает сумму добавленных длительностей (в секундах)."""
+        return self.__total
+
+    def add(self, seconds: float):
+        """Добавляет длительность `seconds` (в секундах)."""
+        bucket = bisect.bisect_left(self.BOUNDS, seconds * 1000)
+        with self.__lock:
+            self.__counts[bucket] += 1
+            self.__count += 1
+            self.__total += seconds
+
+    def reset(self):
+        """Сбрасывает гистограмму."""
+        with self.__lock:
+            self.__counts = [0] * (len(self.BOUNDS) + 1)
+            self.__count = 0
+            self.__total = 0.0
+
+    def snapshot(self) -> dict:
+        """Возвращает копию гистограммы в виде словаря: количество, сумма (в секундах) и список количеств
+        по корзинам (в порядке :attr:`BOUNDS`, последнее - больше последней границы)."""
+        with self.__lock:
+            return {"count": self.__count, "total": self.__total, "buckets": list(self.__counts)}
+
+
+_MISSING_FIELD = object()
+"""Значение поля, которого не было в словаре данных элемента до его изменения."""
+
+
+class _VDataChange:
+    """Изменение данных одного элемента, отправляемое по сети (смотри
+    :func:`VAbstractNetworkDataModelMixin.sendData()`).
+
+    Пока изменение не отправлено, в него объединяются все последующие правки того же элемента.
+    """
+
+    def __init__(self, action: VNetworkModelAction):
+        """
+        :param action: Действие изменения элемента, общее для всех объединенных правок.
+        """
+        super().__init__()
+
+        self.action = action
+        self.changes = dict()  # Поле словаря данных элемента -> новое значение.
+        self.originals = dict()  # Поле -> значение до изменения (для отката), _MISSING_FIELD - если поля не было.
+        self.sent = False  # Отправлено ли изменение.
+
+
+class _VDetailsLoadingBatch:
+    """Состояние пакетной загрузки подробных данных нескольких элементов
+    (смотри :func:`VAbstractNetworkDataModelMixin.reloadDetailsFor()`)."""
+
+    def __init__(self, action: VNetworkModelAction):
+        """
+        :param action: Общее действие загрузки подробных данных всех элементов пакета.
+        """
+        super().__init__()
+
+        self.action = action
+        self.pendingCount = 0  # Количество загрузок, ответы на которые еще не применены.
+        self.finishedRecords = []  # Записи завершенных загрузок, ожидающие применения.
+        self.flushScheduled = False  # Запланировано ли применение завершенных загрузок.
+        self.firstError = None  # Тройка (тип, общеописательный текст, подробный текст) первой ошибки загрузки.
+        self.indexes = set()  # Постоянные индексы элементов, подробные данные которых загружаются пакетом.
+
+
+class _VChildrenPagesLoading:
+    """Состояние параллельной загрузки оставшихся страниц подэлементов одного элемента
+    (смотри :func:`VAbstractNetworkDataModelMixin.loadRemainingChildren()`)."""
+
+    def __init__(self, action: VNetworkModelAction, pages: List[int]):
+        """
+        :param action: Общее действие загрузки всех страниц.
+        :param pages: Номера загружаемых страниц в порядке их вставки.
+        """
+        super().__init__()
+
+        self.action = action
+        self.pages = pages
+        self.positions = {page: position for position, page in enumerate(pages)}
+        self.nextToRequest = 0  # Позиция следующей запрашиваемой страницы.
+        self.nextToInsert = 0  # Позиция следующей вставляемой страницы.
+        self.running = dict()  # Номер страницы -> запись загрузки страницы, ответ на которую еще не пришел.
+        self.buffered = dict()  # Номер страницы -> запись загруженной страницы, ожидающей своей очереди на вставку.
+        self.failedAt = None  # Позиция самой первой страницы, загрузка или вставка которой завершилась ошибкой.
+
+    def limit(self) -> int:
+        """Возвращает позицию, до которой (не включительно) страницы еще могут быть вставлены."""
+        return len(self.pages) if self.failedAt is None else self.failedAt
+
+
+class _VActionRegistryNode:
+    """Узел реестра действий :class:`_VActionRegistry`, соответствующий одному элементу модели."""
+
+    __slots__ = ('key', 'parent', 'children', 'actions')
+
+    def __init__(self, key: QPersistentModelIndex or None, parent: '_VActionRegistryNode' or None):
+        self.key = key  # Постоянный индекс элемента (None - для корня модели).
+        self.parent = parent
+        self.children = dict()  # Постоянный индекс подэлемента -> узел подэлемента.
+        self.actions = set()  # Действия, совершаемые над самим элементом.
+
+    def isEmpty(self) -> bool:
+        """Возвращает True - если в узле и в его потомках нет действий, иначе - возвращает False."""
+        return not self.actions and not self.children
+
+
+class _VActionRegistry:
+    """Реестр действий модели, проиндексированный по цепочкам предков элементов, над которыми совершаются действия.
+
+    Реестр является префиксным деревом, узлы которого соответствуют элементам модели, а ключами служат постоянные
+    индексы :class:`QPersistentModelIndex` (их хэш не меняется при сдвиге строк). В дереве хранятся только
+    элементы, над которыми или над потомками которых совершаются действия.
+
+    Поэтому поиск действий, совершаемых над удаляемыми элементами и их потомками, обходит только цепочку предков
+    родителя удаляемых элементов и поддеревья самих удаляемых элементов, а не все зарегистрированные действия.
+
+    .. warning::
+        При перемещении элементов между родителями цепочки предков устаревают, поэтому после перемещения
+        реестр необходимо перестроить методом :func:`rebuild()`.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self.__root = _VActionRegistryNode(None, None)
+        self.__nodes = dict()  # Действие -> узел элемента, над которым оно совершается.
+
+    def __len__(self) -> int:
+        return len(self.__nodes)
+
+    def __contains__(self, action) -> bool:
+        return action in self.__nodes
+
+    def __iter__(self):
+        # Перебираем копию, так как при инвалидации действия прерывается его сетевой запрос, и регистрация действия
+        # может быть отменена синхронно.
+        return iter(tuple(self.__nodes))
+
+    def actions(self) -> set:
+        """Возвращает множество всех зарегистрированных действий."""
+        return set(self.__nodes)
+
+    def _findNode(self, index: QModelIndex, create: bool) -> _VActionRegistryNode or None:
+        """Возвращает узел элемента с индексом `index` (создавая недостающие узлы, если `create` равен True)
+        или None, если узла нет."""
+        chain = []
+        while index.isValid():
+            chain.append(index)
+            index = index.parent()
+        node = self.__root
+        for index in reversed(chain):
+            key = QPersistentModelIndex(index)
+            child = node.children.get(key)
+            if child is None:
+                if not create:
+                    return None
+                child = _VActionRegistryNode(key, node)
+                node.children[key] = child
+            node = child
+        return node
+
+    def add(self, action):
+        """Добавляет действие `action` в реестр."""
+        assert action not in self.__nodes
+        node = self._findNode(action.getIndex(), create=True)
+        node.actions.add(action)
+        self.__nodes[action] = node
+
+    def remove(self, action):
+        """Удаляет действие `action` из реестра и удаляет опустевшие узлы."""
+        node = self.__nodes.pop(action)
+        node.actions.remove(action)
+        while node.parent is not None and node.isEmpty():
+            # Удаляем по тому же самому объекту ключа, так как после удаления элемента из модели
+            # постоянные индексы становятся недействительными и сравниваются некорректно.
+            del node.parent.children[node.key]
+            node = node.parent
+
+    def clear(self):
+        """Удаляет все действия из реестра."""
+        self.__root = _VActionRegistryNode(None, None)
+        self.__nodes = dict()
+
+    def rebuild(self):
+        """Перестраивает реестр по текущим индексам элементов зарегистрированных действий."""
+        actions = tuple(self.__nodes)
+        self.clear()
+        for action in actions:
+            self.add(action)
+
+    def actionsForItem(self, index: QModelIndex) -> List:
+        """Возвращает список действий, совершаемых над самим элементом с индексом `index` (без его потомков)."""
+        node = self._findNode(index, create=False)
+        return list(node.actions) if node is not None else []
+
+    def actionsForItems(self, parent: QModelIndex, top: int, bottom: int, left: int, right: int) -> List:
+        """Возвращает список действий, совершаемых над элементами, которые находятся в элементе с индексом `parent`
+        между строками `top` и `bottom` включительно и между столбцами `left` и `right` включительно, а также
+        над всеми потомками этих элементов."""
+        parentNode = self._findNode(parent, create=False)
+        if parentNode is None:
+            return []
+        result = []
+        for key, node in parentNode.children.items():
+            if top <= key.row() <= bottom and left <= key.column() <= right:
+                stack = [node]
+                while stack:
+                    node = stack.pop()
+                    result.extend(node.actions)
+                    stack.extend(node.children.values())
+        return result
 
 
 class VAbstractNetworkDataModelMixin:
@@ -148,6 +464,8 @@ class VAbstractNetworkDataModelMixin:
 
     Ограничения и свободы действий загрузки подэлементов:
         - Из одного элемента одновременно может происходить только одно действие загрузки подэлементов.
+          Повторные запросы загрузки подэлементов элемента, подэлементы которого уже загружаются, не запускают
+          новую загрузку, а возвращают действие уже выполняющейся загрузки (или одной отложенной перезагрузки).
         - Действие загрузки подэлементов из одного элемента независимо от действий загрузки подэлементов из любых других
           элементов, даже вложенных, то есть даже если они являются подэлементами элемента или его подэлементов и т.д.
         - Действие загрузки подэлементов независимо от любых других типов сетевых действий модели.
@@ -167,6 +485,12 @@ class VAbstractNetworkDataModelMixin:
     .. warning::
         Пагинация подэлементов должна быть установлена до первой загрузки подэлементов!
 
+    Если ограничить количество одновременных загрузок подэлементов (смотри :func:`setMaxConcurrentChildrenLoads()`),
+    то не поместившиеся в предел загрузки ставятся в очередь и запускаются по приоритету: сначала на путях
+    к выделенным и текущему элементам (смотри :func:`setFocusedIndexes()`), затем видимые, затем остальные.
+    Запущенные представлениями (через :func:`fetchMore()`) загрузки невидимых элементов удаляются из очереди
+    до начала, а загрузки свернутых элементов можно отменить методом :func:`cancelQueuedChildrenLoads()`.
+
     Загрузка подробных данных об элементах.
     ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
@@ -182,14 +506,80 @@ class VAbstractNetworkDataModelMixin:
 
     Для загрузки подробных данных используются методы :func:`canReloadDetails()` и :func:`reloadDetails()`.
 
+    Если политика загрузки подробных данных модели (смотри :func:`setDetailsLoadingPolicy()`) включает
+    `Vns.LoadingPolicy.Automatically`, то подробные данные загружаются автоматически для видимых элементов,
+    о которых представление сообщает с помощью метода :func:`setVisibleRows()`.
+
     Ограничения и свободы действий загрузки подробных данных:
         - Для одного элемента одновременно может происходить только одно действие загрузки подробных данных.
+          Повторный запрос перезагрузки подробных данных во время их загрузки возвращает действие уже выполняющейся
+          загрузки.
         - Действие загрузки подробных данных одного элемента независимо от действий загрузки подробных данных любых
           других элементов.
         - Действие загрузки подробных данных независимо от любых других типов сетевых действий модели.
           TODO: На данный момент при модификации элемента его модифицируемые данные не должны пересекаться с его подробными данными!
+
+    Изменение данных элементов.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Метод :func:`sendData()` сразу применяет изменение к словарю данных элемента (оптимистично), а по сети отправляет
+    его позже: изменения накапливаются в течение окна :func:`sendingDelay()`, повторные правки одного элемента
+    объединяются, а изменения разных элементов отправляются пакетами (не более :func:`maxSendingBatchSize()`
+    элементов в одном запросе). Запрос пакета создают наследники класса в методе :func:`_requestToSendingData()`
+    (например, один bulk PATCH). Если отправка не удалась, то измененные поля, которые с тех пор никто не менял,
+    откатываются к прежним значениям.
+
+    Счетчики производительности.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Модель ведет дешевые счетчики своей работы: запущенные и завершенные действия по типам, ошибки по типам, принятые
+    байты, гистограммы времени разбора ответов и вставки строк, вставленные и удаленные строки, хранимые элементы
+    и выполняющиеся действия. Итоговые значения доступны как свойства Qt (например, из QML), уведомления об их
+    изменении объединяются сигналом :attr:`performanceCountersChanged`, а полный снимок со всеми разбивками
+    возвращает метод :func:`performanceCounters()`.
     """
 
+    DEFAULT_DETAILS_LOADING_DELAY = 150
+    """Задержка (в миллисекундах) автоматической загрузки подробных данных видимых элементов по умолчанию."""
+
+    DEFAULT_DETAILS_TIME_TO_LIVE = -1
+    """Время жизни (в миллисекундах) загруженных подробных данных по умолчанию (-1 - подробные данные не устаревают)."""
+
+    DEFAULT_DETAILS_REVALIDATION_INTERVAL = 1000
+    """Период (в миллисекундах) проверки видимых элементов на устаревание подробных данных по умолчанию."""
+
+    MAX_DETAILS_REVALIDATION_BACKOFF = 5 * 60 * 1000
+    """Максимальная отсрочка (в миллисекундах) повторной перепроверки подробных данных после неудачной перепроверки."""
+
+    DEFAULT_SUBTREE_LOADING_CONCURRENCY = 4
+    """Максимальное количество элементов, подэлементы которых одновременно загружаются при загрузке поддерева,
+    по умолчанию."""
+
+    DEFAULT_CHILDREN_PREFETCH_THRESHOLD = 20
+    """Минимальное количество строк до конца загруженных подэлементов, при котором начинается упреждающая загрузка
+    следующей порции подэлементов, по умолчанию."""
+
+    PREFETCH_SAFETY_FACTOR = 1.5
+    """Запас, с которым адаптивный порог упреждающей загрузки покрывает строки, прокручиваемые за время загрузки."""
+
+    PREFETCH_SMOOTHING_FACTOR = 0.3
+    """Коэффициент экспоненциального сглаживания задержки загрузки порции подэлементов и скорости прокрутки."""
+
+    QUEUE_WAIT_SMOOTHING_FACTOR = 0.3
+    """Коэффициент экспоненциального сглаживания времени ожидания загрузок подэлементов в очереди."""
+
+    VALIDATOR_HEADERS = (b"ETag", b"Last-Modified")
+    """Заголовки ответа, запоминаемые после успешной загрузки как валидаторы загруженных данных."""
+
+    DEFAULT_SENDING_DELAY = 50
+    """Окно (в миллисекундах), в течение которого изменения данных накапливаются перед отправкой, по умолчанию."""
+
+    DEFAULT_MAX_SENDING_BATCH_SIZE = 100
+    """Максимальное количество элементов, изменения которых отправляются одним запросом, по умолчанию."""
+
+    PERFORMANCE_COUNTERS_NOTIFY_INTERVAL = 250
+    """Минимальный период (в миллисекундах) испускания сигнала об изменении счетчиков производительности."""
+
     def __init__(self, *args, **kwargs):
         assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
         super().__init__(*args, **kwargs)
@@ -200,11 +590,143 @@ class VAbstractNetworkDataModelMixin:
         self.__errorDetailedText = ""
         self.__errorPersistentModelIndex = QPersistentModelIndex()
 
-        self.__actions = set()  # Множество зарегистрированных действий.
+        self.__actions = _VActionRegistry()  # Реестр зарегистрированных действий.
+        self.__loadRecordPool = _VModelLoadRecordPool()  # Пул облегченных записей внутренних действий загрузки.
+
+        self.__tracer = None  # Трассировщик действий и этапов загрузки (трассировка отключена, пока он не задан).
+
+        # Счетчики производительности (смотри performanceCounters()):
+        self.__startedActionsCounts = dict()  # Тип действия -> количество зарегистрированных действий.
+        self.__finishedActionsCounts = dict()  # Тип действия -> количество действий, регистрация которых отменена.
+        self.__errorsCounts = dict()  # Тип ошибки -> количество действий, завершенных с этой ошибкой.
+        self.__bytesReceived = 0
+        self.__timeHistograms = {"parse": _VTimeHistogram(), "insert": _VTimeHistogram()}
+        self.__rowsInsertedCount = 0
+        self.__rowsRemovedCount = 0
+        self.__performanceCountersTimer = QTimer(self)  # Таймер объединения уведомлений об изменении счетчиков.
+        self.__performanceCountersTimer.setSingleShot(True)
+        self.__performanceCountersTimer.setInterval(self.PERFORMANCE_COUNTERS_NOTIFY_INTERVAL)
+        self.__performanceCountersTimer.timeout.connect(self.performanceCountersChanged)
+        self.rowsInserted.connect(self._countRowsInserted)
+        self.rowsRemoved.connect(self._countRowsRemoved)
+
+        # Пакетирование сигналов dataChanged (смотри _dataChangedBatch()):
+        self.__dataChangedBatchDepth = 0
+        # (строка, столбец, внутренний идентификатор родителя, левый столбец, правый столбец, роли)
+        # -> [индекс родителя, множество строк].
+        self.__pendingDataChanges = dict()
+
+        # Незавершенные пакетные загрузки подробных данных (смотри reloadDetailsFor()):
+        self.__detailsLoadingBatches = []
+
+        # Пакетирование уведомлений о состоянии загрузки (смотри setLoadingNotificationsBatching()):
+        self.__loadingNotificationsBatching = False
+        # (роль, постоянный индекс элемента (None - для корня модели)) -> значение до первого изменения в пакете.
+        self.__pendingLoadingChanges = dict()
+        self.__loadingNotificationsTimer = QTimer(self)  # Таймер отправки пакета в конце круга цикла событий.
+        self.__loadingNotificationsTimer.setSingleShot(True)
+        self.__loadingNotificationsTimer.setInterval(0)
+        self.__loadingNotificationsTimer.timeout.connect(self._flushLoadingNotifications)
+
+        # Кэш путей от корня до элементов: (строка, столбец, внутренний идентификатор) -> кортеж пар (строка, столбец).
+        self.__ancestryPaths = dict()
+        self.rowsInserted.connect(self._handleRowsInsertedForAncestry)
+        self.rowsRemoved.connect(self._resetAncestryPaths)
+        self.rowsMoved.connect(self._resetAncestryPaths)
+        self.columnsInserted.connect(self._resetAncestryPaths)
+        self.columnsRemoved.connect(self._resetAncestryPaths)
+        self.columnsMoved.connect(self._resetAncestryPaths)
+        self.layoutChanged.connect(self._resetAncestryPaths)
+        self.modelReset.connect(self._resetAncestryPaths)
+
+        # Видимые строки, о которых сообщают представления: постоянный индекс родителя (None - для корня модели)
+        # -> пара (первая строка, последняя строка).
+        self.__visibleRows = dict()
+        self.__detailsLoadingPolicy = Vns.LoadingPolicy.Manually
+        # Таймер отложенной загрузки подробных данных видимых элементов:
+        self.__visibleDetailsLoadingTimer = QTimer(self)
+        self.__visibleDetailsLoadingTimer.setSingleShot(True)
+        self.__visibleDetailsLoadingTimer.setInterval(self.DEFAULT_DETAILS_LOADING_DELAY)
+        self.__visibleDetailsLoadingTimer.timeout.connect(self._loadVisibleDetails)
+        self.__detailsTimeToLive = self.DEFAULT_DETAILS_TIME_TO_LIVE
+        self.__hasItemDetailsTimeToLive = False  # Задавалось ли время жизни подробных данных отдельным элементам.
+        self.__detailsRevalidationTimer = QTimer(self)  # Таймер проверки видимых элементов на устаревание.
+        self.__detailsRevalidationTimer.setInterval(self.DEFAULT_DETAILS_REVALIDATION_INTERVAL)
+        self.__detailsRevalidationTimer.timeout.connect(self._loadVisibleDetails)
+        self.rowsInserted.connect(self._handleRowsInsertedForViewport)
+        self.modelReset.connect(self.__visibleRows.clear)
+
+        # Упреждающая загрузка подэлементов:
+        self.__childrenPrefetchThreshold = self.DEFAULT_CHILDREN_PREFETCH_THRESHOLD
+        self.__childrenLoadingLatency = 0.0  # Сглаженная задержка загрузки порции подэлементов (в секундах).
+        # Ключ видимых строк -> (время, последняя строка, сглаженная скорость в строках в секунду):
+        self.__scrollVelocities = dict()
+        self.modelReset.connect(self.__scrollVelocities.clear)
+        self.childrenLoadingFinished.connect(self._handleChildrenLoadingFinishedForPrefetch)
+
+        # Неблокирующие ожидания возможности загрузки подэлементов (смотри _whenCanLoadChildren()):
+        # постоянный индекс элемента (None - для корня модели) -> список пар (действие ожидания, метод проверки).
+        self.__childrenWaiters = dict()
+        self.__childrenWaitersToCheck = set()  # Ключи элементов, ожидания которых нужно проверить.
+        self.__childrenWaitersCheckTimer = QTimer(self)  # Таймер отложенной проверки ожиданий.
+        self.__childrenWaitersCheckTimer.setSingleShot(True)
+        self.__childrenWaitersCheckTimer.setInterval(0)
+        self.__childrenWaitersCheckTimer.timeout.connect(self._checkChildrenWaiters)
+        # Куча четверок (крайний срок, порядковый номер, действие ожидания, ключ элемента).
+        self.__childrenWaitersDeadlines = []
+        self.__childrenWaitersCount = 0  # Порядковый номер для упорядочивания ожиданий с одинаковым крайним сроком.
+        self.__childrenWaitersTimeoutTimer = QTimer(self)  # Один таймер на ближайший крайний срок всех ожиданий.
+        self.__childrenWaitersTimeoutTimer.setSingleShot(True)
+        self.__childrenWaitersTimeoutTimer.timeout.connect(self._expireChildrenWaiters)
+
+        # Очередь загрузок подэлементов (смотри setMaxConcurrentChildrenLoads()):
+        self.__maxConcurrentChildrenLoads = -1  # Без ограничения (очередь не используется).
+        self.__runningChildrenLoads = set()  # Запущенные действия (и облегченные записи) загрузки подэлементов.
+        # Действие загрузки в очереди -> тройка (порядковый номер, время постановки в очередь, можно ли удалить
+        # загрузку из очереди, если элемент не виден).
+        self.__queuedChildrenLoads = dict()
+        self.__queuedChildrenLoadsCount = 0  # Порядковый номер для упорядочивания загрузок с одинаковым приоритетом.
+        self.__droppedChildrenLoadsCount = 0
+        self.__childrenLoadingQueueWaitTime = 0.0  # Сглаженное время ожидания загрузки в очереди (в секундах).
+        self.__focusedIndexes = []  # Постоянные индексы выделенных и текущего элементов представления.
+        self.__childrenLoadingQueueTimer = QTimer(self)  # Таймер отложенного обновления очереди загрузок.
+        self.__childrenLoadingQueueTimer.setSingleShot(True)
+        self.__childrenLoadingQueueTimer.setInterval(0)
+        self.__childrenLoadingQueueTimer.timeout.connect(self._updateChildrenLoadingQueue)
+        # Общее действие параллельной загрузки страниц -> ее состояние (смотри loadRemainingChildren()).
+        self.__childrenPagesLoadings = dict()
+
+        # Отправка изменений данных (смотри sendData()):
+        self.__sendingDelay = self.DEFAULT_SENDING_DELAY
+        self.__maxSendingBatchSize = self.DEFAULT_MAX_SENDING_BATCH_SIZE
+        self.__pendingSendChanges = dict()  # Постоянный индекс элемента -> еще не отправленное изменение.
+        # Постоянный индекс элемента -> список его неподтвержденных изменений (от старых к новым).
+        self.__unconfirmedDataChanges = dict()
+        self.__sentDataChanges = dict()  # Действие отправки пакета -> список пар (постоянный индекс, изменение).
+        self.__sendingTimer = QTimer(self)  # Таймер окна накопления изменений.
+        self.__sendingTimer.setSingleShot(True)
+        self.__sendingTimer.setInterval(self.__sendingDelay)
+        self.__sendingTimer.timeout.connect(self.sendPendingData)
+
+        # Отложенные перезагрузки подэлементов, запрошенные во время других загрузок (смотри reloadChildren()):
+        # постоянный индекс элемента (None - для корня модели) -> действие отложенной перезагрузки.
+        self.__pendingChildrenReloads = dict()
+        # Действие-последователь облегченной записи (смотри _runningLoading()) -> запись, за которой оно следует.
+        self.__loadRecordFollowers = dict()
+        self.childrenLoadingStateChanged.connect(self._scheduleChildrenWaitersCheck)
+        self.childrenLoadingPolicyChanged.connect(self._scheduleChildrenWaitersCheck)
+        self._childrenPaginationChanged.connect(self._scheduleChildrenWaitersCheck)
+        self.rowsRemoved.connect(self._invalidateRemovedChildrenWaiters)
+        self.columnsRemoved.connect(self._invalidateRemovedChildrenWaiters)
+        self.modelAboutToBeReset.connect(self._invalidateAllChildrenWaiters)
 
         self.modelAboutToBeReset.connect(self._invalidateAllActions)
         self.columnsAboutToBeRemoved.connect(self._invalidateActionsForColumns)
         self.rowsAboutToBeRemoved.connect(self._invalidateActionsForRows)
+        # После перемещения элементов цепочки их предков в реестре действий устаревают.
+        self.rowsMoved.connect(self.__actions.rebuild)
+        self.columnsMoved.connect(self.__actions.rebuild)
+        self.layoutChanged.connect(self.__actions.rebuild)
 
     # ===============
     # ==== error ====
@@ -256,13 +778,422 @@ class VAbstractNetworkDataModelMixin:
         self.__errorDetailedText = ""
         self.__errorPersistentModelIndex = QPersistentModelIndex()
 
+    # =================
+    # ==== tracing ====
+    # =================
+
+    def tracer(self) -> VActionTracer or None:
+        """Возвращает трассировщик модели или None, если трассировка отключена."""
+        return self.__tracer
+
+    def setTracer(self, tracer: VActionTracer or None):
+        """Устанавливает трассировщик `tracer` действий и этапов загрузки данных модели.
+
+        Трассировщик передается во все действия загрузки, запущенные после его установки.
+        Чтобы отключить трассировку, передайте None.
+        """
+        self.__tracer = tracer
+
+    def _traceSpan(self, name: str, index: QModelIndex = None, **args):
+        """Возвращает контекстный менеджер промежутка трассировки с названием `name`.
+
+        Если указан модельный индекс `index`, то в аргументы промежутка добавляется путь до элемента.
+        Если трассировка отключена, то возвращает общий пустой промежуток, ничего не записывающий.
+        """
+        tracer = self.__tracer
+        if tracer is None:
+            return NULL_TRACE_SPAN
+        if index is not None:
+            args['path'] = _pathFromRoot(index, showDisplayData=False)
+        return tracer.span(name, "model", **args)
+
+    def _traceAction(self, action: VNetworkModelAction):
+        """Передает трассировщик модели (если трассировка включена) только что созданному действию `action`."""
+        if self.__tracer is not None:
+            action.setTracer(self.__tracer, path=_pathFromRoot(action.getIndex(), showDisplayData=False))
+
+    # ==============================
+    # ==== performance counters ====
+    # ==============================
+
+    performanceCountersChanged = pyqtSignal()
+    """Сигнал об изменении счетчиков производительности (испускается не чаще
+    :attr:`PERFORMANCE_COUNTERS_NOTIFY_INTERVAL`)."""
+
+    def getStartedActionsCount(self) -> int:
+        """Возвращает количество запущенных (зарегистрированных) действий всех типов."""
+        return sum(self.__startedActionsCounts.values())
+
+    startedActionsCount = pyqtProperty(type='qint64', fget=getStartedActionsCount, notify=performanceCountersChanged,
+            doc="Количество запущенных действий.")
+
+    def getFinishedActionsCount(self) -> int:
+        """Возвращает количество завершенных (в том числе недействительных) действий всех типов."""
+        return sum(self.__finishedActionsCounts.values())
+
+    finishedActionsCount = pyqtProperty(type='qint64', fget=getFinishedActionsCount,
+            notify=performanceCountersChanged, doc="Количество завершенных действий.")
+
+    def getErrorsCount(self) -> int:
+        """Возвращает количество действий, завершенных с ошибкой."""
+        return sum(self.__errorsCounts.values())
+
+    errorsCount = pyqtProperty(type='qint64', fget=getErrorsCount, notify=performanceCountersChanged,
+            doc="Количество действий, завершенных с ошибкой.")
+
+    def getRunningActionsCount(self) -> int:
+        """Возвращает количество выполняющихся (зарегистрированных) действий."""
+        return len(self.__actions)
+
+    runningActionsCount = pyqtProperty(type=int, fget=getRunningActionsCount, notify=performanceCountersChanged,
+            doc="Количество выполняющихся действий.")
+
+    def getBytesReceived(self) -> int:
+        """Возвращает количество байт, принятых в телах ответов загрузок подэлементов и подробных данных."""
+        return self.__bytesReceived
+
+    bytesReceived = pyqtProperty(type='qint64', fget=getBytesReceived, notify=performanceCountersChanged,
+            doc="Количество принятых байт.")
+
+    def getParseTime(self) -> float:
+        """Возвращает суммарное время разбора тел ответов (в секундах)."""
+        return self.__timeHistograms["parse"].total()
+
+    parseTime = pyqtProperty(type=float, fget=getParseTime, notify=performanceCountersChanged,
+            doc="Суммарное время разбора тел ответов (в секундах).")
+
+    def getInsertionTime(self) -> float:
+        """Возвращает суммарное время вставки строк (в секундах)."""
+        return self.__timeHistograms["insert"].total()
+
+    insertionTime = pyqtProperty(type=float, fget=getInsertionTime, notify=performanceCountersChanged,
+            doc="Суммарное время вставки строк (в секундах).")
+
+    def getRowsInsertedCount(self) -> int:
+        """Возвращает количество вставленных строк (без учета подэлементов, вставленных вместе со строками)."""
+        return self.__rowsInsertedCount
+
+    rowsInsertedCount = pyqtProperty(type='qint64', fget=getRowsInsertedCount, notify=performanceCountersChanged,
+            doc="Количество вставленных строк.")
+
+    def getRowsRemovedCount(self) -> int:
+        """Возвращает количество удаленных строк (без учета подэлементов, удаленных вместе со строками)."""
+        return self.__rowsRemovedCount
+
+    rowsRemovedCount = pyqtProperty(type='qint64', fget=getRowsRemovedCount, notify=performanceCountersChanged,
+            doc="Количество удаленных строк.")
+
+    def getHeldItemsCount(self) -> int:
+        """Возвращает количество элементов, хранимых моделью (-1 - если неизвестно).
+
+        .. note::
+            Базовая реализация возвращает -1. Наследники класса, которые могут дешево подсчитывать хранимые
+            элементы, должны переопределить этот метод.
+        """
+        return -1
+
+    # Метод получения переопределяется наследниками, поэтому свойство вызывает его через экземпляр.
+    heldItemsCount = pyqtProperty(type='qint64', fget=lambda self: self.getHeldItemsCount(),
+            notify=performanceCountersChanged, doc="Количество хранимых элементов.")
+
+    @vFromQmlInvokable(result='QVariantMap')
+    def performanceCounters(self) -> dict:
+        """Возвращает снимок счетчиков производительности в виде словаря.
+
+        Количества действий и ошибок разбиты по типам (ключи - названия `Vns.ActionType` и `Vns.ErrorType`),
+        а для времени разбора и вставки возвращаются гистограммы (смотри :attr:`_VTimeHistogram.BOUNDS`).
+        """
+        return {
+            "startedActions": self._countsByName(self.__startedActionsCounts, Vns.ActionType),
+            "finishedActions": self._countsByName(self.__finishedActionsCounts, Vns.ActionType),
+            "errors": self._countsByName(self.__errorsCounts, Vns.ErrorType),
+            "runningActions": self.getRunningActionsCount(),
+            "bytesReceived": self.__bytesReceived,
+            "parseTime": self.__timeHistograms["parse"].snapshot(),
+            "insertionTime": self.__timeHistograms["insert"].snapshot(),
+            "histogramBounds": list(_VTimeHistogram.BOUNDS),
+            "rowsInserted": self.__rowsInsertedCount,
+            "rowsRemoved": self.__rowsRemovedCount,
+            "heldItems": self.getHeldItemsCount(),
+        }
+
+    @vFromQmlInvokable()
+    def resetPerformanceCounters(self):
+        """Сбрасывает накопленные счетчики производительности (кроме хранимых элементов и выполняющихся действий)."""
+        self.__startedActionsCounts.clear()
+        self.__finishedActionsCounts.clear()
+        self.__errorsCounts.clear()
+        self.__bytesReceived = 0
+        for histogram in self.__timeHistograms.values():
+            histogram.reset()
+        self.__rowsInsertedCount = 0
+        self.__rowsRemovedCount = 0
+        self._notifyPerformanceCounters()
+
+    @staticmethod
+    def _countsByName(counts: Dict[int, int], enum) -> Dict[str, int]:
+        """Возвращает копию словаря количеств `counts` с названиями значений перечисления `enum` в качестве ключей
+        (для значений, которых нет в перечислении, например, пользовательских, - их строковое представление)."""
+        result = dict()
+        for value, count in counts.items():
+            try:
+                name = enum(value).name
+            except ValueError:
+                name = str(value)
+            result[name] = count
+        return result
+
+    def _notifyPerformanceCounters(self):
+        """Откладывает сигнал об изменении счетчиков производительности, объединяя частые изменения."""
+        if not self.__performanceCountersTimer.isActive():
+            self.__performanceCountersTimer.start()
+
+    @contextmanager
+    def _countingTime(self, name: str):
+        """Контекстный менеджер, добавляющий длительность своего блока в гистограмму времени `name`
+        ("parse" - разбор тел ответов, "insert" - вставка строк).
+
+        .. note::
+            Может использоваться в рабочих потоках, сигнал об изменении счетчиков в этом случае откладывается
+            до следующего изменения в потоке модели (то есть в потоке, которому принадлежит модель).
+        """
+        startedAt = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__timeHistograms[name].add(time.perf_counter() - startedAt)
+            if QThread.currentThread() is self.thread():
+                self._notifyPerformanceCounters()
+
+    def _countStartedAction(self, action: VNetworkModelAction or _VModelLoadRecord):
+        """Учитывает запуск (регистрацию) действия `action` в счетчиках производительности."""
+        type = action.getType()
+        self.__startedActionsCounts[type] = self.__startedActionsCounts.get(type, 0) + 1
+        self._notifyPerformanceCounters()
+
+    def _countFinishedAction(self, action: VNetworkModelAction or _VModelLoadRecord):
+        """Учитывает завершение (отмену регистрации) действия `action` в счетчиках производительности."""
+        type = action.getType()
+        self.__finishedActionsCounts[type] = self.__finishedActionsCounts.get(type, 0) + 1
+        if action.isError():
+            errorType = action.errorType()
+            self.__errorsCounts[errorType] = self.__errorsCounts.get(errorType, 0) + 1
+        if type in (Vns.ActionType.LoadingChildren, Vns.ActionType.LoadingDetails) and action.isValid():
+            # Тела ответов внутренних загрузок уже прочитаны моделью, поэтому их размер ничего не стоит.
+            self.__bytesReceived += len(action.replyBodyRawData())
+        self._notifyPerformanceCounters()
+
+    def _countRowsInserted(self, parent: QModelIndex, first: int, last: int):
+        """Учитывает вставленные строки в счетчиках производительности."""
+        self.__rowsInsertedCount += last - first + 1
+        self._notifyPerformanceCounters()
+
+    def _countRowsRemoved(self, parent: QModelIndex, first: int, last: int):
+        """Учитывает удаленные строки в счетчиках производительности."""
+        self.__rowsRemovedCount += last - first + 1
+        self._notifyPerformanceCounters()
+
+    # ==================
+    # ==== ancestry ====
+    # ==================
+
+    def _ancestryPath(self, index: QModelIndex) -> Tuple[Tuple[int, int], ...]:
+        """Возвращает путь от корня до элемента с модельным индексом `index` в виде кортежа пар (строка, столбец).
+
+        Пути кэшируются для всех элементов цепочки предков и сбрасываются при структурных изменениях модели,
+        поэтому проверки родства (:func:`isAncestor()`, :func:`isDescendant()`) сводятся к сравнению префиксов.
+        """
+        if not index.isValid():
+            return ()
+        assert index.model() is self
+        paths = self.__ancestryPaths
+        uncached = []
+        path = ()
+        while index.isValid():
+            key = (index.row(), index.column(), index.internalId())
+            cached = paths.get(key)
+            if cached is not None:
+                path = cached
+                break
+            uncached.append((key, index.row(), index.column()))
+            index = index.parent()
+        for key, row, column in reversed(uncached):
+            path = path + ((row, column),)
+            paths[key] = path
+        return path
+
+    def _resetAncestryPaths(self):
+        """Сбрасывает кэш путей от корня до элементов."""
+        self.__ancestryPaths.clear()
+
+    def _handleRowsInsertedForAncestry(self, parent: QModelIndex, first: int, last: int):
+        """Сбрасывает кэш путей от корня до элементов, если строки были вставлены не в конец элемента `parent`
+        (добавление строк в конец не меняет пути уже существующих элементов)."""
+        assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
+        if last != self.rowCount(parent) - 1:
+            self._resetAncestryPaths()
+
+    # ============================
+    # ==== data notifications ====
+    # ============================
+
+    def _emitDataChanged(self, topLeft: QModelIndex, bottomRight: QModelIndex, roles: List[int] = ()):
+        """Испускает сигнал `dataChanged` или, если открыт пакет изменений (смотри :func:`_dataChangedBatch()`),
+        откладывает его до закрытия пакета."""
+        if not self.__dataChangedBatchDepth:
+            self.dataChanged.emit(topLeft, bottomRight, list(roles))
+            return
+        assert topLeft.parent() == bottomRight.parent()
+        parent = topLeft.parent()
+        key = (parent.row(), parent.column(), parent.internalId(), topLeft.column(), bottomRight.column(), tuple(roles))
+        pending = self.__pendingDataChanges.get(key)
+        if pending is None:
+            pending = self.__pendingDataChanges[key] = [parent, set()]
+        pending[1].update(range(topLeft.row(), bottomRight.row() + 1))
+
+    @contextmanager
+    def _dataChangedBatch(self):
+        """Возвращает контекстный менеджер пакета изменений данных.
+
+        Внутри пакета сигналы `dataChanged`, испускаемые через :func:`_emitDataChanged()`, накапливаются, а при закрытии
+        внешнего пакета смежные строки одного родителя (с одинаковыми столбцами и ролями) объединяются в диапазоны,
+        и для каждого диапазона сигнал испускается один раз.
+
+        .. warning::
+            Внутри пакета нельзя вставлять, удалять и перемещать строки и столбцы, так как накопленные изменения
+            привязаны к текущим номерам строк.
+        """
+        self.__dataChangedBatchDepth += 1
+        try:
+            yield
+        finally:
+            self.__dataChangedBatchDepth -= 1
+            if not self.__dataChangedBatchDepth:
+                self._flushDataChanges()
+
+    def _flushDataChanges(self):
+        """Испускает накопленные сигналы `dataChanged`, объединяя смежные строки в диапазоны."""
+        assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
+        pendingDataChanges, self.__pendingDataChanges = self.__pendingDataChanges, dict()
+        for (_, _, _, left, right, roles), (parent, rows) in pendingDataChanges.items():
+            rows = sorted(rows)
+            top = previous = rows[0]
+            for row in rows[1:] + [None]:
+                if row is not None and row == previous + 1:
+                    previous = row
+                    continue
+                self.dataChanged.emit(self.index(top, left, parent), self.index(previous, right, parent), list(roles))
+                top = previous = row
+
+    # ==== loading notifications ====
+
+    childrenLoadingStatesChanged = pyqtSignal(list, arguments=['parents'])
+    """Пакетный сигнал об изменении состояния загрузки подэлементов нескольких элементов.
+
+    Испускается только в режиме пакетирования уведомлений (смотри :func:`setLoadingNotificationsBatching()`).
+
+    :param list parents: Список модельных индексов элементов.
+    """
+
+    detailsLoadingStatesChanged = pyqtSignal(list, arguments=['indexes'])
+    """Пакетный сигнал об изменении состояния загрузки подробных данных нескольких элементов.
+
+    Испускается только в режиме пакетирования уведомлений (смотри :func:`setLoadingNotificationsBatching()`).
+
+    :param list indexes: Список модельных индексов элементов.
+    """
+
+    @vFromQmlInvokable(result=bool)
+    def loadingNotificationsBatching(self) -> bool:
+        """Возвращает True - если уведомления о состоянии загрузки пакетируются, False - иначе."""
+        return self.__loadingNotificationsBatching
+
+    @vFromQmlInvokable(bool)
+    def setLoadingNotificationsBatching(self, enabled: bool):
+        """Включает (`enabled` = True) или выключает пакетирование уведомлений о состоянии загрузки.
+
+        В режиме пакетирования сигналы `childrenLoadingPolicyChanged`, `childrenLoadingStateChanged`,
+        `_childrenPaginationChanged` и `detailsLoadingStateChanged` не испускаются при каждом изменении, а накапливаются
+        до конца текущего круга цикла событий. Затем для каждого элемента, значение которого в итоге отличается от
+        значения до первого изменения, сигнал испускается один раз, промежуточные значения (которые никто не успел
+        увидеть) отбрасываются. Кроме того, испускаются пакетные сигналы `childrenLoadingStatesChanged` и
+        `detailsLoadingStatesChanged` и объединенные в диапазоны сигналы `dataChanged` с соответствующими ролями
+        `Vns.ItemDataRole`.
+
+        При выключении режима накопленные уведомления отправляются сразу.
+        """
+        if enabled == self.__loadingNotificationsBatching:
+            return
+        self.__loadingNotificationsBatching = enabled
+        if not enabled:
+            self.__loadingNotificationsTimer.stop()
+            self._flushLoadingNotifications()
+
+    def _loadingNotification(self, role: int) -> Tuple[pyqtBoundSignal, Callable[[QModelIndex], object]]:
+        """Возвращает пару (сигнал об изменении, метод получения значения) для роли `role` состояния загрузки."""
+        if role == Vns.ItemDataRole.ChildrenLoadingPolicy:
+            return self.childrenLoadingPolicyChanged, self.childrenLoadingPolicy
+        elif role == Vns.ItemDataRole.ChildrenLoadingState:
+            return self.childrenLoadingStateChanged, self.childrenLoadingState
+        elif role == Vns.ItemDataRole.ChildrenPagination:
+            return self._childrenPaginationChanged, self.childrenPagination
+        else:
+            assert role == Vns.ItemDataRole.DetailsLoadingState
+            return self.detailsLoadingStateChanged, self.detailsLoadingState
+
+    def _notifyLoadingChange(self, role: int, index: QModelIndex, previous: object):
+        """Уведомляет об изменении значения роли `role` состояния загрузки элемента с модельным индексом `index`
+        (`previous` - значение до изменения) или, в режиме пакетирования, откладывает уведомление."""
+        if not self.__loadingNotificationsBatching:
+            self._loadingNotification(role)[0].emit(index)
+            return
+        key = (role, QPersistentModelIndex(index) if index.isValid() else None)
+        if key not in self.__pendingLoadingChanges:
+            self.__pendingLoadingChanges[key] = previous
+            if not self.__loadingNotificationsTimer.isActive():
+                self.__loadingNotificationsTimer.start()
+
+    def _flushLoadingNotifications(self):
+        """Отправляет накопленные уведомления о состоянии загрузки, отбрасывая элементы, значение которых в итоге
+        не изменилось, и удаленные элементы."""
+        assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
+        pendingLoadingChanges, self.__pendingLoadingChanges = self.__pendingLoadingChanges, dict()
+        changes = []
+        for (role, key), previous in pendingLoadingChanges.items():
+            if key is not None and not key.isValid():
+                continue
+            index = QModelIndex(key) if key is not None else QModelIndex()
+            signal, getValue = self._loadingNotification(role)
+            if getValue(index) == previous:
+                continue
+            changes.append((role, index, signal))
+        if not changes:
+            return
+
+        # Сначала сигналы dataChanged, так как обработчики остальных сигналов могут изменять строки модели.
+        with self._dataChangedBatch():
+            for role, index, signal in changes:
+                if index.isValid():
+                    self._emitDataChanged(index, index, [role])
+        for role, index, signal in changes:
+            signal.emit(index)
+        parents = [index for role, index, signal in changes if role == Vns.ItemDataRole.ChildrenLoadingState]
+        if parents:
+            self.childrenLoadingStatesChanged.emit(parents)
+        indexes = [index for role, index, signal in changes if role == Vns.ItemDataRole.DetailsLoadingState]
+        if indexes:
+            self.detailsLoadingStatesChanged.emit(indexes)
+
     # =================
     # ==== actions ====
     # =================
 
     def _actions(self) -> set:
-        """Возвращает множество зарегистрированных действий."""
-        return self.__actions
+        """Возвращает множество зарегистрированных действий.
+
+        Само множество строится по реестру :class:`_VActionRegistry`, поэтому его изменение не влияет на реестр.
+        """
+        return self.__actions.actions()
 
     # ==== registration of actions ====
 
@@ -271,7 +1202,8 @@ class VAbstractNetworkDataModelMixin:
         assert action.getModel() is self
         assert action not in self.__actions
         self.__actions.add(action)
-        # TODO: Мы не можем убрать из списка внезапно удаленные действия.
+        self._countStartedAction(action)
+        # TODO: Мы не можем убрать из реестра внезапно удаленные действия.
         # В С++ мы могли бы использовать какой-нибудь QPointer для отслеживания преждевременного удаления действия,
         # ну а в python-е как это отследить, если плюсовый объект и питоновский объект-обертка удаляются в разное время?
         # Сигнал destroyed тоже ничем не помогает, потому что содержит аргумент типа QObject на уровне С++,
@@ -284,6 +1216,7 @@ class VAbstractNetworkDataModelMixin:
         assert action.getModel() is self
         assert action in self.__actions
         self.__actions.remove(action)
+        self._countFinishedAction(action)
         # TODO: Смотри описание проблемы в методе _registerAction()...
         # action.destroyed[QObject].disconnect(self._unregisterAction)
 
@@ -291,8 +1224,8 @@ class VAbstractNetworkDataModelMixin:
 
     def _invalidateAllActions(self):
         """Помечает недействительными все незавершенные действия в модели."""
-        for action in self.__actions:
-            assert isinstance(action, VNetworkModelAction)
+        for action in self.__actions:  # Реестр перебирает копию своих действий.
+            assert isinstance(action, (VNetworkModelAction, _VModelLoadRecord))
             if action.isValid() and action.isRunning():
                 action.setInvalidated()
 
@@ -304,12 +1237,11 @@ class VAbstractNetworkDataModelMixin:
         assert top <= bottom
         assert left <= right
         assert parent.model() is self if parent.isValid() else True
-        for action in self.__actions:
-            assert isinstance(action, VNetworkModelAction)
+        # Реестр возвращает только действия над удаляемыми элементами и их потомками (смотри _VActionRegistry).
+        for action in self.__actions.actionsForItems(parent, top, bottom, left, right):
+            assert isinstance(action, (VNetworkModelAction, _VModelLoadRecord))
             if action.isValid() and action.isRunning():
-                index = action.getIndex()
-                if isDescendant(index, parent, top, bottom, left, right, inclusive=True):
-                    action.setInvalidated()
+                action.setInvalidated()
 
     def _invalidateActionsForColumns(self, parent: QModelIndex, first: int, last: int) -> None:
         """Помечает недействительными все незавершенные действия, совершаемые над элементами, которые находятся
@@ -332,10 +1264,64 @@ class VAbstractNetworkDataModelMixin:
     def deleteActionLater(self, action: VAbstractAsynchronousAction):
         """Вызывает отложенное удаление действия `action` только в том случае, если данная модель является родителем
         этого действия.
+
+        Облегченные записи внутренних действий загрузки (смотри :func:`_acquireLoadRecord()`) возвращаются в пул модели.
         """
+        if isinstance(action, _VModelLoadRecord):
+            if action.getModel() is self:
+                self.__loadRecordPool.release(action)
+            return
         if action.parent() is self:
             action.deleteLater()
 
+    # ==== lightweight records of internal loading actions ====
+
+    def _acquireLoadRecord(self, index: QModelIndex, reply: QNetworkReply, type: int,
+            onReplyFinished: Callable[[_VModelLoadRecord], None]) -> _VModelLoadRecord or None:
+        """Возвращает облегченную запись внутреннего действия загрузки типа `type` над элементом с модельным индексом
+        `index` с ответом на сетевой запрос `reply` или None, если сеть недоступна.
+
+        Запись берется из пула модели, передается трассировщику и регистрируется в модели. После завершения ответа
+        на сетевой запрос будет вызван `onReplyFinished` с записью в качестве аргумента.
+
+        Запись используется вместо :class:`VNetworkModelAction` там, где действие никому, кроме модели, не нужно:
+        не создаются QObject-ы, соединения сигналов и отложенные удаления.
+
+        .. note::
+            Если сеть недоступна, то возвращает None, и вызывающая сторона должна создать полноценное действие,
+            чтобы корректно обработать эту ситуацию с помощью метода :func:`_handleNotAccessibleNetwork()`.
+        """
+        manager = reply.manager()
+        if manager.networkAccessible() != manager.Accessible:
+            return None
+        record = self.__loadRecordPool.acquire(self, index, reply, type, onReplyFinished)
+        self._traceAction(record)
+        self._registerAction(record)
+        return record
+
+    # ==== validators ====
+
+    def _replyValidators(self, action: VNetworkModelAction or _VModelLoadRecord) -> Dict[bytes, bytes]:
+        """Возвращает валидаторы (смотри :attr:`VALIDATOR_HEADERS`) из сетевого ответа действия `action`."""
+        return {header: bytes(action.replyRawHeader(header))
+                for header in self.VALIDATOR_HEADERS if action.replyHasRawHeader(header)}
+
+    def childrenValidators(self, parent: QModelIndex = QModelIndex()) -> Dict[bytes, bytes]:
+        """Возвращает валидаторы (например, заголовок `ETag`) последней успешной загрузки подэлементов элемента
+        с модельным индексом `parent`.
+
+        Наследники класса могут передавать их в условных заголовках запроса (например, `If-None-Match`)
+        в методе :func:`_requestToLoadingChildren()`.
+        """
+        info = self._getChildrenLoadingInfo(parent)
+        return dict(info.validators) if info else dict()
+
+    def detailsValidators(self, index: QModelIndex) -> Dict[bytes, bytes]:
+        """Возвращает валидаторы (например, заголовок `ETag`) последней успешной загрузки подробных данных элемента
+        с модельным индексом `index`."""
+        info = self._getDetailsLoadingInfo(index)
+        return dict(info.validators) if info else dict()
+
     # ==== custom actions handling ====
 
     def _handleNotAccessibleNetwork(self, action: VNetworkModelAction) -> bool:
@@ -514,8 +1500,8 @@ class VAbstractNetworkDataModelMixin:
                 return False
         assert info is self._getChildrenLoadingInfo(parent)
         if policy != info.policy:
-            info.policy = policy
-            self.childrenLoadingPolicyChanged.emit(parent)
+            previous, info.policy = info.policy, policy
+            self._notifyLoadingChange(Vns.ItemDataRole.ChildrenLoadingPolicy, parent, previous)
         return True
 
     # def _resetChildrenLoadingPolicy(self, parent: QModelIndex = QModelIndex(), info: VChildrenLoadingInfo = None) -> bool:
@@ -579,8 +1565,8 @@ class VAbstractNetworkDataModelMixin:
                 return False
         assert info is self._getChildrenLoadingInfo(parent)
         if state != info.state:
-            info.state = state
-            self.childrenLoadingStateChanged.emit(parent)
+            previous, info.state = info.state, state
+            self._notifyLoadingChange(Vns.ItemDataRole.ChildrenLoadingState, parent, previous)
         return True
 
     # def _resetChildrenLoadingState(self, parent: QModelIndex = QModelIndex(), info: VChildrenLoadingInfo = None) -> bool:
@@ -672,8 +1658,8 @@ class VAbstractNetworkDataModelMixin:
         assert not pagination.hasLoadedData()  # Необходимо было вызвать pagination._resetAll() или создать новую пагинацию!
         assert not info.pagination.hasLoadedData()  # Необходимо было вызвать self._resetChildren(parent)!
         if pagination != info.pagination:
-            info.pagination = pagination
-            self._childrenPaginationChanged.emit(parent)
+            previous, info.pagination = info.pagination, pagination
+            self._notifyLoadingChange(Vns.ItemDataRole.ChildrenPagination, parent, previous)
         return True
 
     # ==== loading of children methods ====
@@ -739,6 +1725,10 @@ class VAbstractNetworkDataModelMixin:
 
         Возвращает экземпляр действия :class:`VAbstractAsynchronousAction`.
 
+        Если подэлементы уже перезагружаются, то возвращает действие выполняющейся перезагрузки. Если же подэлементы
+        загружаются иначе (например, загружается следующая порция), то возвращает действие одной отложенной
+        перезагрузки, которая будет запущена после завершения текущей загрузки (одно на все такие запросы).
+
         .. warning::
             Перед вызовом данного метода необходимо убедиться, что его вызов разрешен.
 
@@ -749,12 +1739,18 @@ class VAbstractNetworkDataModelMixin:
             Если родителем действия будет являться данная модель, то действие будет удалено сразу после завершения,
             иначе ответственность по его удалению будет лежать на Вас.
         """
+        running = self._runningChildrenLoading(parent)
+        if running is not None:
+            if self._getChildrenLoadingInfo(parent).inReloading:
+                return running
+            return self._pendingChildrenReload(parent, running)
         assert self._canReloadChildren(parent, Vns.LoadingPolicy.Automatically) \
                or self._canReloadChildren(parent, Vns.LoadingPolicy.Manually)
         info = self._getChildrenLoadingInfo(parent)
         assert info
         assert not info.inReloading
         info.inReloading = True
+        info.pageStates.clear()
         info.pagination._requestToReloadingData()
         return self._loadChildren(parent)
 
@@ -788,6 +1784,9 @@ class VAbstractNetworkDataModelMixin:
 
         Возвращает экземпляр действия :class:`VAbstractAsynchronousAction`.
 
+        Если подэлементы уже загружаются, то новая загрузка не запускается, а возвращается действие выполняющейся
+        загрузки.
+
         .. warning::
             Перед вызовом данного метода необходимо убедиться, что его вызов разрешен.
 
@@ -798,12 +1797,23 @@ class VAbstractNetworkDataModelMixin:
             Если родителем действия будет являться данная модель, то действие будет удалено сразу после завершения,
             иначе ответственность по его удалению будет лежать на Вас.
         """
+        running = self._runningChildrenLoading(parent)
+        if running is not None:
+            return running
         assert self._canLoadNextChildren(parent, Vns.LoadingPolicy.Automatically) \
                or self._canLoadNextChildren(parent, Vns.LoadingPolicy.Manually)
+        return self._loadNextChildren(parent)
+
+    def _loadNextChildren(self, parent: QModelIndex,
+            keepAction: bool = True) -> VNetworkModelAction or _VModelLoadRecord:
+        """Запускает асинхронную загрузку следующей порции подэлементов из элемента с модельным индексом `parent`.
+
+        Смотри :func:`loadNextChildren()` и :func:`_loadChildren()`.
+        """
         info = self._getChildrenLoadingInfo(parent)
         assert info
         info.pagination._requestToLoadingNextDataPart()
-        return self._loadChildren(parent)
+        return self._loadChildren(parent, keepAction)
 
     @vFromQmlInvokable(result=bool)
     @vFromQmlInvokable(QModelIndex, result=bool)
@@ -835,6 +1845,9 @@ class VAbstractNetworkDataModelMixin:
         Данный метод поддерживается только, если пагинация поддерживает последовательную загрузку порций подэлементов
         с заменой ранее загруженных порций на новые.
 
+        Если подэлементы уже загружаются, то новая загрузка не запускается, а возвращается действие выполняющейся
+        загрузки.
+
         .. warning::
             Перед вызовом данного метода необходимо убедиться, что его вызов разрешен.
 
@@ -845,6 +1858,9 @@ class VAbstractNetworkDataModelMixin:
             Если родителем действия будет являться данная модель, то действие будет удалено сразу после завершения,
             иначе ответственность по его удалению будет лежать на Вас.
         """
+        running = self._runningChildrenLoading(parent)
+        if running is not None:
+            return running
         assert self._canLoadPreviousChildren(parent, Vns.LoadingPolicy.Automatically) \
                or self._canLoadPreviousChildren(parent, Vns.LoadingPolicy.Manually)
         info = self._getChildrenLoadingInfo(parent)
@@ -852,66 +1868,728 @@ class VAbstractNetworkDataModelMixin:
         info.pagination._requestToLoadingPreviousDataPart()
         return self._loadChildren(parent)
 
-    def _loadChildren(self, parent: QModelIndex) -> VNetworkModelAction:
-        """Запускает асинхронную загрузку подэлементов из элемента с модельным индексом `parent`.
+    # ==== merging of duplicate loads ====
 
-        Возвращает экземпляр действия :class:`VNetworkModelAction`.
+    def _runningLoading(self, index: QModelIndex, type: int) -> VAbstractAsynchronousAction or None:
+        """Возвращает действие выполняющейся загрузки типа `type` над элементом с модельным индексом `index`
+        или None, если такой загрузки нет.
 
-        .. warning::
-            Перед вызовом данного метода необходимо сначала убедиться, что его вызов разрешен, затем подготовить
-            все необходимые параметры, такие как пагинация и прочие, и только затем уже вызвать данный метод.
+        Вместо облегченной записи :class:`_VModelLoadRecord` возвращает созданное по ней действие.
+        """
+        record = None
+        for action in self.__actions.actionsForItem(index):
+            if action.getType() != type or not action.isValid() or not action.isRunning():
+                continue
+            if isinstance(action, _VModelLoadRecord):
+                record = action
+            else:
+                # Общее действие (например, параллельной загрузки страниц) предпочтительнее записей его частей.
+                return action
+        if record is None:
+            return None
+        action = record.materialize(parent=self)
+        self.__loadRecordFollowers[action] = record
 
-        ..warning::
-            Если родителем действия будет являться данная модель, то действие будет удалено сразу после завершения,
-            иначе ответственность по его удалению будет лежать на Вас.
+        def forget():
+            del self.__loadRecordFollowers[action]
+            self.deleteActionLater(action)
 
-        ..note::
-            Если действие станет недействительным (то есть если до завершения действия будет удален элемент с индексом
-            `parent`), то сетевой запрос действия будет отменен.
-        """
-        assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
-        assert parent.model() is self if parent.isValid() else True
+        action._whenResolved(forget, forget)
+        return action
 
+    def _runningChildrenLoading(self, parent: QModelIndex) -> VAbstractAsynchronousAction or None:
+        """Возвращает действие выполняющейся загрузки подэлементов элемента с модельным индексом `parent`
+        или None, если подэлементы не загружаются."""
+        assert parent.model() is self if parent.isValid() else True
         info = self._getChildrenLoadingInfo(parent)
+        if info is None or info.state != Vns.LoadingState.Loading:
+            return None
+        return self._runningLoading(parent, Vns.ActionType.LoadingChildren)
+
+    def _pendingChildrenReload(self, parent: QModelIndex,
+            running: VAbstractAsynchronousAction) -> VAbstractAsynchronousAction:
+        """Возвращает действие отложенной перезагрузки подэлементов элемента с модельным индексом `parent`, которая
+        будет запущена после завершения выполняющейся загрузки `running` (создает его, если его еще нет)."""
+        key = QPersistentModelIndex(parent) if parent.isValid() else None
+        pending = self.__pendingChildrenReloads.get(key)
+        if pending is not None:
+            return pending
+        pending = VAsynchronousAction(type=Vns.ActionType.LoadingChildren, parent=self)
+        self.__pendingChildrenReloads[key] = pending
+        pending.finished.connect(lambda: self.deleteActionLater(pending))
+        pending.invalidated.connect(lambda: self.deleteActionLater(pending))
+
+        def handleFinished():
+            if self.__pendingChildrenReloads.get(key) is not pending:
+                # Отложенная перезагрузка была отменена (смотри _cancelChildrenLoading()).
+                return
+            del self.__pendingChildrenReloads[key]
+            if key is not None and not key.isValid():
+                pending.setInvalidated()
+                return
+            index = QModelIndex(key) if key is not None else QModelIndex()
+            if self._runningChildrenLoading(index) is None \
+                    and not self._canReloadChildren(index, Vns.LoadingPolicy.Automatically) \
+                    and not self._canReloadChildren(index, Vns.LoadingPolicy.Manually):
+                pending.setError(Vns.ErrorType.CanceledError, QCoreApplication.translate(
+                        "VAbstractNetworkDataModelMixin", "Отложенная перезагрузка подэлементов невозможна."))
+                pending.setFinished()
+                return
+            self.reloadChildren(index)._forwardTo(pending)
+
+        def handleInvalidated():
+            if self.__pendingChildrenReloads.get(key) is pending:
+                del self.__pendingChildrenReloads[key]
+            pending.setInvalidated()
+
+        running._whenResolved(handleFinished, handleInvalidated)
+        return pending
+
+    # ==== queue of children loads ====
+
+    childrenLoadingQueueChanged = pyqtSignal(int, int, arguments=['queuedCount', 'runningCount'])
+    """Сигнал об изменении очереди загрузок подэлементов (смотри :func:`setMaxConcurrentChildrenLoads()`).
+
+    :param int queuedCount: Количество загрузок в очереди.
+    :param int runningCount: Количество запущенных загрузок.
+    """
 
-        assert info is not None
-        assert info.policy != Vns.LoadingPolicy.DoNotLoad
-        assert info.state in (Vns.LoadingState.Error, Vns.LoadingState.Idle)
-        assert info.pagination.getType() != Vns.PaginationType.Nothing
+    @vFromQmlInvokable(result=int)
+    def maxConcurrentChildrenLoads(self) -> int:
+        """Возвращает максимальное количество одновременных загрузок подэлементов (-1 - без ограничения)."""
+        return self.__maxConcurrentChildrenLoads
 
-        self._setChildrenLoadingState(Vns.LoadingState.Loading, parent, info)
-        self.childrenLoadingStarted.emit(parent)
+    @vFromQmlInvokable(int)
+    def setMaxConcurrentChildrenLoads(self, maxLoads: int):
+        """Устанавливает максимальное количество одновременных загрузок подэлементов `maxLoads`
+        (-1 - без ограничения, то есть загрузки запускаются сразу).
 
-        reply = self._requestToLoadingChildren(parent)
-        assert reply  # Проверяем, не забыли ли переопределить метод `self._requestToLoadingChildren(parent)`.
-        assert reply.isRunning()
-        action = VNetworkModelAction(
-                model=self,
-                index=parent,
-                reply=reply,
-                type=Vns.ActionType.LoadingChildren,
-                parent=self)
+        Загрузки сверх предела ставятся в очередь и запускаются по мере завершения запущенных загрузок
+        в порядке приоритета (смотри :func:`_childrenLoadingPriority()`).
 
-        if self._handleNotAccessibleNetwork(action):
-            self._setChildrenLoadingState(Vns.LoadingState.Error, parent, info)
-            self.childrenLoadingFinished.emit(parent)
-            if info.inReloading:
-                info.inReloading = False
-            return action
+        .. note::
+            Параллельная загрузка оставшихся страниц (смотри :func:`loadRemainingChildren()`) ограничивается
+            пагинацией и в этом пределе не учитывается.
+        """
+        assert maxLoads == -1 or maxLoads > 0
+        self.__maxConcurrentChildrenLoads = maxLoads
+        self._scheduleChildrenLoadingQueueUpdate()
 
-        # action.finished.connect(lambda: self.deleteActionLater(action))
-        action.invalidated.connect(action.replyAbort)
-        action.replyFinished.connect(self._finishLoadingChildren)
-        self._registerAction(action)
-        return action
+    def focusedIndexes(self) -> List[QModelIndex]:
+        """Возвращает список модельных индексов выделенных и текущего элементов представления."""
+        return [QModelIndex(index) for index in self.__focusedIndexes if index.isValid()]
 
-    def _requestToLoadingChildren(self, parent: QModelIndex) -> QNetworkReply or None:
-        """Запрашивает данные подэлементов из элемента с модельным индексом `parent`.
+    def setFocusedIndexes(self, indexes: List[QModelIndex]):
+        """Сообщает модели модельные индексы `indexes` выделенных и текущего элементов представления.
 
-        Возвращает ответ в виде экземпляра :class:`QNetworkReply` или None, если данные запросить нельзя.
+        Загрузки подэлементов этих элементов и их предков запускаются из очереди первыми.
+        """
+        assert all(index.model() is self for index in indexes)
+        self.__focusedIndexes = [QPersistentModelIndex(index) for index in indexes]
+        self._scheduleChildrenLoadingQueueUpdate()
 
-        .. note::
-            Если загрузка подэлементов не поддерживается из элемента с модельным индексом `parent`, возвращает None.
+    @vFromQmlInvokable(result=int)
+    def queuedChildrenLoadsCount(self) -> int:
+        """Возвращает количество загрузок подэлементов в очереди."""
+        return len(self.__queuedChildrenLoads)
+
+    @vFromQmlInvokable(result=int)
+    def runningChildrenLoadsCount(self) -> int:
+        """Возвращает количество запущенных загрузок подэлементов."""
+        return len(self.__runningChildrenLoads)
+
+    @vFromQmlInvokable(result=int)
+    def droppedChildrenLoadsCount(self) -> int:
+        """Возвращает количество загрузок подэлементов, удаленных из очереди до начала."""
+        return self.__droppedChildrenLoadsCount
+
+    @vFromQmlInvokable(result=float)
+    def childrenLoadingQueueWaitTime(self) -> float:
+        """Возвращает сглаженное время ожидания загрузок подэлементов в очереди (в секундах)."""
+        return self.__childrenLoadingQueueWaitTime
+
+    @vFromQmlInvokable(result=int)
+    @vFromQmlInvokable(QModelIndex, result=int)
+    def cancelQueuedChildrenLoads(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Отменяет еще не запущенные загрузки подэлементов элемента с модельным индексом `parent` и всех его потомков
+        (например, при сворачивании элемента в представлении) и возвращает количество отмененных загрузок.
+
+        Отмененные загрузки завершаются с ошибкой `Vns.ErrorType.CanceledError`, а загрузка подэлементов их элементов
+        возвращается в состояние покоя.
+        """
+        assert parent.model() is self if parent.isValid() else True
+        canceled = 0
+        for action in list(self.__queuedChildrenLoads):
+            if action in self.__queuedChildrenLoads and action.isValid() \
+                    and self._isAncestorOrSelf(parent, action.getIndex()):
+                self._dropQueuedChildrenLoading(action)
+                canceled += 1
+        return canceled
+
+    def _isAncestorOrSelf(self, ancestor: QModelIndex, index: QModelIndex) -> bool:
+        """Возвращает True - если элемент с модельным индексом `ancestor` является элементом с модельным индексом
+        `index` или его предком, False - иначе."""
+        if not ancestor.isValid():
+            return True
+        ancestor = ancestor.sibling(ancestor.row(), 0)
+        while index.isValid():
+            if index.sibling(index.row(), 0) == ancestor:
+                return True
+            index = index.parent()
+        return False
+
+    def _childrenLoadingPriority(self, parent: QModelIndex) -> int:
+        """Возвращает приоритет загрузки подэлементов элемента с модельным индексом `parent` в очереди
+        (чем меньше, тем раньше загрузка будет запущена):
+
+            - 0 - элемент является выделенным или текущим элементом или их предком (смотри :func:`setFocusedIndexes()`);
+            - 1 - элемент (или его подэлементы) виден в представлении (смотри :func:`setVisibleRows()`);
+            - 2 - остальные элементы.
+        """
+        for index in self.__focusedIndexes:
+            if index.isValid() and self._isAncestorOrSelf(parent, QModelIndex(index)):
+                return 0
+        if not parent.isValid() or QPersistentModelIndex(parent) in self.__visibleRows:
+            return 1
+        grandparent = parent.parent()
+        rows = self.__visibleRows.get(QPersistentModelIndex(grandparent) if grandparent.isValid() else None)
+        if rows is not None and rows[0] <= parent.row() <= rows[1]:
+            return 1
+        return 2
+
+    def _mustQueueChildrenLoading(self) -> bool:
+        """Возвращает True - если очередная загрузка подэлементов должна быть поставлена в очередь, False - если ее
+        можно запустить сразу."""
+        if self.__maxConcurrentChildrenLoads == -1:
+            return False
+        # Пока очередь не пуста, новые загрузки тоже ставятся в нее, чтобы запускаться по приоритету.
+        return bool(self.__queuedChildrenLoads) or len(self.__runningChildrenLoads) >= self.__maxConcurrentChildrenLoads
+
+    def _enqueueChildrenLoading(self, parent: QModelIndex, droppable: bool) -> VNetworkModelAction:
+        """Ставит в очередь загрузку подэлементов из элемента с модельным индексом `parent` (состояние загрузки уже
+        установлено) и возвращает ее действие, сетевой запрос которого будет отправлен при запуске загрузки.
+
+        Если `droppable` равен True, то загрузка удаляется из очереди, когда элемент перестает быть видимым.
+        """
+        action = VNetworkModelAction(
+                model=self,
+                index=parent,
+                type=Vns.ActionType.LoadingChildren,
+                parent=self)
+        action.invalidated.connect(self._handleQueuedChildrenLoadingInvalidated)
+        self._registerAction(action)
+        self.__queuedChildrenLoads[action] = (self.__queuedChildrenLoadsCount, time.perf_counter(), droppable)
+        self.__queuedChildrenLoadsCount += 1
+        self.childrenLoadingQueueChanged.emit(len(self.__queuedChildrenLoads), len(self.__runningChildrenLoads))
+        self._scheduleChildrenLoadingQueueUpdate()
+        return action
+
+    def _scheduleChildrenLoadingQueueUpdate(self):
+        """Откладывает обновление очереди загрузок подэлементов до конца текущего круга цикла событий."""
+        if self.__queuedChildrenLoads:
+            self.__childrenLoadingQueueTimer.start()
+
+    def _updateChildrenLoadingQueue(self):
+        """Удаляет из очереди ненужные загрузки подэлементов невидимых элементов и запускает загрузки в порядке
+        приоритета, пока не достигнут предел одновременных загрузок."""
+        # Без сведений о видимых строках нельзя судить о том, что элемент не виден.
+        canDrop = bool(self.__visibleRows)
+        ranked = []
+        for action, (number, queuedAt, droppable) in list(self.__queuedChildrenLoads.items()):
+            if action not in self.__queuedChildrenLoads or not action.isValid():
+                continue
+            priority = self._childrenLoadingPriority(action.getIndex())
+            if droppable and canDrop and priority == 2:
+                self._dropQueuedChildrenLoading(action)
+                continue
+            ranked.append((priority, number, action))
+        ranked.sort(key=lambda entry: entry[:2])
+        for priority, number, action in ranked:
+            if self.__maxConcurrentChildrenLoads != -1 \
+                    and len(self.__runningChildrenLoads) >= self.__maxConcurrentChildrenLoads:
+                break
+            if action in self.__queuedChildrenLoads and action.isValid():
+                self._startQueuedChildrenLoading(action)
+
+    def _startQueuedChildrenLoading(self, action: VNetworkModelAction):
+        """Запускает загрузку подэлементов из очереди: отправляет сетевой запрос действия `action`."""
+        number, queuedAt, droppable = self.__queuedChildrenLoads.pop(action)
+        action.invalidated.disconnect(self._handleQueuedChildrenLoadingInvalidated)
+        parent = action.getIndex()
+        info = self._getChildrenLoadingInfo(parent)
+        assert info is not None
+        assert info.state == Vns.LoadingState.Loading
+
+        now = time.perf_counter()
+        wait = now - queuedAt
+        if self.__childrenLoadingQueueWaitTime:
+            alpha = self.QUEUE_WAIT_SMOOTHING_FACTOR
+            self.__childrenLoadingQueueWaitTime += alpha * (wait - self.__childrenLoadingQueueWaitTime)
+        else:
+            self.__childrenLoadingQueueWaitTime = wait
+        info.loadingStartedAt = now  # Задержка загрузки не должна учитывать ожидание в очереди.
+
+        reply = self._requestToLoadingChildren(parent)
+        assert reply  # Проверяем, не забыли ли переопределить метод `self._requestToLoadingChildren(parent)`.
+        assert reply.isRunning()
+        action.setReply(reply)
+        self._traceAction(action)
+
+        if self._handleNotAccessibleNetwork(action):
+            self._unregisterAction(action)
+            self._setChildrenLoadingState(Vns.LoadingState.Error, parent, info)
+            self.childrenLoadingFinished.emit(parent)
+            if info.inReloading:
+                info.inReloading = False
+        else:
+            action.invalidated.connect(action.replyAbort)
+            action.replyFinished.connect(self._finishLoadingChildren)
+            self.__runningChildrenLoads.add(action)
+        self.childrenLoadingQueueChanged.emit(len(self.__queuedChildrenLoads), len(self.__runningChildrenLoads))
+
+    def _dropQueuedChildrenLoading(self, action: VNetworkModelAction):
+        """Удаляет загрузку подэлементов с действием `action` из очереди до ее начала: завершает действие с ошибкой
+        `Vns.ErrorType.CanceledError` и возвращает загрузку подэлементов элемента в состояние покоя."""
+        del self.__queuedChildrenLoads[action]
+        action.invalidated.disconnect(self._handleQueuedChildrenLoadingInvalidated)
+        self.__droppedChildrenLoadsCount += 1
+        parent = action.getIndex()
+        info = self._getChildrenLoadingInfo(parent)
+        assert info is not None
+        self._setChildrenLoadingState(Vns.LoadingState.Idle, parent, info)
+        if info.inReloading:
+            info.inReloading = False
+        self.childrenLoadingFinished.emit(parent)
+        # Ошибка устанавливается до снятия с регистрации, чтобы действие было учтено как отмененное.
+        action.setError(Vns.ErrorType.CanceledError, QCoreApplication.translate("VAbstractNetworkDataModelMixin",
+                "Загрузка подэлементов отменена до ее начала."))
+        self._unregisterAction(action)
+        action.setFinished()
+        self.deleteActionLater(action)
+        self.childrenLoadingQueueChanged.emit(len(self.__queuedChildrenLoads), len(self.__runningChildrenLoads))
+
+    def _cancelChildrenLoading(self, action: VAbstractAsynchronousAction) -> bool:
+        """Отменяет загрузку подэлементов с действием `action`, ранее возвращенным методами загрузки подэлементов,
+        и возвращает загрузку подэлементов ее элемента в состояние покоя.
+
+        Загрузка из очереди удаляется из нее (смотри :func:`cancelQueuedChildrenLoads()`), а выполняющаяся загрузка
+        (в том числе параллельная загрузка страниц) становится недействительной, и ее сетевые запросы прерываются.
+        Если `action` - действие, созданное по облегченной записи загрузки (смотри :func:`_runningLoading()`),
+        то недействительной становится сама запись. Ошибка модели при этом не возникает, а уже вставленные подэлементы
+        остаются в модели.
+
+        Отложенная перезагрузка (смотри :func:`reloadChildren()`) лишь становится недействительной, а загрузка,
+        после которой она должна была быть запущена, продолжается.
+
+        Возвращает True - если загрузка была отменена, иначе (загрузка уже завершена) - возвращает False.
+        """
+        if not action.isValid() or not action.isRunning():
+            return False
+        if action in self.__queuedChildrenLoads:
+            self._dropQueuedChildrenLoading(action)
+            return True
+        for key, pending in self.__pendingChildrenReloads.items():
+            if pending is action:
+                del self.__pendingChildrenReloads[key]
+                pending.setInvalidated()
+                return True
+        # Сетевой запрос принадлежит записи, а не ее последователю, поэтому отменяется сама запись.
+        action = self.__loadRecordFollowers.get(action, action)
+        parent = action.getIndex()
+        info = self._getChildrenLoadingInfo(parent)
+        assert info is not None
+        loading = self.__childrenPagesLoadings.get(action)
+        if loading is not None:
+            for page in list(loading.running) + list(loading.buffered):
+                info.pageStates.pop(page, None)
+            self._cancelChildrenPagesLoading(loading)
+        else:
+            # Прерывает сетевой запрос, а _finishLoadingChildren() лишь отменит регистрацию недействительного действия.
+            action.setInvalidated()
+        self._setChildrenLoadingState(Vns.LoadingState.Idle, parent, info)
+        if info.inReloading:
+            info.inReloading = False
+        self.childrenLoadingFinished.emit(parent)
+        return True
+
+    def _handleQueuedChildrenLoadingInvalidated(self):
+        """Удаляет из очереди загрузку подэлементов, действие которой стало недействительным (элемент был удален
+        или модель сброшена)."""
+        action = self.sender()
+        assert isinstance(action, VNetworkModelAction)
+        if self.__queuedChildrenLoads.pop(action, None) is None:
+            return
+        self._unregisterAction(action)
+        self.deleteActionLater(action)
+        self.childrenLoadingQueueChanged.emit(len(self.__queuedChildrenLoads), len(self.__runningChildrenLoads))
+
+    def _releaseChildrenLoadingSlot(self, action: VNetworkModelAction or _VModelLoadRecord):
+        """Учитывает завершение запущенной загрузки подэлементов с действием `action` и планирует запуск
+        следующей загрузки из очереди."""
+        self.__runningChildrenLoads.discard(action)
+        if self.__queuedChildrenLoads:
+            self.childrenLoadingQueueChanged.emit(len(self.__queuedChildrenLoads), len(self.__runningChildrenLoads))
+            self._scheduleChildrenLoadingQueueUpdate()
+
+    # ==== parallel loading of remaining pages ====
+
+    @vFromQmlInvokable(result=bool)
+    @vFromQmlInvokable(QModelIndex, result=bool)
+    def canLoadRemainingChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Возвращает True - если используется политика "ручной" загрузки подэлементов и если
+        в данный момент можно параллельно загрузить все оставшиеся порции подэлементов элемента с модельным индексом
+        `parent`, иначе - возвращает False.
+
+        .. note::
+            Параллельная загрузка возможна, только если пагинация ее поддерживает и уже знает количество порций
+            (т.е. хотя бы одна порция уже загружена). Смотри :func:`VAbstractPagination.canLoadRemainingData()`.
+        """
+        if not self._canLoadNextChildren(parent, Vns.LoadingPolicy.Manually):
+            return False
+        return self._getChildrenLoadingInfo(parent).pagination.canLoadRemainingData()
+
+    @vFromQmlInvokable(result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(QModelIndex, result=VAbstractAsynchronousAction)
+    def loadRemainingChildren(self, parent: QModelIndex = QModelIndex()) -> VAbstractAsynchronousAction:
+        """Запускает асинхронную параллельную загрузку всех оставшихся порций (страниц) подэлементов из элемента
+        с модельным индексом `parent`.
+
+        Одновременно загружается не более :attr:`VPagesAccumulationPagination.maxConcurrentPages` страниц,
+        следующие страницы запрашиваются по мере завершения загрузки предыдущих. Страницы вставляются строго в порядке
+        их следования: страница, загруженная раньше предшествующих ей страниц, ждет своей очереди в буфере.
+        Состояние загрузки каждой страницы возвращает метод :func:`childrenPageLoadingState()`.
+
+        Если загрузка или вставка какой-либо страницы завершилась ошибкой, то последующие страницы не вставляются
+        (а их загрузка прерывается), уже вставленные предшествующие страницы остаются в модели, и продолжить загрузку
+        можно обычными методами, например, :func:`loadNextChildren()`.
+
+        Возвращает экземпляр общего действия :class:`VAbstractAsynchronousAction`, которое завершается после вставки
+        всех страниц (или после ошибки). Если подэлементы уже загружаются, то возвращает действие выполняющейся
+        загрузки.
+
+        .. warning::
+            Перед вызовом данного метода необходимо убедиться, что его вызов разрешен.
+
+            Это можно сделать, например, с помощью метода :func:`canLoadRemainingChildren()`.
+
+        ..warning::
+            Если родителем действия будет являться данная модель, то действие будет удалено сразу после завершения,
+            иначе ответственность по его удалению будет лежать на Вас.
+        """
+        running = self._runningChildrenLoading(parent)
+        if running is not None:
+            return running
+        assert self.canLoadRemainingChildren(parent)
+        info = self._getChildrenLoadingInfo(parent)
+        assert info
+
+        self._setChildrenLoadingState(Vns.LoadingState.Loading, parent, info)
+        info.loadingStartedAt = time.perf_counter()
+        self.childrenLoadingStarted.emit(parent)
+
+        action = VNetworkModelAction(
+                model=self,
+                index=parent,
+                type=Vns.ActionType.LoadingChildren,
+                parent=self)
+        self._traceAction(action)
+        self._registerAction(action)
+
+        loading = _VChildrenPagesLoading(action, info.pagination._remainingPages())
+        self.__childrenPagesLoadings[action] = loading
+        info.pageStates.clear()
+        self._requestChildrenPages(parent, info, loading)
+        if not loading.running:
+            # Ни одна страница не была запрошена (сеть недоступна), но завершить действие сразу нельзя,
+            # так как вызывающая сторона еще не успела подключиться к его сигналам.
+            QTimer.singleShot(0, lambda: self._finishChildrenPagesLoading(loading))
+        return action
+
+    @vFromQmlInvokable(int, result=int)
+    @vFromQmlInvokable(int, QModelIndex, result=int)
+    def childrenPageLoadingState(self, page: int, parent: QModelIndex = QModelIndex()) -> Vns.LoadingState:
+        """Возвращает состояние загрузки страницы с номером `page` подэлементов элемента с модельным индексом `parent`
+        при последней параллельной загрузке страниц (смотри :func:`loadRemainingChildren()`).
+
+        .. note::
+            Если страница не загружалась параллельно, возвращает `Vns.LoadingState.Unknown`.
+        """
+        assert parent.model() is self if parent.isValid() else True
+        info = self._getChildrenLoadingInfo(parent)
+        if info is None:
+            return Vns.LoadingState.Unknown
+        return info.pageStates.get(page, Vns.LoadingState.Unknown)
+
+    # ==== loading of subtree ====
+
+    @vFromQmlInvokable(result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(QModelIndex, result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(QModelIndex, int, result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(QModelIndex, int, int, result=VAbstractAsynchronousAction)
+    def loadSubtree(self, parent: QModelIndex = QModelIndex(), maxDepth: int = -1,
+            maxConcurrency: int = DEFAULT_SUBTREE_LOADING_CONCURRENCY) -> VSubtreeLoadingAction:
+        """Запускает асинхронную загрузку поддерева элемента с модельным индексом `parent` на `maxDepth` уровней вглубь
+        (-1 - без ограничения глубины).
+
+        Поддерево обходится в ширину, подэлементы не более чем `maxConcurrency` элементов загружаются одновременно.
+        У каждого элемента загружаются все порции подэлементов (смотри :func:`loadNextChildren()` и
+        :func:`loadRemainingChildren()`), если это разрешено его политикой загрузки подэлементов.
+
+        Возвращает экземпляр действия :class:`VSubtreeLoadingAction`, которое сообщает о прогрессе загрузки
+        и может быть отменено методом :func:`VSubtreeLoadingAction.cancel()`.
+
+        ..warning::
+            Если родителем действия будет являться данная модель, то действие будет удалено сразу после завершения,
+            иначе ответственность по его удалению будет лежать на Вас.
+        """
+        assert parent.model() is self if parent.isValid() else True
+        action = VSubtreeLoadingAction(self, parent, maxDepth, maxConcurrency, parent=self)
+        self._traceAction(action)
+        action.finished.connect(lambda: self.deleteActionLater(action))
+        action.invalidated.connect(lambda: self.deleteActionLater(action))
+        QTimer.singleShot(0, action._start)
+        return action
+
+    def _requestChildrenPages(self, parent: QModelIndex, info: VChildrenLoadingInfo, loading: _VChildrenPagesLoading):
+        """Запрашивает очередные страницы подэлементов, пока не достигнут предел одновременно загружаемых страниц."""
+        pagination = info.pagination
+        maxConcurrentPages = pagination.getMaxConcurrentPages()
+        while loading.failedAt is None and loading.nextToRequest < len(loading.pages) \
+                and len(loading.running) < maxConcurrentPages:
+            page = loading.pages[loading.nextToRequest]
+            loading.nextToRequest += 1
+            pagination.setRequiredPage(page)
+            reply = self._requestToLoadingChildren(parent)
+            assert reply  # Проверяем, не забыли ли переопределить метод `self._requestToLoadingChildren(parent)`.
+            assert reply.isRunning()
+            record = self._acquireLoadRecord(parent, reply, Vns.ActionType.LoadingChildren,
+                    lambda record, page=page: self._finishLoadingChildrenPage(record, loading, page))
+            if record is None:
+                # Сеть недоступна (смотри _handleNotAccessibleNetwork()).
+                reply.abort()
+                reply.deleteLater()
+                errorType = Vns.ErrorType.NetworkError
+                informativeText = QCoreApplication.translate("VAbstractNetworkDataModelMixin", "Доступ в сеть отключён.")
+                self._setError(errorType, informativeText, "", parent)
+                self._failChildrenPage(info, loading, page, errorType, informativeText, "")
+                break
+            info.pageStates[page] = Vns.LoadingState.Loading
+            loading.running[page] = record
+
+    def _finishLoadingChildrenPage(self, record: _VModelLoadRecord, loading: _VChildrenPagesLoading, page: int):
+        """Обрабатывает завершение загрузки страницы `page` при параллельной загрузке страниц `loading`."""
+        assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
+        assert record.isRunning()
+        assert record.getType() == Vns.ActionType.LoadingChildren
+
+        if loading.running.get(page) is not record:
+            # Загрузка страницы была прервана из-за ошибки при загрузке предшествующей страницы или отменена.
+            self._unregisterAction(record)
+            self.deleteActionLater(record)
+            return
+        del loading.running[page]
+
+        if not record.isValid():
+            # Если элемент, из которого загружались подэлементы, был удален.
+            self._unregisterAction(record)
+            self.deleteActionLater(record)
+            self._cancelChildrenPagesLoading(loading)
+            return
+
+        parent = record.getIndex()
+        info = self._getChildrenLoadingInfo(parent)
+        assert info is not None
+        assert info.state == Vns.LoadingState.Loading
+
+        if self._handleNetworkReplyError(record):
+            self._failChildrenPage(info, loading, page, record.errorType(), record.errorInformativeText(),
+                    record.errorDetailedText())
+            self._unregisterAction(record)
+            record.setFinished()
+            self.deleteActionLater(record)
+        else:
+            loading.buffered[page] = record
+            self._insertLoadedChildrenPages(parent, info, loading)
+
+        self._requestChildrenPages(parent, info, loading)
+        if not loading.running:
+            self._finishChildrenPagesLoading(loading)
+
+    def _insertLoadedChildrenPages(self, parent: QModelIndex, info: VChildrenLoadingInfo,
+            loading: _VChildrenPagesLoading):
+        """Вставляет буферизованные страницы, чья очередь на вставку подошла."""
+        pagination = info.pagination
+        while loading.nextToInsert < loading.limit():
+            page = loading.pages[loading.nextToInsert]
+            record = loading.buffered.pop(page, None)
+            if record is None:
+                break
+            loading.nextToInsert += 1
+
+            with self._traceSpan("append children", parent, page=page):
+                appended = self._appendChildren(parent, record)
+            if appended and pagination._updateAfterLoadingPage(record, page):
+                info.pageStates[page] = Vns.LoadingState.Idle
+            else:
+                # TODO: Можно ли сменить тип ошибки на более подходящий?
+                errorType = Vns.ErrorType.UnknownError
+                if appended:
+                    informativeText = QCoreApplication.translate("VAbstractNetworkDataModelMixin",
+                            "Не удалось обновить пагинацию после загрузки подэлементов.")
+                else:
+                    informativeText = QCoreApplication.translate("VAbstractNetworkDataModelMixin",
+                            "Не удалось из загруженных данных создать подэлементы и вставить их в модель после их загрузки.")
+                record.setError(errorType, informativeText, "")
+                self._setError(errorType, informativeText, "", parent)
+                self._failChildrenPage(info, loading, page, errorType, informativeText, "")
+            self._unregisterAction(record)
+            record.setFinished()
+            self.deleteActionLater(record)
+
+    def _failChildrenPage(self, info: VChildrenLoadingInfo, loading: _VChildrenPagesLoading, page: int,
+            errorType: int, informativeText: str, detailedText: str):
+        """Помечает ошибочной страницу `page` и прерывает загрузку всех последующих страниц."""
+        position = loading.positions[page]
+        info.pageStates[page] = Vns.LoadingState.Error
+        if loading.failedAt is not None and loading.failedAt <= position:
+            return
+        loading.failedAt = position
+        loading.action.setError(errorType, informativeText, detailedText)
+
+        for laterPage, record in list(loading.running.items()):
+            if loading.positions[laterPage] > position:
+                del loading.running[laterPage]
+                info.pageStates[laterPage] = Vns.LoadingState.Error
+                if record.isValid():
+                    record.setInvalidated()  # Прерывает сетевой запрос.
+        for laterPage, record in list(loading.buffered.items()):
+            if loading.positions[laterPage] > position:
+                del loading.buffered[laterPage]
+                info.pageStates[laterPage] = Vns.LoadingState.Error
+                self._unregisterAction(record)
+                self.deleteActionLater(record)
+
+    def _cancelChildrenPagesLoading(self, loading: _VChildrenPagesLoading):
+        """Отменяет параллельную загрузку страниц `loading` (если элемент, из которого загружались подэлементы,
+        был удален)."""
+        running, loading.running = loading.running, dict()
+        for record in running.values():
+            if record.isValid() and record.isRunning():
+                record.setInvalidated()  # Прерывает сетевой запрос.
+        buffered, loading.buffered = loading.buffered, dict()
+        for record in buffered.values():
+            self._unregisterAction(record)
+            self.deleteActionLater(record)
+        action = loading.action
+        self.__childrenPagesLoadings.pop(action, None)
+        if action.isValid():
+            action.setInvalidated()
+        self._unregisterAction(action)
+        self.deleteActionLater(action)
+
+    def _finishChildrenPagesLoading(self, loading: _VChildrenPagesLoading):
+        """Завершает параллельную загрузку страниц `loading` после завершения загрузки всех запрошенных страниц."""
+        assert not loading.running
+        assert not loading.buffered
+        action = loading.action
+        self.__childrenPagesLoadings.pop(action, None)
+        if not action.isValid():
+            # Если элемент, из которого загружались подэлементы, был удален.
+            self._unregisterAction(action)
+            self.deleteActionLater(action)
+            return
+
+        parent = action.getIndex()
+        info = self._getChildrenLoadingInfo(parent)
+        assert info is not None
+        if loading.failedAt is None:
+            self._setChildrenLoadingState(Vns.LoadingState.Idle, parent, info)
+        else:
+            self._setChildrenLoadingState(Vns.LoadingState.Error, parent, info)
+
+        with self._traceSpan("signal emission", parent):
+            self.childrenLoadingFinished.emit(parent)
+            self._unregisterAction(action)
+            action.setFinished()
+        self.deleteActionLater(action)
+
+    def _loadChildren(self, parent: QModelIndex, keepAction: bool = True) -> VNetworkModelAction or _VModelLoadRecord:
+        """Запускает асинхронную загрузку подэлементов из элемента с модельным индексом `parent`.
+
+        Возвращает экземпляр действия :class:`VNetworkModelAction`.
+
+        Если `keepAction` равен False (т.е. действие не нужно вызывающей стороне), то вместо действия
+        может быть возвращена облегченная запись :class:`_VModelLoadRecord` (смотри :func:`_acquireLoadRecord()`).
+        Ссылку на такую запись нельзя хранить после завершения загрузки.
+
+        .. warning::
+            Перед вызовом данного метода необходимо сначала убедиться, что его вызов разрешен, затем подготовить
+            все необходимые параметры, такие как пагинация и прочие, и только затем уже вызвать данный метод.
+
+        ..warning::
+            Если родителем действия будет являться данная модель, то действие будет удалено сразу после завершения,
+            иначе ответственность по его удалению будет лежать на Вас.
+
+        ..note::
+            Если действие станет недействительным (то есть если до завершения действия будет удален элемент с индексом
+            `parent`), то сетевой запрос действия будет отменен.
+        """
+        assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
+        assert parent.model() is self if parent.isValid() else True
+
+        info = self._getChildrenLoadingInfo(parent)
+
+        assert info is not None
+        assert info.policy != Vns.LoadingPolicy.DoNotLoad
+        assert info.state in (Vns.LoadingState.Error, Vns.LoadingState.Idle)
+        assert info.pagination.getType() != Vns.PaginationType.Nothing
+
+        self._setChildrenLoadingState(Vns.LoadingState.Loading, parent, info)
+        info.loadingStartedAt = time.perf_counter()
+        self.childrenLoadingStarted.emit(parent)
+
+        if self._mustQueueChildrenLoading():
+            # Загрузки, которые не нужны вызывающей стороне (например, представлению), можно удалить из очереди.
+            return self._enqueueChildrenLoading(parent, droppable=not keepAction)
+
+        reply = self._requestToLoadingChildren(parent)
+        assert reply  # Проверяем, не забыли ли переопределить метод `self._requestToLoadingChildren(parent)`.
+        assert reply.isRunning()
+        if not keepAction:
+            record = self._acquireLoadRecord(parent, reply, Vns.ActionType.LoadingChildren,
+                    self._finishLoadingChildren)
+            if record is not None:
+                self.__runningChildrenLoads.add(record)
+                return record
+        action = VNetworkModelAction(
+                model=self,
+                index=parent,
+                reply=reply,
+                type=Vns.ActionType.LoadingChildren,
+                parent=self)
+        self._traceAction(action)
+
+        if self._handleNotAccessibleNetwork(action):
+            self._setChildrenLoadingState(Vns.LoadingState.Error, parent, info)
+            self.childrenLoadingFinished.emit(parent)
+            if info.inReloading:
+                info.inReloading = False
+            return action
+
+        # action.finished.connect(lambda: self.deleteActionLater(action))
+        action.invalidated.connect(action.replyAbort)
+        action.replyFinished.connect(self._finishLoadingChildren)
+        self._registerAction(action)
+        self.__runningChildrenLoads.add(action)
+        return action
+
+    def _requestToLoadingChildren(self, parent: QModelIndex) -> QNetworkReply or None:
+        """Запрашивает данные подэлементов из элемента с модельным индексом `parent`.
+
+        Возвращает ответ в виде экземпляра :class:`QNetworkReply` или None, если данные запросить нельзя.
+
+        .. note::
+            Если загрузка подэлементов не поддерживается из элемента с модельным индексом `parent`, возвращает None.
 
         .. warning::
             Это абстрактный метод, который должны переопределить наследники класса.
@@ -921,13 +2599,15 @@ class VAbstractNetworkDataModelMixin:
         """
         raise NotImplementedError()
 
-    def _finishLoadingChildren(self):
+    def _finishLoadingChildren(self, action: VNetworkModelAction or _VModelLoadRecord = None):
         """Завершает асинхронную загрузку подэлементов.
-        (Завершает действие :class:`VNetworkModelAction`, подключенное к этому слоту).
+        (Завершает действие `action` или, если оно не указано, действие :class:`VNetworkModelAction`,
+        подключенное к этому слоту).
         """
         assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
-        action = self.sender()
-        assert isinstance(action, VNetworkModelAction)
+        if action is None:
+            action = self.sender()
+        assert isinstance(action, (VNetworkModelAction, _VModelLoadRecord))
 
         assert action.isRunning()
         assert action.getModel() is self
@@ -939,6 +2619,7 @@ class VAbstractNetworkDataModelMixin:
         if not action.isValid():
             # Если элемент, из которого загружались подэлементы, был удален.
             self._unregisterAction(action)
+            self._releaseChildrenLoadingSlot(action)
             self.deleteActionLater(action)
             return
 
@@ -952,17 +2633,32 @@ class VAbstractNetworkDataModelMixin:
         # Может быть такая ситуация, когда запустили загрузку, поменяли политику загрузки и пришел ответ по загрузке...
         # assert info.policy() != Vns.LoadingPolicy.DoNotLoad
 
+        if self._startBuildingChildren(parent, action):
+            # Подэлементы строятся в фоне, а загрузка завершится повторным вызовом этого метода с готовым результатом.
+            return
+
         if not self._handleNetworkReplyError(action):
             pagination = info.pagination
 
-            if info.inReloading:
+            replacing = info.inReloading or pagination.mustRemoveLoadedDataWhenLoadingNewData()
+            if replacing and info.inReloading:
                 pagination._resetWhenReloadingData()
-                self._removeChildren(parent)
-            elif pagination.mustRemoveLoadedDataWhenLoadingNewData():
-                self._removeChildren(parent)
 
-            if self._appendChildren(parent, action):
+            if replacing and self._reconcilesChildren(parent):
+                # Сопоставляем новые подэлементы с уже загруженными вместо их полной замены.
+                with self._traceSpan("reconcile children", parent):
+                    appended = self._reconcileChildren(parent, action)
+            else:
+                if replacing:
+                    with self._traceSpan("remove children", parent):
+                        self._removeChildren(parent)
+
+                with self._traceSpan("append children", parent):
+                    appended = self._appendChildren(parent, action)
+            if appended:
                 if pagination._updateAfterLoadingData(action):
+                    info.validators = self._replyValidators(action)
+                    self._updateChildrenLoadingLatency(time.perf_counter() - info.loadingStartedAt)
                     self._setChildrenLoadingState(Vns.LoadingState.Idle, parent, info)
                 else:
                     self._removeChildren(parent)
@@ -993,11 +2689,13 @@ class VAbstractNetworkDataModelMixin:
         else:
             self._setChildrenLoadingState(Vns.LoadingState.Error, parent, info)
 
-        self.childrenLoadingFinished.emit(parent)
-        if info.inReloading:
-            info.inReloading = False
-        self._unregisterAction(action)
-        action.setFinished()
+        with self._traceSpan("signal emission", parent):
+            self.childrenLoadingFinished.emit(parent)
+            if info.inReloading:
+                info.inReloading = False
+            self._unregisterAction(action)
+            self._releaseChildrenLoadingSlot(action)
+            action.setFinished()
         self.deleteActionLater(action)
 
     # TODO: Модельный индекс нужно убрать из аргументов метода, так как его легко получить из аргумента действия!
@@ -1020,25 +2718,66 @@ class VAbstractNetworkDataModelMixin:
         """
         raise NotImplementedError()
 
-    # TODO: Доделать метод.
-    # def _resetChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
-    #     """Сбрасывает подэлементы элемента с модельным индексом `parent` в первоначальное незагруженное состояние.
-    #
-    #     Возвращает True - если сброс был успешным, False - иначе.
-    #     """
-    #     assert parent.model() is self if parent.isValid() else True
-    #     # if not self.childrenAreLoadedSeparately(parent):
-    #     #     return False
-    #     info = self._getChildrenLoadingInfo(parent)
-    #     if info is None:
-    #         return False
-    #     info.pagination()._resetAll()
-    #     info.resetInReloading()
-    #     info.resetError()
-    #     self._unsubscribeFromChildrenUpdateNotifications(parent, info)
-    #     self._resetChildrenLoadingState(parent, info)
-    #     self._removeChildren(parent)
-    #     return True
+    def _reconcilesChildren(self, parent: QModelIndex) -> bool:
+        """Возвращает True - если при перезагрузке (или замене) подэлементов элемента с модельным индексом `parent`
+        новые подэлементы нужно сопоставлять с уже загруженными методом :func:`_reconcileChildren()`,
+        False - если загруженные подэлементы нужно удалить и вставить новые.
+
+        .. note:: Базовая реализация всегда возвращает False.
+        """
+        return False
+
+    def _startBuildingChildren(self, parent: QModelIndex, action: VNetworkModelAction) -> bool:
+        """Запускает фоновое построение подэлементов элемента с модельным индексом `parent` из данных действия `action`
+        и возвращает True - если построение запущено, False - если подэлементы нужно строить сразу (в том числе,
+        если результат фонового построения для действия уже готов).
+
+        После фонового построения наследник должен снова вызвать :func:`_finishLoadingChildren()` с действием
+        `action`, а :func:`_appendChildren()` - использовать готовый результат.
+
+        .. note:: Базовая реализация всегда возвращает False.
+        """
+        return False
+
+    def _reconcileChildren(self, parent: QModelIndex, action: VNetworkModelAction) -> bool:
+        """Приводит загруженные подэлементы элемента с модельным индексом `parent` в соответствие с данными
+        из действия `action`: удаляет исчезнувшие, перемещает, вставляет новые и обновляет изменившиеся подэлементы,
+        сохраняя неизменные подэлементы (вместе с их загруженными подэлементами и подробными данными).
+
+        Возвращает True - если сопоставление завершилось успешно, иначе - возвращает False.
+
+        .. warning::
+            Это абстрактный метод, который должны переопределить наследники класса,
+            если :func:`_reconcilesChildren()` у них может вернуть True.
+        """
+        raise NotImplementedError()
+
+    def _touchChildren(self, parent: QModelIndex):
+        """Отмечает обращение к подэлементам элемента с модельным индексом `parent` (например, они видны
+        в представлении).
+
+        .. note:: Базовая реализация ничего не делает.
+        """
+        pass
+
+    def _resetChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Сбрасывает подэлементы элемента с модельным индексом `parent` в первоначальное незагруженное состояние:
+        удаляет загруженные подэлементы и сбрасывает пагинацию, чтобы подэлементы загружались заново по требованию.
+
+        Возвращает True - если сброс был успешным, False - иначе (в том числе, если подэлементы загружаются).
+        """
+        assert parent.model() is self if parent.isValid() else True
+        if not self.childrenAreLoadedSeparately(parent):
+            return False
+        info = self._getChildrenLoadingInfo(parent)
+        if info is None or info.state == Vns.LoadingState.Loading:
+            return False
+        self._removeChildren(parent)
+        info.inReloading = False
+        info.pageStates.clear()
+        info.pagination._resetAll()
+        self._setChildrenLoadingState(Vns.LoadingState.Idle, parent, info)
+        return True
 
     # ==== override QAbstractItemModel methods ====
 
@@ -1075,7 +2814,13 @@ class VAbstractNetworkDataModelMixin:
             Данный метод автоматически вызывается в представлениях, например, в :class:`PyQt5.QtCore.QAbstractItemView`.
         """
         assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
-        self.loadNextChildren(parent)
+        if self.childrenLoadingIsInLoadingState(parent):
+            # Подэлементы уже загружаются (например, по запросу другого представления).
+            return
+        assert self._canLoadNextChildren(parent, Vns.LoadingPolicy.Automatically) \
+               or self._canLoadNextChildren(parent, Vns.LoadingPolicy.Manually)
+        # Действие загрузки представлению не нужно, поэтому используем облегченную запись вместо него.
+        self._loadNextChildren(parent, keepAction=False)
 
     # def setData(self, index: QModelIndex, value, role: int = None) -> bool:
     #     """Переопределяет соответствующий родительский метод.
@@ -1092,21 +2837,6 @@ class VAbstractNetworkDataModelMixin:
     #         # return False
     #     return super().setData(index, value, role)
 
-    # def sendData(self, index: QModelIndex, value, role=None) -> VAbstractAsynchronousAction:
-    #     """Запускает асинхронное изменение данных по сети в удаленном хранилище.
-    #
-    #     sendData(self, index: QModelIndex, value: dict) -> VAbstractAsynchronousAction.
-    #     sendData(self, index: QModelIndex, value: Any, role: int) -> VAbstractAsynchronousAction.
-    #     sendData(self, index: QModelIndex, value: Any, role: str) -> VAbstractAsynchronousAction.
-    #     sendData(self, index: QModelIndex, value: Any, role: list[str]) -> VAbstractAsynchronousAction.
-    #
-    #     По умолчанию ничего не делает и возвращает действие, которое сразу испустит сигнал завершения с ошибкой.
-    #     """
-    #     assert isinstance(index, QModelIndex)  # Это только чтобы хоть как-то использовать аргумент.
-    #     assert isinstance(value, object)  # Это только чтобы хоть как-то использовать аргумент.
-    #     assert isinstance(role, object)  # Это только чтобы хоть как-то использовать аргумент.
-    #     return self._createAction()
-
     # ==== waiting for load methods ====
 
     # TODO: В этом методе еще дофига нерассмотренных ситуаций, когда надо прерывать ожидание!
@@ -1156,7 +2886,7 @@ class VAbstractNetworkDataModelMixin:
 
         if persistentParent.isValid():
             self.modelAboutToBeReset.connect(handleModelAboutToBeReset)
-            self.columnsAboutToBeRemove.connect(handleColumnsAboutToBeRemoved)
+            self.columnsAboutToBeRemoved.connect(handleColumnsAboutToBeRemoved)
             self.rowsAboutToBeRemoved.connect(handleRowsAboutToBeRemoved)
 
         self._childrenPaginationChanged.connect(quitIfCanLoadChildren)
@@ -1174,7 +2904,7 @@ class VAbstractNetworkDataModelMixin:
 
         if persistentParent.isValid():
             self.modelAboutToBeReset.disconnect(handleModelAboutToBeReset)
-            self.columnsAboutToBeRemove.disconnect(handleColumnsAboutToBeRemoved)
+            self.columnsAboutToBeRemoved.disconnect(handleColumnsAboutToBeRemoved)
             self.rowsAboutToBeRemoved.disconnect(handleRowsAboutToBeRemoved)
 
     @vFromQmlInvokable()
@@ -1213,6 +2943,153 @@ class VAbstractNetworkDataModelMixin:
         """
         self._waitForCanLoadChildren(self.canLoadPreviousChildren, parent, timeout)
 
+    # ==== non-blocking waiting for load methods ====
+
+    def _whenCanLoadChildren(self, canLoadChildren: Callable[[QModelIndex], bool],
+            parent: QModelIndex = QModelIndex(), timeout: int = -1) -> VAbstractAsynchronousAction:
+        """Возвращает действие, которое завершается, как только метод проверки доступности загрузки `canLoadChildren`
+        с аргументом `parent` вернет True (или сразу, если загрузка подэлементов не поддерживается из элемента
+        с индексом `parent`).
+
+        Действие завершается с ошибкой `Vns.ErrorType.TimeoutError`, если через `timeout` миллисекунд загрузка все еще
+        недоступна (если `timeout` меньше 0 (по умолчанию), то время ожидания не ограничено), и становится
+        недействительным при удалении элемента или сбросе модели.
+
+        В отличие от :func:`_waitForCanLoadChildren()` вызывающий метод не блокируется и вложенный цикл событий
+        не запускается: все ожидания модели обслуживаются одними и теми же соединениями с сигналами модели
+        и одним таймером крайних сроков, а проверяются только ожидания элементов, состояние которых изменилось.
+
+        .. note::
+            Действие завершается отложенно (не раньше следующего круга цикла событий), поэтому вызывающая сторона
+            успевает подключиться к его сигналам.
+        """
+        assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
+        assert parent.model() is self if parent.isValid() else True
+        action = VAsynchronousAction(parent=self)
+        key = QPersistentModelIndex(parent) if parent.isValid() else None
+        self.__childrenWaiters.setdefault(key, []).append((action, canLoadChildren))
+        if timeout >= 0:
+            deadline = time.monotonic() + timeout / 1000
+            self.__childrenWaitersCount += 1
+            heapq.heappush(self.__childrenWaitersDeadlines, (deadline, self.__childrenWaitersCount, action, key))
+            if self.__childrenWaitersDeadlines[0][2] is action:
+                self.__childrenWaitersTimeoutTimer.start(timeout)
+        self.__childrenWaitersToCheck.add(key)
+        self.__childrenWaitersCheckTimer.start()
+        return action
+
+    @vFromQmlInvokable(result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(QModelIndex, result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(QModelIndex, int, result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(int, result=VAbstractAsynchronousAction)
+    def whenCanReloadChildren(self, parent: QModelIndex = QModelIndex(),
+            timeout: int = -1) -> VAbstractAsynchronousAction:
+        """Неблокирующий вариант :func:`waitForCanReloadChildren()`: возвращает действие, которое завершается,
+        как только можно будет перезагрузить подэлементы элемента с индексом `parent`.
+
+        Смотри :func:`_whenCanLoadChildren()`.
+        """
+        return self._whenCanLoadChildren(self.canReloadChildren, parent, timeout)
+
+    @vFromQmlInvokable(result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(QModelIndex, result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(QModelIndex, int, result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(int, result=VAbstractAsynchronousAction)
+    def whenCanLoadNextChildren(self, parent: QModelIndex = QModelIndex(),
+            timeout: int = -1) -> VAbstractAsynchronousAction:
+        """Неблокирующий вариант :func:`waitForCanLoadNextChildren()`: возвращает действие, которое завершается,
+        как только можно будет загрузить следующую порцию подэлементов элемента с индексом `parent`.
+
+        Смотри :func:`_whenCanLoadChildren()`.
+        """
+        return self._whenCanLoadChildren(self.canLoadNextChildren, parent, timeout)
+
+    @vFromQmlInvokable(result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(QModelIndex, result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(QModelIndex, int, result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(int, result=VAbstractAsynchronousAction)
+    def whenCanLoadPreviousChildren(self, parent: QModelIndex = QModelIndex(),
+            timeout: int = -1) -> VAbstractAsynchronousAction:
+        """Неблокирующий вариант :func:`waitForCanLoadPreviousChildren()`: возвращает действие, которое завершается,
+        как только можно будет загрузить предыдущую порцию подэлементов элемента с индексом `parent`.
+
+        Смотри :func:`_whenCanLoadChildren()`.
+        """
+        return self._whenCanLoadChildren(self.canLoadPreviousChildren, parent, timeout)
+
+    def _scheduleChildrenWaitersCheck(self, parent: QModelIndex):
+        """Откладывает проверку ожиданий элемента с модельным индексом `parent`, если такие ожидания есть."""
+        if not self.__childrenWaiters:
+            return
+        key = QPersistentModelIndex(parent) if parent.isValid() else None
+        if key in self.__childrenWaiters:
+            self.__childrenWaitersToCheck.add(key)
+            self.__childrenWaitersCheckTimer.start()
+
+    def _checkChildrenWaiters(self):
+        """Завершает ожидания элементов, для которых загрузка подэлементов стала доступна."""
+        keys, self.__childrenWaitersToCheck = self.__childrenWaitersToCheck, set()
+        for key in keys:
+            waiters = self.__childrenWaiters.get(key)
+            if not waiters:
+                continue
+            if key is not None and not key.isValid():
+                continue  # Ожидания удаленного элемента инвалидирует _invalidateRemovedChildrenWaiters().
+            parent = QModelIndex(key) if key is not None else QModelIndex()
+            loadedSeparately = self.childrenAreLoadedSeparately(parent)
+            # Каждое ожидание проверяется заново, так как завершение предыдущего могло запустить загрузку.
+            for waiter in list(waiters):
+                action, canLoadChildren = waiter
+                if not action.isValid():  # Модель была сброшена при завершении предыдущего ожидания.
+                    break
+                if not loadedSeparately or canLoadChildren(parent):
+                    waiters.remove(waiter)
+                    action.setFinished()
+                    self.deleteActionLater(action)
+            if not waiters and self.__childrenWaiters.get(key) is waiters:
+                del self.__childrenWaiters[key]
+
+    def _expireChildrenWaiters(self):
+        """Завершает с ошибкой `Vns.ErrorType.TimeoutError` ожидания, крайний срок которых истек."""
+        deadlines = self.__childrenWaitersDeadlines
+        now = time.monotonic()
+        while deadlines and deadlines[0][0] <= now:
+            deadline, number, action, key = heapq.heappop(deadlines)
+            # Уже завершенные (и, возможно, удаленные) действия ожидания в списках ожиданий отсутствуют.
+            waiters = self.__childrenWaiters.get(key, [])
+            waiter = next((waiter for waiter in waiters if waiter[0] is action), None)
+            if waiter is None:
+                continue
+            waiters.remove(waiter)
+            if not waiters:
+                del self.__childrenWaiters[key]
+            action.setError(Vns.ErrorType.TimeoutError, QCoreApplication.translate("VAbstractNetworkDataModelMixin",
+                    "Истекло время ожидания возможности загрузки подэлементов."))
+            action.setFinished()
+            self.deleteActionLater(action)
+        if deadlines:
+            self.__childrenWaitersTimeoutTimer.start(max(0, math.ceil((deadlines[0][0] - now) * 1000)))
+
+    def _invalidateRemovedChildrenWaiters(self):
+        """Инвалидирует ожидания удаленных элементов."""
+        if not self.__childrenWaiters:
+            return
+        for key in [key for key in self.__childrenWaiters if key is not None and not key.isValid()]:
+            for action, canLoadChildren in self.__childrenWaiters.pop(key):
+                action.setInvalidated()
+                self.deleteActionLater(action)
+
+    def _invalidateAllChildrenWaiters(self):
+        """Инвалидирует все ожидания (при сбросе модели)."""
+        waiters, self.__childrenWaiters = self.__childrenWaiters, dict()
+        self.__childrenWaitersToCheck.clear()
+        self.__childrenWaitersDeadlines.clear()
+        self.__childrenWaitersTimeoutTimer.stop()
+        for actions in waiters.values():
+            for action, canLoadChildren in actions:
+                action.setInvalidated()
+                self.deleteActionLater(action)
+
     # ============================
     # ==== loading of details ====
     # ============================
@@ -1285,8 +3162,8 @@ class VAbstractNetworkDataModelMixin:
                 return False
         assert info is self._getDetailsLoadingInfo(index)
         if state != info.state:
-            info.state = state
-            self.detailsLoadingStateChanged.emit(index)
+            previous, info.state = info.state, state
+            self._notifyLoadingChange(Vns.ItemDataRole.DetailsLoadingState, index, previous)
         return True
 
     # def _resetDetailsLoadingState(self, index: QModelIndex, info: VDetailsLoadingInfo = None) -> bool:
@@ -1374,7 +3251,7 @@ class VAbstractNetworkDataModelMixin:
             return False
         if info.state not in (Vns.LoadingState.Error, Vns.LoadingState.Idle):
             return False
-        return True
+        return not info.revalidating
 
     @vFromQmlInvokable(QModelIndex, result=VAbstractAsynchronousAction)
     def reloadDetails(self, index: QModelIndex) -> VAbstractAsynchronousAction:
@@ -1393,6 +3270,41 @@ class VAbstractNetworkDataModelMixin:
         ..note::
             Если действие станет недействительным (то есть если до завершения действия будет удален элемент с индексом
             `index`), то сетевой запрос действия будет отменен.
+
+        .. note::
+            Если подробные данные уже загружаются (или перепроверяются), то новая загрузка не запускается,
+            а возвращается действие выполняющейся загрузки (или общее действие пакетной загрузки,
+            смотри :func:`reloadDetailsFor()`).
+        """
+        info = self._getDetailsLoadingInfo(index)
+        if info is not None and (info.state == Vns.LoadingState.Loading or info.revalidating):
+            running = self._runningLoading(index, Vns.ActionType.LoadingDetails)
+            if running is not None:
+                return running
+            key = QPersistentModelIndex(self.sibling(index.row(), 0, index) if index.isValid() else index)
+            for batch in self.__detailsLoadingBatches:
+                if key in batch.indexes:
+                    return batch.action
+            # Загрузка не найдена, а значит, ее нельзя ни дождаться, ни запустить заново.
+            action = VNetworkModelAction(model=self, index=index, type=Vns.ActionType.LoadingDetails, parent=self)
+            action.setError(Vns.ErrorType.UnknownError, QCoreApplication.translate("VAbstractNetworkDataModelMixin",
+                    "Подробные данные об элементе уже загружаются."), "")
+            action.finished.connect(lambda: self.deleteActionLater(action))
+            QTimer.singleShot(0, action.setFinished)
+            return action
+        return self._reloadDetails(index)
+
+    def _reloadDetails(self, index: QModelIndex, keepAction: bool = True,
+            onRecordFinished: Callable[[_VModelLoadRecord], None] = None,
+            revalidate: bool = False) -> VNetworkModelAction or _VModelLoadRecord:
+        """Запускает асинхронную перезагрузку подробных данных для элемента с модельным индексом `index`.
+
+        Если `keepAction` равен False, то вместо действия может быть возвращена облегченная запись
+        :class:`_VModelLoadRecord` (смотри :func:`_loadChildren()`). После завершения ответа такой записи будет вызван
+        `onRecordFinished` (по умолчанию - :func:`_finishLoadingDetails()`).
+
+        Если `revalidate` равен True, то запускается фоновая перепроверка подробных данных
+        (смотри :func:`revalidateDetails()`).
         """
         assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
         assert index.model() is self if index.isValid() else True
@@ -1402,22 +3314,36 @@ class VAbstractNetworkDataModelMixin:
         assert info is not None
         assert info.state in (Vns.LoadingState.Error, Vns.LoadingState.Idle)
 
-        self._setDetailsLoadingState(Vns.LoadingState.Loading, index, info)
-        self.detailsLoadingStarted.emit(index)
+        if revalidate:
+            assert info.loaded and info.state == Vns.LoadingState.Idle
+            info.revalidating = True
+        else:
+            self._setDetailsLoadingState(Vns.LoadingState.Loading, index, info)
+            self.detailsLoadingStarted.emit(index)
 
         reply = self._requestToLoadingDetails(index)
         assert reply  # Проверяем, не забыли ли переопределить метод `self._requestToLoadingDetails(index)`.
         assert reply.isRunning()
+        if not keepAction:
+            record = self._acquireLoadRecord(index, reply, Vns.ActionType.LoadingDetails,
+                    onRecordFinished or self._finishLoadingDetails)
+            if record is not None:
+                return record
         action = VNetworkModelAction(
                 model=self,
                 index=index,
                 reply=reply,
                 type=Vns.ActionType.LoadingDetails,
                 parent=self)
+        self._traceAction(action)
 
         if self._handleNotAccessibleNetwork(action):
-            self._setDetailsLoadingState(Vns.LoadingState.Error, index, info)
-            self.detailsLoadingFinished.emit(index)
+            if info.revalidating:
+                info.revalidating = False
+                self._postponeDetailsRevalidation(info)
+            else:
+                self._setDetailsLoadingState(Vns.LoadingState.Error, index, info)
+                self.detailsLoadingFinished.emit(index)
             return action
 
         # action.finished.connect(lambda: self.deleteActionLater(action))
@@ -1426,6 +3352,86 @@ class VAbstractNetworkDataModelMixin:
         self._registerAction(action)
         return action
 
+    @vFromQmlInvokable(list, result=VAbstractAsynchronousAction)
+    def reloadDetailsFor(self, indexes: List[QModelIndex]) -> VAbstractAsynchronousAction:
+        """Запускает асинхронную пакетную перезагрузку подробных данных для элементов с модельными индексами `indexes`.
+
+        Элементы, для которых перезагрузка сейчас невозможна (смотри :func:`canReloadDetails()`), пропускаются.
+
+        Ответы, пришедшие за одну итерацию цикла событий, применяются к модели вместе, а сигналы `dataChanged`
+        для смежных строк объединяются в диапазоны (смотри :func:`_dataChangedBatch()`), поэтому представления
+        перерисовываются один раз на пачку ответов, а не на каждый элемент.
+
+        Возвращает экземпляр общего действия :class:`VAbstractAsynchronousAction`, которое завершается после применения
+        ответов для всех элементов (с ошибкой первой из неудачных загрузок, если такая была).
+
+        ..warning::
+            Если родителем действия будет являться данная модель, то действие будет удалено сразу после завершения,
+            иначе ответственность по его удалению будет лежать на Вас.
+        """
+        action = VNetworkModelAction(model=self, index=QModelIndex(), type=Vns.ActionType.LoadingDetails, parent=self)
+        self._traceAction(action)
+        action.finished.connect(lambda: self.deleteActionLater(action))
+        batch = _VDetailsLoadingBatch(action)
+        onRecordFinished = lambda record: self._bufferBatchDetails(batch, record)
+
+        for index in indexes:
+            index = self.sibling(index.row(), 0, index) if index.isValid() else index
+            key = QPersistentModelIndex(index)
+            if key in batch.indexes or not self.canReloadDetails(index):
+                continue
+            batch.indexes.add(key)
+            loading = self._reloadDetails(index, keepAction=False, onRecordFinished=onRecordFinished)
+            batch.pendingCount += 1
+            if not isinstance(loading, _VModelLoadRecord):
+                # Сеть недоступна, и загрузка завершится сама (смотри _handleNotAccessibleNetwork()).
+                loading.finished.connect(lambda loading=loading: self._handleBatchDetailsActionFinished(batch, loading))
+                loading.invalidated.connect(lambda: self._handleBatchDetailsActionFinished(batch, None))
+
+        self.__detailsLoadingBatches.append(batch)
+        if not batch.pendingCount:
+            QTimer.singleShot(0, lambda: self._finishDetailsLoadingBatch(batch))
+        return action
+
+    def _bufferBatchDetails(self, batch: _VDetailsLoadingBatch, record: _VModelLoadRecord):
+        """Откладывает применение завершенной загрузки `record` пакета `batch` до конца текущей итерации цикла
+        событий."""
+        batch.finishedRecords.append(record)
+        if not batch.flushScheduled:
+            batch.flushScheduled = True
+            QTimer.singleShot(0, lambda: self._applyBatchDetails(batch))
+
+    def _applyBatchDetails(self, batch: _VDetailsLoadingBatch):
+        """Применяет все завершенные загрузки пакета `batch` одним пакетом изменений модели."""
+        batch.flushScheduled = False
+        records, batch.finishedRecords = batch.finishedRecords, []
+        with self._traceSpan("apply details batch", count=len(records)), self._dataChangedBatch():
+            for record in records:
+                # Запись возвращается в пул внутри _finishLoadingDetails(), поэтому ошибку записи возвращает он сам.
+                error = self._finishLoadingDetails(record)
+                if error is not None and batch.firstError is None:
+                    batch.firstError = error
+        batch.pendingCount -= len(records)
+        if not batch.pendingCount:
+            self._finishDetailsLoadingBatch(batch)
+
+    def _handleBatchDetailsActionFinished(self, batch: _VDetailsLoadingBatch, action: VNetworkModelAction or None):
+        """Учитывает загрузку пакета `batch`, завершенную полноценным действием `action`
+        (None - если действие стало недействительным)."""
+        if action is not None and action.isError() and batch.firstError is None:
+            batch.firstError = (action.errorType(), action.errorInformativeText(), action.errorDetailedText())
+        batch.pendingCount -= 1
+        if not batch.pendingCount and not batch.finishedRecords:
+            self._finishDetailsLoadingBatch(batch)
+
+    def _finishDetailsLoadingBatch(self, batch: _VDetailsLoadingBatch):
+        """Завершает общее действие пакетной загрузки подробных данных."""
+        self.__detailsLoadingBatches.remove(batch)
+        action = batch.action
+        if batch.firstError is not None:
+            action.setError(*batch.firstError)
+        action.setFinished()
+
     def _requestToLoadingDetails(self, index: QModelIndex) -> QNetworkReply or None:
         """Запрашивает подробные данные для элемента с модельным индексом `index`.
 
@@ -1445,13 +3451,20 @@ class VAbstractNetworkDataModelMixin:
         assert self._getDetailsLoadingInfo(index) is None  # Проверяем, не забыли ли переопределить этот метод.
         return None
 
-    def _finishLoadingDetails(self):
+    def _finishLoadingDetails(self,
+            action: VNetworkModelAction or _VModelLoadRecord = None) -> Tuple[int, str, str] or None:
         """Завершает асинхронную загрузку подробных данных об элементе.
-        (Завершает действие :class:`VNetworkModelAction`, подключенное к этому слоту).
+        (Завершает действие `action` или, если оно не указано, действие :class:`VNetworkModelAction`,
+        подключенное к этому слоту).
+
+        Возвращает тройку (тип, общеописательный текст, подробный текст) ошибки, с которой завершилось действие,
+        или None, если ошибки не было (облегченная запись после завершения возвращается в пул, и узнать ее ошибку
+        позже уже нельзя).
         """
         assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
-        action = self.sender()
-        assert isinstance(action, VNetworkModelAction)
+        if action is None:
+            action = self.sender()
+        assert isinstance(action, (VNetworkModelAction, _VModelLoadRecord))
 
         assert action.isRunning()
         assert action.getModel() is self
@@ -1472,12 +3485,30 @@ class VAbstractNetworkDataModelMixin:
         info = self._getDetailsLoadingInfo(index)
 
         assert info is not None
-        assert info.state == Vns.LoadingState.Loading
-
-        if not self._handleNetworkReplyError(action):
-            if self._updateDetails(action):
+        assert info.state == Vns.LoadingState.Loading or info.revalidating
+        revalidating = info.revalidating
+        info.revalidating = False
+
+        if revalidating and action.replyErrorType() != QNetworkReply.NoError:
+            # Ошибка перепроверки не публикуется в модели (смотри _postponeDetailsRevalidation()),
+            # а старые (устаревшие) подробные данные остаются в модели.
+            action.setError(Vns.ErrorType.NetworkError, action.replyErrorString(), action.replyBodyStringData())
+            self._postponeDetailsRevalidation(info)
+        elif not self._handleNetworkReplyError(action):
+            with self._traceSpan("update details", index):
+                updated = self._updateDetails(action)
+            if updated:
                 info.loaded = True
+                info.validators = self._replyValidators(action)
+                info.loadedAt = time.monotonic()
+                info.expiresAt = self._detailsExpirationTime(info)
+                info.revalidationFailures = 0
                 self._setDetailsLoadingState(Vns.LoadingState.Idle, index, info)
+            elif revalidating:
+                # Старые (устаревшие) подробные данные остаются в модели.
+                action.setError(Vns.ErrorType.UnknownError, QCoreApplication.translate("VAbstractNetworkDataModelMixin",
+                        "Не удалось обновить подробные данные об элементе после их загрузки."))
+                self._postponeDetailsRevalidation(info)
             else:
                 # TODO: Можно ли сменить тип ошибки на более подходящий?
                 errorType = Vns.ErrorType.UnknownError
@@ -1488,13 +3519,18 @@ class VAbstractNetworkDataModelMixin:
                 self._setError(errorType, informativeText, detailedText, index)
 
                 self._setDetailsLoadingState(Vns.LoadingState.Error, index, info)
-        else:
+        elif not revalidating:
             self._setDetailsLoadingState(Vns.LoadingState.Error, index, info)
 
-        self.detailsLoadingFinished.emit(index)
-        self._unregisterAction(action)
-        action.setFinished()
+        with self._traceSpan("signal emission", index):
+            if not revalidating:
+                self.detailsLoadingFinished.emit(index)
+            self._unregisterAction(action)
+            action.setFinished()
+        error = (action.errorType(), action.errorInformativeText(), action.errorDetailedText()) \
+            if action.isError() else None
         self.deleteActionLater(action)
+        return error
 
     def _updateDetails(self, action: VNetworkModelAction) -> bool:
         """Обновляет подробные данные об элементе, используя данные из действия `action`.
@@ -1508,3 +3544,584 @@ class VAbstractNetworkDataModelMixin:
         # assert action.getIndex().isValid()  # Впринципе, не стоит ограничивать валидность индекса.
         assert self._getDetailsLoadingInfo(action.getIndex()) is None  # Проверяем, не забыли ли переопределить этот метод.
         return False
+
+    # =========================
+    # ==== sending of data ====
+    # =========================
+
+    def sendingDelay(self) -> int:
+        """Возвращает окно (в миллисекундах), в течение которого изменения данных накапливаются перед отправкой."""
+        return self.__sendingDelay
+
+    def setSendingDelay(self, msec: int):
+        """Устанавливает окно `msec` (в миллисекундах), в течение которого изменения данных накапливаются
+        перед отправкой (0 - изменения отправляются в конце текущего круга цикла событий)."""
+        assert msec >= 0
+        self.__sendingDelay = msec
+        self.__sendingTimer.setInterval(msec)
+
+    def maxSendingBatchSize(self) -> int:
+        """Возвращает максимальное количество элементов, изменения которых отправляются одним запросом."""
+        return self.__maxSendingBatchSize
+
+    def setMaxSendingBatchSize(self, size: int):
+        """Устанавливает максимальное количество элементов `size`, изменения которых отправляются одним запросом
+        (1 - каждый элемент отдельным запросом)."""
+        assert size > 0
+        self.__maxSendingBatchSize = size
+
+    @vFromQmlInvokable(result=int)
+    def pendingDataChangesCount(self) -> int:
+        """Возвращает количество элементов, изменения которых еще не отправлены."""
+        return len(self.__pendingSendChanges)
+
+    @vFromQmlInvokable(QModelIndex, 'QVariantMap', result=VAbstractAsynchronousAction)
+    @vFromQmlInvokable(QModelIndex, 'QVariant', str, result=VAbstractAsynchronousAction)
+    def sendData(self, index: QModelIndex, value, role=None) -> VAbstractAsynchronousAction:
+        """Запускает асинхронное изменение данных элемента с модельным индексом `index` в удаленном хранилище.
+
+        sendData(self, index: QModelIndex, value: dict) -> VAbstractAsynchronousAction.
+        sendData(self, index: QModelIndex, value: Any, role: int) -> VAbstractAsynchronousAction.
+        sendData(self, index: QModelIndex, value: Any, role: str) -> VAbstractAsynchronousAction.
+        sendData(self, index: QModelIndex, value: dict, role: list[str]) -> VAbstractAsynchronousAction.
+
+        Изменяемые поля словаря данных элемента (`Vns.ItemDataRole.ItemDict`) задаются словарем `value`, названием
+        поля `role`, списком названий полей `role` (их значения берутся из словаря `value`) или ролью `role`
+        (смотри :func:`_dataChangesForRole()`).
+
+        Изменение сразу применяется к словарю данных элемента, а отправляется вместе с изменениями других элементов
+        после окна накопления (смотри :func:`setSendingDelay()`). Если отправка не удалась, то измененные поля,
+        которые с тех пор не менялись, откатываются, а действие завершается с ошибкой.
+
+        Возвращает экземпляр действия :class:`VAbstractAsynchronousAction`. Пока изменение элемента не отправлено,
+        повторные вызовы для того же элемента объединяются с ним и возвращают то же действие.
+
+        ..warning::
+            Если родителем действия будет являться данная модель, то действие будет удалено сразу после завершения,
+            иначе ответственность по его удалению будет лежать на Вас.
+        """
+        assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
+        assert index.isValid() and index.model() is self
+        index = self.sibling(index.row(), self.ZERO_COLUMN, index)
+        if role is None:
+            assert isinstance(value, dict)
+            changes = dict(value)
+        elif isinstance(role, str):
+            changes = {role: value}
+        elif isinstance(role, (list, tuple)):
+            assert isinstance(value, dict)
+            changes = {field: value[field] for field in role}
+        else:
+            changes = self._dataChangesForRole(index, value, role)
+        itemDict = self.data(index, Vns.ItemDataRole.ItemDict)
+        if changes is None or not isinstance(itemDict, dict):
+            action = VNetworkModelAction(model=self, index=index, type=Vns.ActionType.ChangingItem, parent=self)
+            action.setError(Vns.ErrorType.UnknownError, QCoreApplication.translate("VAbstractNetworkDataModelMixin",
+                    "Изменение этих данных элемента не поддерживается."), "")
+            action.finished.connect(lambda: self.deleteActionLater(action))
+            QTimer.singleShot(0, action.setFinished)
+            return action
+
+        key = QPersistentModelIndex(index)
+        change = self.__pendingSendChanges.get(key)
+        if change is None:
+            action = VNetworkModelAction(model=self, index=index, type=Vns.ActionType.ChangingItem, parent=self)
+            self._traceAction(action)
+            change = _VDataChange(action)
+            action.invalidated.connect(lambda: self._handleDataChangeInvalidated(key, change))
+            self._registerAction(action)
+            self.__pendingSendChanges[key] = change
+            self.__unconfirmedDataChanges.setdefault(key, []).append(change)
+        for field in changes:
+            if field not in change.originals:
+                change.originals[field] = itemDict.get(field, _MISSING_FIELD)
+        change.changes.update(changes)
+        newItemDict = dict(itemDict)
+        newItemDict.update(changes)
+        self._setData(index, newItemDict, Vns.ItemDataRole.ItemDict)
+
+        if len(self.__pendingSendChanges) >= self.__maxSendingBatchSize:
+            self.sendPendingData()
+        elif not self.__sendingTimer.isActive():
+            self.__sendingTimer.start()
+        return change.action
+
+    def _dataChangesForRole(self, index: QModelIndex, value, role: int) -> dict or None:
+        """Возвращает изменяемые поля словаря данных элемента с модельным индексом `index` для значения `value`
+        роли `role` или None, если изменение этой роли не поддерживается.
+
+        .. note::
+            Базовая реализация всегда возвращает None. Наследники класса могут переопределить этот метод, например,
+            чтобы отправлять изменения `Qt.EditRole` из представлений.
+        """
+        assert isinstance(index, QModelIndex)  # Это чтобы хоть как-то использовать аргументы.
+        assert isinstance(value, object)
+        assert isinstance(role, int)
+        return None
+
+    @vFromQmlInvokable()
+    def sendPendingData(self):
+        """Отправляет накопленные изменения данных элементов, не дожидаясь окончания окна накопления."""
+        self.__sendingTimer.stop()
+        pending = list(self.__pendingSendChanges.items())
+        self.__pendingSendChanges.clear()
+        for first in range(0, len(pending), self.__maxSendingBatchSize):
+            self._sendDataChanges(pending[first:first + self.__maxSendingBatchSize])
+
+    def _requestToSendingData(self, changes: List[Tuple[QModelIndex, dict]]) -> QNetworkReply or None:
+        """Отправляет изменения данных нескольких элементов одним запросом.
+
+        Возвращает ответ в виде экземпляра :class:`QNetworkReply` или None, если изменения отправить нельзя.
+
+        .. warning::
+            Базовая реализация ничего не делает и всегда возвращает None.
+            Наследники класса должны переопределить этот метод, чтобы позволить изменять данные элементов.
+
+        :param changes: Список пар (модельный индекс элемента, словарь измененных полей).
+        :rtype: QNetworkReply or None
+
+        Пример:
+
+        .. sourcecode::
+
+            def _requestToSendingData(self, changes: List[Tuple[QModelIndex, dict]]) -> QNetworkReply:
+                body = [dict(fields, id=self.data(index, Vns.ItemDataRole.ItemDict)["id"])
+                        for index, fields in changes]
+                request = QNetworkRequest(QUrl("https://example.com/items"))
+                request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
+                return self.__manager.sendCustomRequest(request, b"PATCH", json.dumps(body).encode())
+        """
+        assert isinstance(changes, list)  # Это чтобы хоть как-то использовать аргумент.
+        return None
+
+    def _updateAfterSendingData(self, changes: List[Tuple[QModelIndex, dict]], action: VNetworkModelAction):
+        """Обновляет данные элементов после успешной отправки их изменений `changes` действием `action`
+        (например, данными из ответа сервера).
+
+        .. note:: Базовая реализация ничего не делает.
+        """
+        pass
+
+    def _sendDataChanges(self, batch: List[Tuple[QPersistentModelIndex, _VDataChange]]):
+        """Отправляет пакет изменений данных `batch` одним запросом."""
+        for key, change in batch:
+            change.sent = True
+        reply = self._requestToSendingData([(QModelIndex(key), dict(change.changes)) for key, change in batch])
+        if reply is None:
+            self._completeDataChanges(batch, (Vns.ErrorType.UnknownError,
+                    QCoreApplication.translate("VAbstractNetworkDataModelMixin",
+                            "Отправка изменений данных элементов не поддерживается."), ""))
+            return
+        action = VNetworkModelAction(model=self, reply=reply, type=Vns.ActionType.ChangingItem, parent=self)
+        self._traceAction(action)
+        if self._handleNotAccessibleNetwork(action):
+            self._completeDataChanges(batch,
+                    (action.errorType(), action.errorInformativeText(), action.errorDetailedText()))
+            return
+        self.__sentDataChanges[action] = batch
+        action.replyFinished.connect(lambda: self._finishSendingData(action))
+
+    def _finishSendingData(self, action: VNetworkModelAction):
+        """Завершает отправку пакета изменений данных действием `action`."""
+        batch = self.__sentDataChanges.pop(action)
+        if self._handleNetworkReplyError(action):
+            self._completeDataChanges(batch,
+                    (action.errorType(), action.errorInformativeText(), action.errorDetailedText()))
+        else:
+            sent = [(QModelIndex(key), dict(change.changes)) for key, change in batch if change.action.isValid()]
+            if sent:
+                self._updateAfterSendingData(sent, action)
+            self._completeDataChanges(batch, None)
+        action.setFinished()
+        self.deleteActionLater(action)
+
+    def _completeDataChanges(self, batch: List[Tuple[QPersistentModelIndex, _VDataChange]],
+            error: Tuple[int, str, str] or None):
+        """Завершает действия изменения элементов пакета `batch` с ошибкой `error` (None - без ошибки),
+        откатывая при ошибке их изменения."""
+        for key, change in batch:
+            action = change.action
+            if action.isValid():
+                self._forgetDataChange(key, change, rollback=error is not None)
+                if error is not None:
+                    action.setError(*error)
+                self._unregisterAction(action)
+                action.setFinished()
+            else:
+                # Элемент был удален во время отправки.
+                self._unregisterAction(action)
+            self.deleteActionLater(action)
+
+    def _forgetDataChange(self, key: QPersistentModelIndex, change: _VDataChange, rollback: bool):
+        """Исключает изменение `change` элемента с постоянным индексом `key` из неподтвержденных и, если `rollback`
+        равен True, откатывает его поля, которые с тех пор не менялись."""
+        changes = self.__unconfirmedDataChanges.get(key)
+        if changes is None or change not in changes:
+            return
+        position = changes.index(change)
+        later = changes[position + 1:]
+        del changes[position]
+        if not changes:
+            del self.__unconfirmedDataChanges[key]
+        if not rollback or not key.isValid():
+            return
+
+        index = QModelIndex(key)
+        itemDict = self.data(index, Vns.ItemDataRole.ItemDict)
+        restored = dict(itemDict)
+        for field, value in change.changes.items():
+            newer = next((laterChange for laterChange in later if field in laterChange.changes), None)
+            if newer is not None:
+                # Поле изменено еще раз - откатывать его будет более позднее изменение (если понадобится).
+                newer.originals[field] = change.originals[field]
+                continue
+            if itemDict.get(field, _MISSING_FIELD) != value:
+                continue  # Поле уже изменилось иначе (например, при перезагрузке).
+            original = change.originals[field]
+            if original is _MISSING_FIELD:
+                del restored[field]
+            else:
+                restored[field] = original
+        if restored != itemDict:
+            self._setData(index, restored, Vns.ItemDataRole.ItemDict)
+
+    def _handleDataChangeInvalidated(self, key: QPersistentModelIndex, change: _VDataChange):
+        """Обрабатывает инвалидацию действия изменения элемента (элемент был удален или модель сброшена)."""
+        self._forgetDataChange(key, change, rollback=False)
+        if change.sent:
+            return  # Регистрация действия будет отменена после завершения отправки пакета.
+        if self.__pendingSendChanges.get(key) is change:
+            del self.__pendingSendChanges[key]
+        self._unregisterAction(change.action)
+        self.deleteActionLater(change.action)
+
+    # ==================
+    # ==== viewport ====
+    # ==================
+
+    @vFromQmlInvokable(int, int)
+    @vFromQmlInvokable(int, int, QModelIndex)
+    def setVisibleRows(self, first: int, last: int, parent: QModelIndex = QModelIndex()):
+        """Сообщает модели, что в представлении видны подэлементы элемента с модельным индексом `parent`
+        в строках с `first` по `last` включительно.
+
+        Каждое новое сообщение для того же элемента `parent` заменяет предыдущее. Чтобы сообщить, что подэлементы
+        больше не видны, передайте `last` меньше `first` или вызовите метод :func:`clearVisibleRows()`.
+
+        Модель использует эти данные для автоматической загрузки подробных данных видимых элементов
+        (смотри :func:`setDetailsLoadingPolicy()`).
+        """
+        assert parent.model() is self if parent.isValid() else True
+        key = QPersistentModelIndex(parent) if parent.isValid() else None
+        if last < first:
+            self.__visibleRows.pop(key, None)
+            self.__scrollVelocities.pop(key, None)
+            self._scheduleChildrenLoadingQueueUpdate()
+            return
+        self.__visibleRows[key] = (max(first, 0), last)
+        self._updateScrollVelocity(key, last)
+        self._touchChildren(parent)
+        self._scheduleVisibleDetailsLoading()
+        self._scheduleChildrenLoadingQueueUpdate()
+        self._prefetchChildren(parent, last)
+
+    @vFromQmlInvokable()
+    @vFromQmlInvokable(QModelIndex)
+    def clearVisibleRows(self, parent: QModelIndex = None):
+        """Сообщает модели, что подэлементы элемента с модельным индексом `parent` больше не видны.
+        Если `parent` не указан, то забывает обо всех видимых строках."""
+        if parent is None:
+            self.__visibleRows.clear()
+            self.__scrollVelocities.clear()
+        else:
+            key = QPersistentModelIndex(parent) if parent.isValid() else None
+            self.__visibleRows.pop(key, None)
+            self.__scrollVelocities.pop(key, None)
+        self._scheduleChildrenLoadingQueueUpdate()
+
+    def _visibleRows(self) -> List[Tuple[QModelIndex, int, int]]:
+        """Возвращает список видимых строк в виде троек (индекс родителя, первая строка, последняя строка).
+
+        Попутно забывает о видимых строках удаленных элементов.
+        """
+        result = []
+        for key, (first, last) in list(self.__visibleRows.items()):
+            if key is None:
+                parent = QModelIndex()
+            elif key.isValid():
+                parent = QModelIndex(key)
+            else:
+                del self.__visibleRows[key]
+                self.__scrollVelocities.pop(key, None)
+                continue
+            result.append((parent, first, last))
+        return result
+
+    def _handleRowsInsertedForViewport(self, parent: QModelIndex, first: int, last: int):
+        """Планирует загрузку подробных данных, если строки были вставлены в видимую часть элемента `parent`."""
+        rows = self.__visibleRows.get(QPersistentModelIndex(parent) if parent.isValid() else None)
+        if rows is not None and first <= rows[1] and last >= rows[0]:
+            self._scheduleVisibleDetailsLoading()
+
+    # ==== automatic loading of visible details ====
+
+    def detailsLoadingPolicy(self) -> Vns.LoadingPolicy:
+        """Возвращает политику загрузки подробных данных об элементах модели."""
+        return self.__detailsLoadingPolicy
+
+    def setDetailsLoadingPolicy(self, policy: Vns.LoadingPolicy):
+        """Устанавливает политику загрузки подробных данных об элементах модели.
+
+        Если политика включает `Vns.LoadingPolicy.Automatically`, то подробные данные еще не загруженных видимых
+        элементов (смотри :func:`setVisibleRows()`) загружаются автоматически после небольшой задержки
+        (смотри :func:`setDetailsLoadingDelay()`). Если за время задержки видимые строки изменились, то загрузка
+        строк, ушедших из видимой области, так и не начинается, поэтому быстрая прокрутка не порождает запросов
+        для всех пролистанных элементов.
+
+        Ручная загрузка с помощью метода :func:`reloadDetails()` доступна при любой политике.
+        """
+        self.__detailsLoadingPolicy = policy
+        if Vns.LoadingPolicy.Automatically in policy:
+            self._scheduleVisibleDetailsLoading()
+        else:
+            self.__visibleDetailsLoadingTimer.stop()
+        self._updateDetailsRevalidationTimer()
+
+    def detailsLoadingDelay(self) -> int:
+        """Возвращает задержку (в миллисекундах) автоматической загрузки подробных данных видимых элементов."""
+        return self.__visibleDetailsLoadingTimer.interval()
+
+    def setDetailsLoadingDelay(self, msec: int):
+        """Устанавливает задержку (в миллисекундах) автоматической загрузки подробных данных видимых элементов."""
+        assert msec >= 0
+        self.__visibleDetailsLoadingTimer.setInterval(msec)
+
+    def _scheduleVisibleDetailsLoading(self):
+        """Перезапускает таймер отложенной загрузки подробных данных видимых элементов
+        (если включена автоматическая загрузка подробных данных)."""
+        if Vns.LoadingPolicy.Automatically in self.__detailsLoadingPolicy and self.__visibleRows:
+            self.__visibleDetailsLoadingTimer.start()
+
+    def _loadVisibleDetails(self):
+        """Запускает загрузку подробных данных всех видимых элементов, для которых они еще не загружены
+        и не загружаются, и фоновую перепроверку устаревших подробных данных видимых элементов."""
+        assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
+        if Vns.LoadingPolicy.Automatically not in self.__detailsLoadingPolicy:
+            return
+        now = time.monotonic()
+        for parent, first, last in self._visibleRows():
+            last = min(last, self.rowCount(parent) - 1)
+            for row in range(first, last + 1):
+                index = self.index(row, 0, parent)
+                info = self._getDetailsLoadingInfo(index)
+                # Элементы с ошибкой загрузки автоматически не перезагружаем, чтобы не порождать лавину запросов.
+                if info is None or info.state != Vns.LoadingState.Idle:
+                    continue
+                if not info.loaded:
+                    self._reloadDetails(index, keepAction=False)
+                elif not info.revalidating and info.expiresAt <= now:
+                    self._reloadDetails(index, keepAction=False, revalidate=True)
+
+    # ==== expiration of details ====
+
+    def detailsTimeToLive(self) -> int:
+        """Возвращает время жизни (в миллисекундах) загруженных подробных данных элементов модели
+        (-1 - подробные данные не устаревают)."""
+        return self.__detailsTimeToLive
+
+    def setDetailsTimeToLive(self, msec: int):
+        """Устанавливает время жизни (в миллисекундах) загруженных подробных данных элементов модели
+        (-1 - подробные данные не устаревают).
+
+        Время жизни отсчитывается от момента загрузки подробных данных, поэтому новое значение действует на подробные
+        данные, загруженные после его установки. Для отдельных элементов время жизни можно переопределить методом
+        :func:`setItemDetailsTimeToLive()`.
+
+        Устаревшие подробные данные остаются в модели и доступны представлениям, а если политика загрузки подробных
+        данных включает `Vns.LoadingPolicy.Automatically`, то для видимых элементов (смотри :func:`setVisibleRows()`)
+        периодически (смотри :func:`setDetailsRevalidationInterval()`) запускается их фоновая перепроверка
+        (смотри :func:`revalidateDetails()`).
+        """
+        assert msec >= -1
+        self.__detailsTimeToLive = msec
+        self._updateDetailsRevalidationTimer()
+
+    def itemDetailsTimeToLive(self, index: QModelIndex) -> int or None:
+        """Возвращает время жизни (в миллисекундах) подробных данных элемента с модельным индексом `index`
+        или None, если для элемента используется время жизни модели (смотри :func:`detailsTimeToLive()`)."""
+        info = self._getDetailsLoadingInfo(index)
+        return info.timeToLive if info else None
+
+    def setItemDetailsTimeToLive(self, index: QModelIndex, msec: int or None) -> bool:
+        """Устанавливает время жизни (в миллисекундах) подробных данных элемента с модельным индексом `index`
+        (-1 - подробные данные не устаревают, None - используется время жизни модели).
+
+        Если подробные данные элемента уже загружены, то момент их устаревания пересчитывается.
+
+        Возвращает True - если время жизни было установлено успешно, False - иначе.
+        """
+        assert msec is None or msec >= -1
+        info = self._getDetailsLoadingInfo(index)
+        if info is None:
+            return False
+        info.timeToLive = msec
+        if info.loaded:
+            info.expiresAt = self._detailsExpirationTime(info)
+        if msec is not None:
+            self.__hasItemDetailsTimeToLive = True
+            self._updateDetailsRevalidationTimer()
+        return True
+
+    def detailsRevalidationInterval(self) -> int:
+        """Возвращает период (в миллисекундах) проверки видимых элементов на устаревание подробных данных."""
+        return self.__detailsRevalidationTimer.interval()
+
+    def setDetailsRevalidationInterval(self, msec: int):
+        """Устанавливает период (в миллисекундах) проверки видимых элементов на устаревание подробных данных."""
+        assert msec > 0
+        self.__detailsRevalidationTimer.setInterval(msec)
+
+    @vFromQmlInvokable(QModelIndex, result=bool)
+    def detailsAreStale(self, index: QModelIndex) -> bool:
+        """Возвращает True - если загруженные подробные данные элемента с модельным индексом `index` устарели,
+        иначе - возвращает False."""
+        assert index.model() is self if index.isValid() else True
+        info = self._getDetailsLoadingInfo(index)
+        if info is None or not info.loaded:
+            return False
+        return info.expiresAt <= time.monotonic()
+
+    @vFromQmlInvokable(QModelIndex, result=bool)
+    def canRevalidateDetails(self, index: QModelIndex) -> bool:
+        """Возвращает True - если в данный момент можно запустить фоновую перепроверку подробных данных элемента
+        с модельным индексом `index`, иначе - возвращает False."""
+        assert index.model() is self if index.isValid() else True
+        info = self._getDetailsLoadingInfo(index)
+        if info is None:
+            return False
+        return info.loaded and info.state == Vns.LoadingState.Idle and not info.revalidating
+
+    @vFromQmlInvokable(QModelIndex, result=VAbstractAsynchronousAction)
+    def revalidateDetails(self, index: QModelIndex) -> VAbstractAsynchronousAction:
+        """Запускает фоновую перепроверку (перезагрузку) уже загруженных подробных данных элемента с модельным индексом
+        `index`.
+
+        В отличие от :func:`reloadDetails()` состояние загрузки подробных данных не переходит в
+        `Vns.LoadingState.Loading`, а старые подробные данные остаются в модели до прихода новых. Если перепроверка
+        завершилась ошибкой, то старые подробные данные так и остаются (устаревшими), ошибка не публикуется в модели
+        (ее получает только возвращаемое действие), а следующая перепроверка откладывается
+        (смотри :func:`_postponeDetailsRevalidation()`).
+
+        Возвращает экземпляр действия :class:`VAbstractAsynchronousAction`.
+
+        .. warning::
+            Перед вызовом данного метода необходимо убедиться, что метод :func:`canRevalidateDetails()` возвращает True.
+
+        ..warning::
+            Если родителем действия будет являться данная модель, то действие будет удалено сразу после завершения,
+            иначе ответственность по его удалению будет лежать на Вас.
+        """
+        assert self.canRevalidateDetails(index)
+        return self._reloadDetails(index, revalidate=True)
+
+    def _detailsTimeToLiveOf(self, info: VDetailsLoadingInfo) -> int:
+        """Возвращает действующее время жизни (в миллисекундах) подробных данных с информацией `info`."""
+        return self.__detailsTimeToLive if info.timeToLive is None else info.timeToLive
+
+    def _detailsExpirationTime(self, info: VDetailsLoadingInfo) -> float:
+        """Возвращает момент устаревания загруженных подробных данных с информацией `info`."""
+        timeToLive = self._detailsTimeToLiveOf(info)
+        return info.loadedAt + timeToLive / 1000 if timeToLive >= 0 else math.inf
+
+    def _postponeDetailsRevalidation(self, info: VDetailsLoadingInfo):
+        """Откладывает следующую перепроверку подробных данных с информацией `info` после неудачной перепроверки.
+
+        Отсрочка удваивается с каждой неудачей подряд, начиная с периода проверки видимых элементов
+        (смотри :func:`setDetailsRevalidationInterval()`), но не превышает :attr:`MAX_DETAILS_REVALIDATION_BACKOFF`.
+        Поэтому недоступный сервер не перезапрашивается на каждом срабатывании таймера проверки, а ошибки перепроверки
+        не публикуются в модели (их получает только действие перепроверки).
+        """
+        info.revalidationFailures += 1
+        backoff = self.__detailsRevalidationTimer.interval() * 2 ** min(info.revalidationFailures - 1, 16)
+        info.expiresAt = time.monotonic() + min(backoff, self.MAX_DETAILS_REVALIDATION_BACKOFF) / 1000
+
+    def _updateDetailsRevalidationTimer(self):
+        """Запускает или останавливает таймер проверки видимых элементов на устаревание подробных данных."""
+        if Vns.LoadingPolicy.Automatically in self.__detailsLoadingPolicy \
+                and (self.__detailsTimeToLive >= 0 or self.__hasItemDetailsTimeToLive):
+            if not self.__detailsRevalidationTimer.isActive():
+                self.__detailsRevalidationTimer.start()
+        else:
+            self.__detailsRevalidationTimer.stop()
+
+    # ==== prefetching of children ====
+
+    def childrenPrefetchThreshold(self) -> int:
+        """Возвращает минимальный порог упреждающей загрузки подэлементов (в строках)."""
+        return self.__childrenPrefetchThreshold
+
+    def setChildrenPrefetchThreshold(self, rows: int):
+        """Устанавливает минимальный порог упреждающей загрузки подэлементов (в строках).
+
+        Если у элемента политика загрузки подэлементов включает `Vns.LoadingPolicy.Prefetching`, то следующая порция
+        его подэлементов начинает загружаться, как только последняя видимая строка (смотри :func:`setVisibleRows()`)
+        оказывается не дальше порога от конца загруженных подэлементов.
+
+        Фактический порог адаптируется: он не меньше количества строк, которые при наблюдаемой скорости прокрутки
+        успеют пролистать за наблюдаемое время загрузки порции (с запасом :attr:`PREFETCH_SAFETY_FACTOR`).
+        Смотри :func:`effectiveChildrenPrefetchThreshold()`.
+        """
+        assert rows >= 0
+        self.__childrenPrefetchThreshold = rows
+
+    def effectiveChildrenPrefetchThreshold(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Возвращает фактический (адаптивный) порог упреждающей загрузки подэлементов элемента с модельным индексом
+        `parent` (в строках)."""
+        key = QPersistentModelIndex(parent) if parent.isValid() else None
+        velocity = self.__scrollVelocities.get(key, (0.0, 0, 0.0))[2]
+        adaptive = math.ceil(velocity * self.__childrenLoadingLatency * self.PREFETCH_SAFETY_FACTOR)
+        return max(self.__childrenPrefetchThreshold, adaptive)
+
+    def _updateChildrenLoadingLatency(self, latency: float):
+        """Учитывает задержку `latency` (в секундах) очередной успешной загрузки порции подэлементов."""
+        if self.__childrenLoadingLatency:
+            alpha = self.PREFETCH_SMOOTHING_FACTOR
+            self.__childrenLoadingLatency += alpha * (latency - self.__childrenLoadingLatency)
+        else:
+            self.__childrenLoadingLatency = latency
+
+    def _updateScrollVelocity(self, key: QPersistentModelIndex or None, last: int):
+        """Учитывает новую последнюю видимую строку `last` в сглаженной скорости прокрутки вниз (строк в секунду)."""
+        now = time.perf_counter()
+        previous = self.__scrollVelocities.get(key)
+        if previous is None:
+            self.__scrollVelocities[key] = (now, last, 0.0)
+            return
+        previousTime, previousLast, velocity = previous
+        elapsed = now - previousTime
+        if elapsed <= 0.0:
+            return
+        instant = max(last - previousLast, 0) / elapsed  # Прокрутка вверх к концу списка не приближает.
+        velocity += self.PREFETCH_SMOOTHING_FACTOR * (instant - velocity)
+        self.__scrollVelocities[key] = (now, last, velocity)
+
+    def _prefetchChildren(self, parent: QModelIndex, last: int):
+        """Запускает упреждающую загрузку следующей порции подэлементов элемента с модельным индексом `parent`,
+        если последняя видимая строка `last` близка к концу загруженных подэлементов."""
+        assert isinstance(self, QAbstractItemModel) and isinstance(self, VAbstractNetworkDataModelMixin)
+        info = self._getChildrenLoadingInfo(parent)
+        if info is None or Vns.LoadingPolicy.Prefetching not in info.policy:
+            return
+        if info.state != Vns.LoadingState.Idle:  # После ошибки упреждающе не загружаем, чтобы не повторять ее.
+            return
+        if self.rowCount(parent) - 1 - last > self.effectiveChildrenPrefetchThreshold(parent):
+            return
+        if self._canLoadNextChildren(parent, Vns.LoadingPolicy.Prefetching):
+            self._loadNextChildren(parent, keepAction=False)
+
+    def _handleChildrenLoadingFinishedForPrefetch(self, parent: QModelIndex):
+        """После загрузки порции подэлементов проверяет, не нужна ли упреждающе следующая порция (например, если
+        прокрутка обогнала загрузку)."""
+        rows = self.__visibleRows.get(QPersistentModelIndex(parent) if parent.isValid() else None)
+        if rows is not None:
+            self._prefetchChildren(parent, rows[1])
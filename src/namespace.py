@@ -32,9 +32,9 @@ class Vns(QObject):  # VNameSpace.
         # LoadingBinaryFile = auto()
         # """Загрузка бинарных данных файла."""
 
-        # ChangingItem = auto()
-        # """Изменение элемента."""
-        #
+        ChangingItem = auto()
+        """Изменение элемента."""
+
         # RemovingItem = auto()
         # """Удаление элемента."""
 
@@ -71,6 +71,12 @@ class Vns(QObject):  # VNameSpace.
         UnknownError = auto()
         """Неизвестная ошибка."""
 
+        CanceledError = auto()
+        """Действие отменено."""
+
+        TimeoutError = auto()
+        """Истекло время ожидания."""
+
         CustomError = 1000
         """Первый тип ошибки, который может использоваться для обозначения пользовательских ошибок."""
 
@@ -98,6 +104,15 @@ class Vns(QObject):  # VNameSpace.
         Combined = Automatically | Manually  # 3
         """Скомбинированная. То есть автоматическая или ручная одновременно."""
 
+        Prefetching = int('0b0100', 2)  # 4
+        """Упреждающая.
+
+        .. note::
+           Следующая порция подэлементов загружается заранее, как только видимые строки (о которых представление
+           сообщает методом модели `setVisibleRows()`) приближаются к концу загруженных подэлементов.
+           Обычно комбинируется с другими политиками, например, `Combined | Prefetching`.
+        """
+
     Q_FLAG(LoadingPolicy)
 
     @unique
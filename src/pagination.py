@@ -6,6 +6,7 @@
 Автор: Волков Семён.
 """
 from enum import IntEnum, unique
+from typing import List
 
 from PyQt5.QtCore import QObject, pyqtProperty, pyqtSignal, pyqtSlot, Q_ENUM
 from PyQt5.QtNetwork import QNetworkReply
@@ -133,6 +134,16 @@ class VAbstractPagination(QObject):
         """
         raise NotImplementedError()
 
+    # @vFromQmlInvokable(result=bool)
+    def canLoadRemainingData(self) -> bool:
+        """Возвращает True - если можно параллельно загрузить все оставшиеся порции данных, False - иначе.
+
+        .. note::
+            Базовая реализация всегда возвращает False.
+            Наследники класса, поддерживающие параллельную загрузку, должны переопределить этот метод.
+        """
+        return False
+
     def _resetAll(self):
         """Сбрасывает пагинацию целиком в начальное состояние.
 
@@ -141,6 +152,24 @@ class VAbstractPagination(QObject):
         """
         raise NotImplementedError()
 
+    def _saveState(self) -> dict:
+        """Возвращает состояние пагинации (мета-данные об уже загруженных данных и настройки) в виде словаря
+        для сохранения в снимке модели. Значения словаря должны быть представимы в JSON.
+
+        .. note::
+            Базовая реализация возвращает пустой словарь, то есть после восстановления из снимка пагинация
+            остается в начальном состоянии. Наследники класса могут переопределить этот метод вместе
+            с :func:`_restoreState()`.
+        """
+        return dict()
+
+    def _restoreState(self, state: dict):
+        """Восстанавливает состояние пагинации из словаря `state`, созданного методом :func:`_saveState()`.
+
+        .. note:: Базовая реализация ничего не делает.
+        """
+        pass
+
 
 class VNothingPagination(VAbstractPagination):
     """Пагинация, не позволяющая загружать никаких данных."""
@@ -289,6 +318,14 @@ class VAllTogetherPagination(VAbstractPagination):
         """Переопределяет соответствующий родительский метод."""
         self._resetLoaded()
 
+    def _saveState(self) -> dict:
+        """Переопределяет соответствующий родительский метод."""
+        return {"loaded": self.__loaded}
+
+    def _restoreState(self, state: dict):
+        """Переопределяет соответствующий родительский метод."""
+        self._setLoaded(state["loaded"])
+
 
 class VPagesAccumulationPagination(VAbstractPagination):
     """Пагинация для постраничной загрузки с накоплением страниц."""
@@ -326,6 +363,9 @@ class VPagesAccumulationPagination(VAbstractPagination):
     DEFAULT_PER_PAGE = 25
     """Количество записей на одной странице по-умолчанию."""
 
+    DEFAULT_MAX_CONCURRENT_PAGES = 4
+    """Максимальное количество одновременно загружаемых страниц по-умолчанию."""
+
     @property
     def DEFAULT_UNKNOWN_CURRENT_PAGE(self) -> int:
         """Номер текущей страницы по-умолчанию, пока не известен ее реальный номер. [Reed only]"""
@@ -373,6 +413,12 @@ class VPagesAccumulationPagination(VAbstractPagination):
     :param int requiredPage: Новый номер требуемой страницы.
     """
 
+    maxConcurrentPagesChanged = pyqtSignal(int, arguments=['maxConcurrentPages'])
+    """Сигнал об изменении максимального количества одновременно загружаемых страниц.
+
+    :param int maxConcurrentPages: Новое максимальное количество одновременно загружаемых страниц.
+    """
+
     def __init__(self, parent: QObject = None):
         super().__init__(parent)
 
@@ -387,6 +433,7 @@ class VPagesAccumulationPagination(VAbstractPagination):
         self.__pageCount = self.DEFAULT_UNKNOWN_PAGE_COUNT
         self.__pageCountHeader = self.DEFAULT_PAGE_COUNT_HEADER
         self.__perPage = self.DEFAULT_PER_PAGE
+        self.__maxConcurrentPages = self.DEFAULT_MAX_CONCURRENT_PAGES
 
     def getDirection(self) -> Direction:
         """Возвращает направление последовательности загрузки страниц."""
@@ -517,6 +564,27 @@ class VPagesAccumulationPagination(VAbstractPagination):
     requiredPage = pyqtProperty(type=int, fget=getRequiredPage, fset=setRequiredPage, freset=resetRequiredPage,
             notify=requiredPageChanged, doc="Номер требуемой страницы.")
 
+    def getMaxConcurrentPages(self) -> int:
+        """Возвращает максимальное количество одновременно загружаемых страниц
+        (при параллельной загрузке оставшихся страниц)."""
+        return self.__maxConcurrentPages
+
+    def setMaxConcurrentPages(self, maxConcurrentPages: int):
+        """Устанавливает максимальное количество одновременно загружаемых страниц
+        (при параллельной загрузке оставшихся страниц)."""
+        assert maxConcurrentPages > 0
+        if maxConcurrentPages != self.__maxConcurrentPages:
+            self.__maxConcurrentPages = maxConcurrentPages
+            self.maxConcurrentPagesChanged.emit(maxConcurrentPages)
+
+    def resetMaxConcurrentPages(self):
+        """Сбрасывает максимальное количество одновременно загружаемых страниц на значение по-умолчанию."""
+        self.setMaxConcurrentPages(self.DEFAULT_MAX_CONCURRENT_PAGES)
+
+    maxConcurrentPages = pyqtProperty(type=int, fget=getMaxConcurrentPages, fset=setMaxConcurrentPages,
+            freset=resetMaxConcurrentPages, notify=maxConcurrentPagesChanged,
+            doc="Максимальное количество одновременно загружаемых страниц.")
+
     @vFromQmlInvokable(result=int)
     def getFirstPage(self) -> int:
         """Возвращает номер первой страницы."""
@@ -606,8 +674,39 @@ class VPagesAccumulationPagination(VAbstractPagination):
         """Переопределяет соответствующий родительский метод."""
         self._resetCurrentPage()
 
+    @vFromQmlInvokable(result=bool)
+    def canLoadRemainingData(self) -> bool:
+        """Переопределяет соответствующий родительский метод.
+
+        Возвращает True - если уже известно количество страниц (т.е. загружена хотя бы одна страница)
+        и еще остались незагруженные страницы, False - иначе.
+        """
+        return self.hasLoadedData() and self.canLoadNextData()
+
+    def _remainingPages(self) -> List[int]:
+        """Возвращает список номеров оставшихся незагруженных страниц в порядке их вставки.
+
+        .. note:: Порядок страниц зависит от направления последовательности загрузки.
+        """
+        assert self.canLoadRemainingData()
+        if self.__direction == self.Direction.FromFirstToLast:
+            return list(range(self.__currentPage + 1, self.getLastPage() + 1))
+        else:
+            assert self.__direction == self.Direction.FromLastToFirst
+            return list(range(self.__currentPage - 1, self.DEFAULT_FIRST_PAGE - 1, -1))
+
     def _updateAfterLoadingData(self, action: VNetworkAction) -> bool:
         """Переопределяет соответствующий родительский метод."""
+        return self._updateAfterLoadingPage(action, self.getRequiredPage())
+
+    def _updateAfterLoadingPage(self, action: VNetworkAction, page: int) -> bool:
+        """Обновляет пагинацию после загрузки страницы с номером `page`, используя данные из действия `action`.
+        Возвращает True - если пагинация была обновлена успешно, False - иначе.
+
+        .. note::
+            При параллельной загрузке страниц метод вызывается для страниц в порядке их вставки, поэтому загруженная
+            страница всегда становится текущей.
+        """
         assert action.replyErrorType() == QNetworkReply.NoError
         assert action.getType() == Vns.ActionType.LoadingChildren
 
@@ -625,7 +724,7 @@ class VPagesAccumulationPagination(VAbstractPagination):
         # assert ok  # Нет такого заголовка или в нем содержится не число!
         if not ok:
             return False
-        assert currentPage == self.getRequiredPage()
+        assert currentPage == page
         assert self.DEFAULT_FIRST_PAGE <= currentPage <= self.getLastPage()
         self._setCurrentPage(currentPage)
         return True
@@ -639,6 +738,30 @@ class VPagesAccumulationPagination(VAbstractPagination):
         self.resetCurrentPageHeader()
         self.resetPageCountHeader()
 
+    def _saveState(self) -> dict:
+        """Переопределяет соответствующий родительский метод."""
+        return {
+            "direction": int(self.__direction),
+            "currentPage": self.__currentPage,
+            "pageCount": self.__pageCount,
+            "perPage": self.__perPage,
+            "requiredPage": self.__requiredPage,
+            "currentPageHeader": self.__currentPageHeader,
+            "pageCountHeader": self.__pageCountHeader,
+            "maxConcurrentPages": self.__maxConcurrentPages,
+        }
+
+    def _restoreState(self, state: dict):
+        """Переопределяет соответствующий родительский метод."""
+        self.setDirection(self.Direction(state["direction"]))
+        self.setCurrentPageHeader(state["currentPageHeader"])
+        self.setPageCountHeader(state["pageCountHeader"])
+        self.setPerPage(state["perPage"])
+        self.setMaxConcurrentPages(state["maxConcurrentPages"])
+        self._setPageCount(state["pageCount"])
+        self._setCurrentPage(state["currentPage"])
+        self.setRequiredPage(state["requiredPage"])
+
 
 class VPagesReplacementPagination(VPagesAccumulationPagination):
     """Пагинация для постраничной загрузки с заменой предыдущей (ранее загруженной) страницы на новую."""
@@ -674,6 +797,14 @@ class VPagesReplacementPagination(VPagesAccumulationPagination):
         """Переопределяет соответствующий родительский метод."""
         return True
 
+    @vFromQmlInvokable(result=bool)
+    def canLoadRemainingData(self) -> bool:
+        """Переопределяет соответствующий родительский метод.
+
+        Страницы заменяют друг друга, поэтому загружать все оставшиеся страницы нельзя.
+        """
+        return False
+
     # @vFromQmlInvokable(result=bool)
     # def canLoadNextData(self) -> bool:
     #     """Переопределяет соответствующий родительский метод."""
@@ -0,0 +1,174 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import threading
+
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Hashable, Mapping, Tuple
+
+
+def _freeze(payload: Any) -> Any:
+    """Возвращает неизменяемую копию разобранных данных `payload`.
+
+    Словари заменяются на :class:`MappingProxyType` над своими копиями, списки - на кортежи.
+    Заморозка поверхностная: вложенные значения словарей не копируются.
+    """
+    if isinstance(payload, dict):
+        return MappingProxyType(dict(payload))
+    if isinstance(payload, list):
+        return tuple(MappingProxyType(dict(value)) if isinstance(value, dict) else value for value in payload)
+    return payload
+
+
+def _thaw(payload: Any) -> Any:
+    """Возвращает изменяемую (поверхностную) копию замороженных данных `payload`,
+    созданных функцией :func:`_freeze()`."""
+    if isinstance(payload, Mapping):
+        return dict(payload)
+    if isinstance(payload, tuple):
+        return [dict(value) if isinstance(value, Mapping) else value for value in payload]
+    return payload
+
+
+class VPayloadCache:
+    """Ограниченный по размеру LRU-кэш разобранных (декодированных) данных сетевых ответов.
+
+    Кэш может разделяться между несколькими моделями, загружающими данные с одних и тех же адресов.
+    Ключом служат адрес ответа и его валидаторы (заголовки `ETag` и `Last-Modified`), а также дополнительная часть
+    ключа, например, функция преобразования данных. Ответы без валидаторов не кэшируются, так как иначе нельзя
+    гарантировать, что по тому же адресу пришли те же самые данные.
+
+    В кэше хранятся неизменяемые структуры: списки словарей хранятся как кортежи :class:`MappingProxyType`,
+    а словари - как :class:`MappingProxyType`. Метод :func:`get()` возвращает именно их, а метод :func:`getCopy()` -
+    изменяемые поверхностные копии, которые можно отдавать модели.
+
+    .. warning::
+        Заморозка поверхностная: вложенные в словари значения разделяются между всеми получателями
+        и не должны изменяться.
+
+    Пример:
+
+    .. sourcecode::
+
+        model.setPayloadCache(VPayloadCache.globalInstance())
+        ...
+        print(VPayloadCache.globalInstance().hitRate())
+    """
+
+    DEFAULT_MAX_SIZE = 256
+    """Максимальное количество хранимых записей по умолчанию."""
+
+    __globalInstance = None
+
+    @staticmethod
+    def globalInstance() -> 'VPayloadCache':
+        """Возвращает общий для всего приложения экземпляр кэша (создает его при первом вызове)."""
+        if VPayloadCache.__globalInstance is None:
+            VPayloadCache.__globalInstance = VPayloadCache()
+        return VPayloadCache.__globalInstance
+
+    @staticmethod
+    def makeKey(url: str, entityTag: str, lastModified: str, *extra: Hashable) -> Tuple or None:
+        """Возвращает ключ записи для адреса `url` с валидаторами `entityTag` и `lastModified` и дополнительной
+        частью ключа `extra` или None, если ни одного валидатора нет."""
+        if not entityTag and not lastModified:
+            return None
+        return (url, entityTag, lastModified) + extra
+
+    def __init__(self, maxSize: int = DEFAULT_MAX_SIZE):
+        """
+        :param maxSize: Максимальное количество хранимых записей. Давно не использовавшиеся записи вытесняются.
+        """
+        super().__init__()
+
+        assert maxSize > 0
+        self.__maxSize = maxSize
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def maxSize(self) -> int:
+        """Возвращает максимальное количество хранимых записей."""
+        return self.__maxSize
+
+    def setMaxSize(self, maxSize: int):
+        """Устанавливает максимальное количество хранимых записей и вытесняет лишние записи."""
+        assert maxSize > 0
+        with self.__lock:
+            self.__maxSize = maxSize
+            while len(self.__entries) > self.__maxSize:
+                self.__entries.popitem(last=False)
+
+    def size(self) -> int:
+        """Возвращает количество хранимых записей."""
+        return len(self.__entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Возвращает неизменяемые разобранные данные по ключу `key` или None, если их нет в кэше."""
+        with self.__lock:
+            payload = self.__entries.get(key)
+            if payload is None:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return payload
+
+    def getCopy(self, key: Hashable) -> Any:
+        """Возвращает изменяемую поверхностную копию разобранных данных по ключу `key` или None,
+        если их нет в кэше."""
+        payload = self.get(key)
+        return None if payload is None else _thaw(payload)
+
+    def put(self, key: Hashable, payload: Any) -> Any:
+        """Сохраняет неизменяемую копию разобранных данных `payload` по ключу `key` и возвращает ее.
+
+        Сам объект `payload` в кэше не сохраняется, поэтому вызывающая сторона может дальше его изменять.
+        """
+        frozen = _freeze(payload)
+        with self.__lock:
+            self.__entries[key] = frozen
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__maxSize:
+                self.__entries.popitem(last=False)
+        return frozen
+
+    def remove(self, key: Hashable):
+        """Удаляет запись с ключом `key` (если она есть)."""
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        """Удаляет все записи (статистика не сбрасывается)."""
+        with self.__lock:
+            self.__entries.clear()
+
+    def hits(self) -> int:
+        """Возвращает количество попаданий в кэш."""
+        return self.__hits
+
+    def misses(self) -> int:
+        """Возвращает количество промахов кэша."""
+        return self.__misses
+
+    def hitRate(self) -> float:
+        """Возвращает долю попаданий в кэш среди всех обращений (0.0, если обращений не было)."""
+        total = self.__hits + self.__misses
+        return self.__hits / total if total else 0.0
+
+    def resetStatistics(self):
+        """Сбрасывает статистику попаданий и промахов."""
+        with self.__lock:
+            self.__hits = 0
+            self.__misses = 0
+
+    def statistics(self) -> dict:
+        """Возвращает словарь со статистикой кэша."""
+        return {'size': self.size(), 'maxSize': self.__maxSize, 'hits': self.__hits, 'misses': self.__misses,
+                'hitRate': self.hitRate()}
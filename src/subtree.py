@@ -0,0 +1,278 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+from collections import deque
+
+from PyQt5.QtCore import (QAbstractItemModel, QCoreApplication, QModelIndex, QPersistentModelIndex, QObject,
+                          QTimer, pyqtSignal, pyqtSlot)
+
+from .action import VAbstractAsynchronousAction, VAsynchronousAction, VNetworkAction
+from .namespace import Vns
+
+
+# TODO: Пока так помечаем то, что должно быть помечено через макрос Q_INVOKABLE.
+vFromQmlInvokable = pyqtSlot
+
+
+class VSubtreeLoadingAction(VAsynchronousAction):
+    """Асинхронное действие загрузки поддерева элемента модели.
+
+    Обходит поддерево в ширину: загружает все порции подэлементов очередного элемента (с учетом его политики
+    загрузки и пагинации), а затем ставит в очередь обхода его подэлементы. Одновременно загружаются подэлементы
+    не более чем `maxConcurrency` элементов, поэтому время загрузки широкого поддерева ограничено параллельностью,
+    а не произведением глубины на задержку сети.
+
+    Элементы, загрузка подэлементов которых завершилась ошибкой, глубже не обходятся, а обход остальных элементов
+    продолжается. Действие завершается с ошибкой первой из неудачных загрузок.
+
+    Действие создается методом :func:`VAbstractNetworkDataModelMixin.loadSubtree()`.
+    """
+
+    progressChanged = pyqtSignal(int, int, arguments=['loadedCount', 'totalCount'])
+    """Сигнал об изменении прогресса загрузки поддерева.
+
+    :param int loadedCount: Количество обойденных элементов.
+    :param int totalCount: Количество обнаруженных на данный момент элементов, которые нужно обойти.
+    """
+
+    def __init__(self, model: QAbstractItemModel, index: QModelIndex = QModelIndex(), maxDepth: int = -1,
+            maxConcurrency: int = 4, parent: QObject = None):
+        """
+        :param model: Модель, в которой загружается поддерево.
+        :param index: Модельный индекс корня поддерева.
+        :param maxDepth: Количество загружаемых уровней поддерева (-1 - без ограничения).
+        :param maxConcurrency: Максимальное количество элементов, подэлементы которых загружаются одновременно.
+        """
+        super().__init__(type=Vns.ActionType.LoadingChildren, parent=parent)
+        assert maxDepth == -1 or maxDepth > 0
+        assert maxConcurrency > 0
+
+        self.__model = model
+        self.__persistentIndex = QPersistentModelIndex(index)
+        self.__isModelRoot = not index.isValid()  # Постоянный индекс удаленного элемента тоже недействителен.
+        self.__maxDepth = maxDepth
+        self.__maxConcurrency = maxConcurrency
+
+        # Элементы в очереди обхода и в ожидании хранятся в виде ключей: постоянный индекс (None - для корня модели).
+        self.__queue = deque()  # Пары (ключ элемента, глубина), ожидающие обхода.
+        self.__running = dict()  # Действие загрузки порции подэлементов -> (ключ элемента, глубина).
+        self.__waiting = dict()  # Ключ элемента, подэлементы которого загружаются не нами -> глубина.
+        self.__loadedCount = 0
+        self.__totalCount = 0
+        self.__failedCount = 0
+        self.__firstError = None  # Тройка (тип, общеописательный текст, подробный текст) первой ошибки загрузки.
+
+        # Подключаемся сразу, чтобы действие можно было отменить (и отключить) еще до начала обхода.
+        model.childrenLoadingFinished.connect(self.__handleChildrenLoadingFinished)
+        model.modelAboutToBeReset.connect(self.__handleModelAboutToBeReset)
+
+    @vFromQmlInvokable(result=QAbstractItemModel)
+    def getModel(self) -> QAbstractItemModel:
+        """Возвращает модель, в которой загружается поддерево."""
+        return self.__model
+
+    @vFromQmlInvokable(result=QModelIndex)
+    def getIndex(self) -> QModelIndex:
+        """Возвращает модельный индекс корня поддерева."""
+        return QModelIndex(self.__persistentIndex)
+
+    @vFromQmlInvokable(result=int)
+    def maxDepth(self) -> int:
+        """Возвращает количество загружаемых уровней поддерева (-1 - без ограничения)."""
+        return self.__maxDepth
+
+    @vFromQmlInvokable(result=int)
+    def maxConcurrency(self) -> int:
+        """Возвращает максимальное количество элементов, подэлементы которых загружаются одновременно."""
+        return self.__maxConcurrency
+
+    @vFromQmlInvokable(result=int)
+    def loadedCount(self) -> int:
+        """Возвращает количество обойденных элементов."""
+        return self.__loadedCount
+
+    @vFromQmlInvokable(result=int)
+    def totalCount(self) -> int:
+        """Возвращает количество обнаруженных на данный момент элементов, которые нужно обойти."""
+        return self.__totalCount
+
+    @vFromQmlInvokable(result=int)
+    def failedCount(self) -> int:
+        """Возвращает количество элементов, загрузка подэлементов которых завершилась ошибкой."""
+        return self.__failedCount
+
+    @vFromQmlInvokable()
+    def cancel(self):
+        """Отменяет загрузку поддерева: новые загрузки больше не запускаются, выполняющиеся и ожидающие в очереди
+        загрузки отменяются (смотри :func:`VAbstractNetworkDataModelMixin._cancelChildrenLoading()`), а действие
+        завершается с ошибкой `Vns.ErrorType.CanceledError`.
+
+        Уже загруженные подэлементы остаются в модели, а отмененные загрузки не приводят к ошибкам модели.
+        """
+        if not self.isValid() or not self.isRunning():
+            return
+        running, self.__running = self.__running, dict()
+        self.__queue.clear()
+        self.__waiting.clear()
+        for action in running:
+            self.__model._cancelChildrenLoading(action)
+        self.setError(Vns.ErrorType.CanceledError,
+                QCoreApplication.translate("VSubtreeLoadingAction", "Загрузка поддерева отменена."))
+        self.__disconnectFromModel()
+        self.setFinished()
+
+    def _start(self):
+        """Начинает обход поддерева.
+
+        .. note::
+            Вызывается моделью отложенно, чтобы вызывающая сторона успела подключиться к сигналам действия,
+            даже если все поддерево уже загружено.
+        """
+        if not self.isValid() or not self.isRunning():
+            return
+        if not self.__isModelRoot and not self.__persistentIndex.isValid():
+            self.__invalidate()
+            return
+        self.__enqueue(None if self.__isModelRoot else self.__persistentIndex, 0)
+        self.__schedule()
+
+    # ==== traversal ====
+
+    @staticmethod
+    def __indexOf(key: QPersistentModelIndex or None) -> QModelIndex or None:
+        """Возвращает модельный индекс элемента по его ключу или None, если элемент был удален."""
+        if key is None:
+            return QModelIndex()
+        if not key.isValid():
+            return None
+        return QModelIndex(key)
+
+    def __enqueue(self, key: QPersistentModelIndex or None, depth: int):
+        """Ставит элемент в очередь обхода."""
+        self.__queue.append((key, depth))
+        self.__totalCount += 1
+        self.progressChanged.emit(self.__loadedCount, self.__totalCount)
+
+    def __markVisited(self):
+        """Учитывает очередной обойденный элемент."""
+        self.__loadedCount += 1
+        self.progressChanged.emit(self.__loadedCount, self.__totalCount)
+
+    def __schedule(self):
+        """Обходит элементы из очереди, пока не достигнут предел одновременных загрузок,
+        и завершает действие, если обходить больше нечего."""
+        if not self.isValid() or not self.isRunning():
+            return
+        if not self.__isModelRoot and not self.__persistentIndex.isValid():
+            # Корень поддерева был удален.
+            self.__invalidate()
+            return
+        while self.__queue and len(self.__running) < self.__maxConcurrency:
+            key, depth = self.__queue.popleft()
+            self.__visit(key, depth)
+        if not self.__queue and not self.__running and not self.__waiting:
+            self.__finish()
+
+    def __visit(self, key: QPersistentModelIndex or None, depth: int):
+        """Загружает очередную порцию подэлементов элемента или, если все порции уже загружены,
+        ставит его подэлементы в очередь обхода."""
+        index = self.__indexOf(key)
+        if index is None:
+            self.__markVisited()
+            return
+        model = self.__model
+        if model.childrenLoadingIsInLoadingState(index):
+            # Подэлементы загружаются кем-то другим - дождемся окончания их загрузки.
+            self.__waiting[key] = depth
+            return
+        if model._canLoadNextChildren(index, Vns.LoadingPolicy.Manually) \
+                or model._canLoadNextChildren(index, Vns.LoadingPolicy.Automatically):
+            if model.canLoadRemainingChildren(index):
+                action = model.loadRemainingChildren(index)
+            else:
+                action = model.loadNextChildren(index)
+            self.__running[action] = (key, depth)
+            action.finished.connect(lambda: self.__handleLoadFinished(action))
+            action.invalidated.connect(lambda: self.__handleLoadInvalidated(action))
+            return
+
+        # Все порции подэлементов уже загружены (или их загрузка не поддерживается/запрещена политикой).
+        self.__markVisited()
+        if self.__maxDepth != -1 and depth + 1 >= self.__maxDepth:
+            return
+        for row in range(model.rowCount(index)):
+            child = model.index(row, 0, index)
+            if model.childrenAreLoadedSeparately(child) or model.rowCount(child) > 0:
+                self.__enqueue(QPersistentModelIndex(child), depth + 1)
+
+    def __handleLoadFinished(self, action: VAbstractAsynchronousAction):
+        """Обрабатывает завершение загрузки порции подэлементов."""
+        entry = self.__running.pop(action, None)
+        if entry is None:  # Загрузка поддерева была отменена.
+            return
+        key, depth = entry
+        if action.isError():
+            self.__failedCount += 1
+            if self.__firstError is None:
+                self.__firstError = (action.errorType(), action.errorInformativeText(), action.errorDetailedText())
+            self.__markVisited()
+        else:
+            # Догружаем оставшиеся порции подэлементов элемента прежде других элементов.
+            self.__queue.appendleft((key, depth))
+        self.__schedule()
+
+    def __handleLoadInvalidated(self, action: VAbstractAsynchronousAction):
+        """Обрабатывает инвалидацию загрузки порции подэлементов (элемент был удален)."""
+        if self.__running.pop(action, None) is None:
+            return
+        self.__markVisited()
+        # Откладываем обход, так как загрузка инвалидируется и при сбросе модели, о котором мы узнаем позже.
+        QTimer.singleShot(0, self.__schedule)
+
+    def __handleChildrenLoadingFinished(self, parent: QModelIndex):
+        """Продолжает обход элемента, подэлементы которого загружал кто-то другой."""
+        if not self.__waiting:
+            return
+        key = QPersistentModelIndex(parent) if parent.isValid() else None
+        depth = self.__waiting.pop(key, None)
+        if depth is not None:
+            self.__queue.append((key, depth))
+        for removed in [key for key in self.__waiting if key is not None and not key.isValid()]:
+            del self.__waiting[removed]
+            self.__markVisited()
+        self.__schedule()
+
+    def __handleModelAboutToBeReset(self):
+        """Инвалидирует действие при сбросе модели."""
+        self.__running.clear()
+        self.__invalidate()
+
+    # ==== completion ====
+
+    def __disconnectFromModel(self):
+        """Отключается от сигналов модели."""
+        model = self.__model
+        model.childrenLoadingFinished.disconnect(self.__handleChildrenLoadingFinished)
+        model.modelAboutToBeReset.disconnect(self.__handleModelAboutToBeReset)
+
+    def __finish(self):
+        """Завершает действие (с ошибкой первой неудачной загрузки, если такая была)."""
+        if self.__firstError is not None:
+            self.setError(*self.__firstError)
+        self.__disconnectFromModel()
+        self.setFinished()
+
+    def __invalidate(self):
+        """Делает действие недействительным (корень поддерева удален или модель сброшена)."""
+        self.__queue.clear()
+        self.__waiting.clear()
+        for action in tuple(self.__running):
+            if isinstance(action, VNetworkAction) and action.isValid() and action.isRunning():
+                action.replyAbort()
+        self.__running.clear()
+        self.__disconnectFromModel()
+        self.setInvalidated()
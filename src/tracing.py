@@ -0,0 +1,174 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import itertools
+import json
+import os
+import threading
+import time
+
+from typing import Any, Dict, List
+
+
+class _VTraceSpan:
+    """Промежуток (span) трассировки, записываемый как законченное событие (`"ph": "X"`).
+
+    Используется как контекстный менеджер, возвращаемый методом :func:`VActionTracer.span()`.
+    """
+
+    __slots__ = ('__tracer', '__name', '__category', '__args', '__start')
+
+    def __init__(self, tracer: 'VActionTracer', name: str, category: str, args: Dict[str, Any]):
+        self.__tracer = tracer
+        self.__name = name
+        self.__category = category
+        self.__args = args
+        self.__start = 0.0
+
+    def isEnabled(self) -> bool:
+        """Возвращает True: промежуток записывается (вычислять аргументы для :func:`setArg()` имеет смысл)."""
+        return True
+
+    def setArg(self, key: str, value: Any):
+        """Устанавливает аргумент промежутка `key` в значение `value`."""
+        self.__args[key] = value
+
+    def __enter__(self) -> '_VTraceSpan':
+        self.__start = self.__tracer.timestamp()
+        return self
+
+    def __exit__(self, excType, excValue, excTraceback) -> bool:
+        end = self.__tracer.timestamp()
+        if excType is not None:
+            self.__args['exception'] = excType.__name__
+        self.__tracer._addEvent({
+            'name': self.__name, 'cat': self.__category, 'ph': 'X', 'ts': self.__start, 'dur': end - self.__start,
+            'pid': os.getpid(), 'tid': threading.get_ident(), 'args': self.__args})
+        return False
+
+
+class _VNullTraceSpan:
+    """Пустой промежуток трассировки, используемый, когда трассировка отключена."""
+
+    __slots__ = ()
+
+    def isEnabled(self) -> bool:
+        """Возвращает False: промежуток ничего не записывает, поэтому аргументы для :func:`setArg()` можно
+        не вычислять."""
+        return False
+
+    def setArg(self, key: str, value: Any):
+        """Ничего не делает."""
+        pass
+
+    def __enter__(self) -> '_VNullTraceSpan':
+        return self
+
+    def __exit__(self, excType, excValue, excTraceback) -> bool:
+        return False
+
+
+NULL_TRACE_SPAN = _VNullTraceSpan()
+"""Общий экземпляр пустого промежутка трассировки."""
+
+
+class VActionTracer:
+    """Трассировщик жизненного цикла действий и этапов загрузки данных в моделях.
+
+    Записывает события в формате Chrome trace event format, который открывается в `chrome://tracing` и
+    в Perfetto UI (https://ui.perfetto.dev).
+
+    Трассировка включается явно: экземпляр трассировщика нужно установить в модель с помощью метода
+    :func:`VAbstractNetworkDataModelMixin.setTracer()`. После этого модель будет передавать его во все
+    свои действия загрузки.
+
+    Пример:
+
+    .. sourcecode::
+
+        tracer = VActionTracer()
+        model.setTracer(tracer)
+        ...
+        tracer.saveChromeTrace("session.trace.json")
+    """
+
+    DEFAULT_MAX_EVENTS = 1000000
+    """Максимальное количество хранимых событий по умолчанию."""
+
+    def __init__(self, maxEvents: int = DEFAULT_MAX_EVENTS):
+        """
+        :param maxEvents: Максимальное количество хранимых событий. События сверх этого количества отбрасываются.
+        """
+        super().__init__()
+
+        self.__maxEvents = maxEvents
+        self.__events = []
+        self.__droppedEvents = 0
+        self.__origin = time.perf_counter()
+        self.__asyncIds = itertools.count(1)
+
+    def timestamp(self) -> float:
+        """Возвращает текущую отметку времени трассировки в микросекундах."""
+        return (time.perf_counter() - self.__origin) * 1000000.0
+
+    def _addEvent(self, event: Dict[str, Any]):
+        """Добавляет событие `event` в трассировку."""
+        if len(self.__events) >= self.__maxEvents:
+            self.__droppedEvents += 1
+            return
+        self.__events.append(event)
+
+    def span(self, name: str, category: str = "model", **args) -> _VTraceSpan:
+        """Возвращает контекстный менеджер, записывающий промежуток с названием `name` и категорией `category`.
+
+        Именованные аргументы `args` сохраняются в аргументах события.
+        """
+        return _VTraceSpan(self, name, category, args)
+
+    def beginAsync(self, name: str, category: str = "action", **args) -> int:
+        """Начинает асинхронный промежуток с названием `name` и категорией `category`
+        и возвращает его идентификатор."""
+        asyncId = next(self.__asyncIds)
+        self._addEvent({
+            'name': name, 'cat': category, 'ph': 'b', 'id': asyncId, 'ts': self.timestamp(),
+            'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args})
+        return asyncId
+
+    def endAsync(self, asyncId: int, name: str, category: str = "action", **args):
+        """Завершает асинхронный промежуток с идентификатором `asyncId`, названием `name` и категорией `category`."""
+        self._addEvent({
+            'name': name, 'cat': category, 'ph': 'e', 'id': asyncId, 'ts': self.timestamp(),
+            'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args})
+
+    def instant(self, name: str, category: str = "model", **args):
+        """Записывает мгновенное событие с названием `name` и категорией `category`."""
+        self._addEvent({
+            'name': name, 'cat': category, 'ph': 'i', 's': 't', 'ts': self.timestamp(),
+            'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args})
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Возвращает список записанных событий."""
+        return list(self.__events)
+
+    def droppedEvents(self) -> int:
+        """Возвращает количество отброшенных из-за переполнения событий."""
+        return self.__droppedEvents
+
+    def clear(self):
+        """Удаляет все записанные события."""
+        self.__events = []
+        self.__droppedEvents = 0
+
+    def toChromeTrace(self) -> Dict[str, Any]:
+        """Возвращает трассировку в виде словаря в формате Chrome trace event format."""
+        return {'traceEvents': self.events(), 'displayTimeUnit': 'ms',
+                'otherData': {'droppedEvents': self.__droppedEvents}}
+
+    def saveChromeTrace(self, path: str):
+        """Сохраняет трассировку в файл `path` в формате Chrome trace event format."""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.toChromeTrace(), file, ensure_ascii=False, default=str)
@@ -0,0 +1,24 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import pytest
+
+from PyQt5.QtCore import QCoreApplication
+
+from support import Server
+
+
+@pytest.fixture(scope="session")
+def app() -> QCoreApplication:
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def server(app) -> Server:
+    server = Server()
+    yield server
+    server.shutdown()
@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+
+Вспомогательные средства тестов: локальный http-сервер, ожидание в цикле событий Qt и простые модели.
+"""
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop, QUrl
+from PyQt5.QtGui import QStandardItem
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+# Библиотека - это пакет в корне репозитория, поэтому импортируем ее по имени каталога репозитория.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.dirname(ROOT) not in sys.path:
+    sys.path.insert(0, os.path.dirname(ROOT))
+VNetworkData = importlib.import_module(os.path.basename(ROOT))
+Vns = VNetworkData.Vns
+
+
+class Server:
+    """Локальный http-сервер с тестовыми данными.
+
+    Адреса:
+      - `/list?parent=<id>&page=<номер>` - страница подэлементов элемента (заголовки пагинации и ETag);
+      - `/details?id=<id>` - подробные данные элемента;
+      - `/error` - всегда ошибка 500;
+      - `/patch` - принимает изменения (PATCH) и запоминает их тела.
+
+    Параметр `delay` (в секундах) задерживает ответ, а параметр `charset` задает кодировку тела подробных данных
+    (по умолчанию - utf-8).
+    """
+
+    def __init__(self):
+        self.pageCount = 5
+        self.perPage = 3
+        self.delay = 0.0
+        self.hits = []  # Пути всех запросов в порядке их поступления.
+        self.patches = []  # Разобранные тела PATCH-запросов.
+        self.failPatches = False
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                server.hits.append(self.path)
+                delay = float(query.get("delay", [server.delay])[0])
+                charset = query.get("charset", ["utf-8"])[0]
+                if delay:
+                    time.sleep(delay)
+                status, headers, body = 200, {}, b""
+                if url.path == "/list":
+                    page = int(query.get("page", ["1"])[0])
+                    parent = query.get("parent", ["root"])[0]
+                    rows = [{"id": "%s-%d-%d" % (parent, page, i), "name": "n%d" % i}
+                            for i in range(server.perPage)]
+                    body = json.dumps(rows).encode()
+                    headers["X-Pagination-Current-Page"] = str(page)
+                    headers["X-Pagination-Page-Count"] = str(server.pageCount)
+                    headers["ETag"] = '"%s-%d"' % (parent, page)
+                elif url.path == "/details":
+                    body = json.dumps({"details": query.get("id", ["?"])[0]}, ensure_ascii=False).encode(charset)
+                elif url.path == "/patch" and not server.failPatches:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    server.patches.append(json.loads(self.rfile.read(length) or b"null"))
+                    body = b"{}"
+                else:
+                    status, body = 500, b"error"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=%s" % charset)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_PATCH = do_GET
+
+        self.__httpServer = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.__httpServer.serve_forever, daemon=True).start()
+        self.baseUrl = "http://127.0.0.1:%d" % self.__httpServer.server_address[1]
+        self.manager = QNetworkAccessManager()
+
+    def get(self, path: str) -> QNetworkReply:
+        return self.manager.get(QNetworkRequest(QUrl(self.baseUrl + path)))
+
+    def patch(self, path: str, body) -> QNetworkReply:
+        request = QNetworkRequest(QUrl(self.baseUrl + path))
+        return self.manager.sendCustomRequest(request, b"PATCH", json.dumps(body).encode())
+
+    def shutdown(self):
+        self.__httpServer.shutdown()
+        self.__httpServer.server_close()
+
+
+def spin(timeout: int = 2000, until=None) -> bool:
+    """Обрабатывает события Qt, пока `until()` не вернет True или не истечет `timeout` миллисекунд.
+    Без `until` просто обрабатывает события `timeout` миллисекунд."""
+    app = QCoreApplication.instance()
+    deadline = time.monotonic() + timeout / 1000
+    while time.monotonic() < deadline:
+        app.processEvents(QEventLoop.AllEvents, 10)
+        if until is not None and until():
+            return True
+        time.sleep(0.001)
+    return until() if until is not None else True
+
+
+def waitFor(action, timeout: int = 3000):
+    """Ждет завершения (или инвалидации) действия `action` и возвращает его."""
+    assert spin(timeout, lambda: not action.isValid() or action.isFinished())
+    return action
+
+
+class ListModel(VNetworkData.VAbstractNetworkDataModel):
+    """Списочная модель, загружающая подэлементы со страниц `/list`.
+
+    Если указан класс пагинации `pagination`, то подэлементы корня загружаются с этой пагинацией и политикой
+    `Vns.LoadingPolicy.Combined`, иначе - как в модели по умолчанию.
+    """
+
+    def __init__(self, server: Server, parent=None, pagination: type = None):
+        self.rootPagination = pagination  # Нужна уже в конструкторе родительского класса.
+        super().__init__(parent)
+        self.server = server
+
+    def _createRootChildrenLoadingInfo(self):
+        if self.rootPagination is None:
+            return super()._createRootChildrenLoadingInfo()
+        return VNetworkData.VChildrenLoadingInfo(Vns.LoadingPolicy.Combined, self.rootPagination())
+
+    def itemId(self, index) -> str:
+        return self.data(index, Vns.ItemDataRole.ItemDict)["id"] if index.isValid() else "root"
+
+    def _requestToLoadingChildren(self, parent):
+        pagination = self.childrenPagination(parent)
+        page = pagination.getRequiredPage() if hasattr(pagination, "getRequiredPage") else 1
+        return self.server.get("/list?page=%d&parent=%s" % (page, self.itemId(parent)))
+
+
+class TreeModel(ListModel):
+    """Древовидная модель: подэлементы каждого элемента загружаются отдельно, как и его подробные данные."""
+
+    def _createItem(self, rawDict: dict, columns: int = None) -> QStandardItem:
+        item = super()._createItem(rawDict, columns)
+        item.setData(VNetworkData.VChildrenLoadingInfo(Vns.LoadingPolicy.Combined,
+                VNetworkData.VAllTogetherPagination()), Vns.ItemDataRole._ChildrenLoadingInfo)
+        item.setData(VNetworkData.src.mixin.VDetailsLoadingInfo(), Vns.ItemDataRole._DetailsLoadingInfo)
+        return item
+
+    def _requestToLoadingDetails(self, index):
+        return self.server.get("/details?id=%s" % self.itemId(index))
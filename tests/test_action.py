@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import asyncio
+
+import pytest
+
+from support import VNetworkData, Vns, spin, waitFor
+
+
+def fail(action, text: str = "error"):
+    action.setError(Vns.ErrorType.UnknownError, text, "")
+    action.setFinished()
+
+
+def test_all_finishes_after_all_actions(app):
+    actions = [VNetworkData.VAsynchronousAction() for _ in range(3)]
+    result = VNetworkData.VAbstractAsynchronousAction.all(actions)
+    for action in actions[:-1]:
+        action.setFinished()
+    spin(50)
+    assert not result.isFinished()
+    actions[-1].setFinished()
+    waitFor(result)
+    assert result.isFinished() and not result.isError()
+
+
+def test_all_finishes_once_when_several_actions_fail(app):
+    first, second = VNetworkData.VAsynchronousAction(), VNetworkData.VAsynchronousAction()
+    result = VNetworkData.VAbstractAsynchronousAction.all([first, second])
+    finished = []
+    result.finished.connect(lambda: finished.append(True))
+    fail(first, "first")
+    fail(second, "second")
+    spin(100)
+    assert finished == [True]
+    assert result.isError() and result.errorInformativeText() == "first"
+
+
+def test_asyncio_future_uses_the_running_loop(app):
+    action = VNetworkData.VAsynchronousAction()
+    with pytest.raises(RuntimeError):
+        action.toAsyncioFuture()  # Вне работающего цикла событий нет цикла по умолчанию.
+
+    async def wait():
+        future = action.toAsyncioFuture()
+        action.setFinished()
+        return await future
+
+    assert asyncio.run(wait()) is action
+
+
+def test_asyncio_future_outliving_its_loop_is_ignored(app):
+    action = VNetworkData.VAsynchronousAction()
+    receivers = action.receivers(action.finished)
+    futures = []
+
+    async def wait():
+        futures.append(action.toAsyncioFuture())
+        await asyncio.wait_for(futures[0], 0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(wait())
+    assert futures[0].cancelled()
+    assert action.receivers(action.finished) == receivers  # Отмененный будущий результат отключает обработчики.
+    # Цикл событий уже закрыт: завершение действия не должно обращаться к нему.
+    action.setFinished()
+    spin(50)
+
+    invalidated = VNetworkData.VAsynchronousAction()
+    loop = asyncio.new_event_loop()
+    future = invalidated.toAsyncioFuture(loop)
+    loop.close()
+    invalidated.setInvalidated()
+    spin(50)
+    assert not future.done()
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import pytest
+
+from PyQt5.QtCore import QModelIndex
+
+from support import TreeModel, VNetworkData, Vns, spin, waitFor
+
+LOADING = Vns.ActionType.LoadingChildren
+
+
+class RegistryModel(TreeModel):
+    failingIds = ()
+
+    def _requestToLoadingChildren(self, parent):
+        if self.itemId(parent) in self.failingIds:
+            return self.server.get("/error")
+        return super()._requestToLoadingChildren(parent)
+
+
+@pytest.fixture
+def model(server):
+    server.pageCount = 1
+    server.perPage = 4
+    model = RegistryModel(server, pagination=VNetworkData.VAllTogetherPagination)
+    waitFor(model.loadNextChildren())
+    return model
+
+
+def test_running_load_is_found_after_row_changes(model, server):
+    server.delay = 0.3
+    action = model.loadNextChildren(model.index(1, 0))
+    assert model._runningLoading(model.index(1, 0), LOADING) is action
+
+    model._removeRow(0)
+    assert model._runningLoading(model.index(0, 0), LOADING) is action
+    assert model._runningLoading(model.index(1, 0), LOADING) is None
+
+    assert model._moveRow(QModelIndex(), 0, QModelIndex(), 3)
+    assert model._runningLoading(model.index(2, 0), LOADING) is action
+    assert model._runningLoading(model.index(0, 0), LOADING) is None
+
+    # Удаление строк рядом с элементом не инвалидирует его загрузку.
+    model._removeRow(0)
+    assert action.isValid()
+    assert model._runningLoading(model.index(1, 0), LOADING) is action
+    model._removeRow(1)
+    assert not action.isValid()
+    assert spin(1000, lambda: not model._actions())
+
+
+def test_registry_is_cleaned_up_after_loads(model):
+    model.failingIds = (model.itemId(model.index(0, 0)), model.itemId(model.index(3, 0)))
+    failed = model.loadNextChildren(model.index(0, 0))
+    loaded = model.loadNextChildren(model.index(1, 0))
+    model.fetchMore(model.index(2, 0))  # Облегченная запись загрузки.
+    model.fetchMore(model.index(3, 0))
+    assert len(model._actions()) == 4
+    assert spin(3000, lambda: not model._actions())
+    assert failed.isError() and not loaded.isError()
+    assert all(model._runningLoading(model.index(row, 0), LOADING) is None for row in range(4))
+    assert model.childrenLoadingState(model.index(3, 0)) == Vns.LoadingState.Error
+    assert model.rowCount(model.index(2, 0)) == 4
+
+
+def test_registry_removes_empty_nodes(model):
+    waitFor(model.loadNextChildren(model.index(1, 0)))
+    index = model.index(2, 0, model.index(1, 0))
+
+    class Action:
+        def getIndex(self):
+            return index
+
+    registry = VNetworkData.src.mixin._VActionRegistry()
+    action = Action()
+    registry.add(action)
+    assert registry.actionsForItem(index) == [action]
+    assert registry.actionsForItems(QModelIndex(), 1, 1, 0, 0) == [action]
+    assert registry.actionsForItems(index.parent(), 0, 1, 0, 0) == []
+    registry.remove(action)
+    assert len(registry) == 0
+    assert registry._findNode(index.parent(), create=False) is None
+
+
+def test_finished_load_records_are_reused(model):
+    model.failingIds = (model.itemId(model.index(0, 0)),)
+    failed = model._loadNextChildren(model.index(0, 0), keepAction=False)
+    assert isinstance(failed, VNetworkData.src.action._VModelLoadRecord)
+    assert spin(3000, lambda: not model._actions())
+    assert model.childrenLoadingState(model.index(0, 0)) == Vns.LoadingState.Error
+
+    # Запись возвращается в пул сброшенной и используется для следующей загрузки.
+    record = model._loadNextChildren(model.index(1, 0), keepAction=False)
+    assert record is failed
+    assert record.isValid() and record.isRunning() and not record.isError()
+    assert model.itemId(record.getIndex()) == model.itemId(model.index(1, 0))
+    assert spin(3000, lambda: not model._actions())
+    assert model.rowCount(model.index(1, 0)) == 4
+    assert model._loadNextChildren(model.index(2, 0), keepAction=False) is record
+    assert spin(3000, lambda: not model._actions())
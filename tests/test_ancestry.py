@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import pytest
+
+from PyQt5.QtCore import QModelIndex
+
+from support import TreeModel, VNetworkData, waitFor
+
+mixin = VNetworkData.src.mixin
+
+
+@pytest.fixture
+def model(server):
+    server.pageCount = 1
+    model = TreeModel(server, pagination=VNetworkData.VAllTogetherPagination)
+    waitFor(model.loadNextChildren())
+    waitFor(model.loadNextChildren(model.index(1, 0)))
+    return model
+
+
+def insertRow(model, row: int, itemId: str):
+    """Вставляет в корень модели строку `row` с элементом `itemId` (не в конец, в отличие от загрузки)."""
+    model.beginInsertRows(QModelIndex(), row, row)
+    model._getLocalDataModel().invisibleRootItem().insertRow(row, model._createItem({"id": itemId, "name": itemId}))
+    model.endInsertRows()
+
+
+def grandchild(model, row: int) -> QModelIndex:
+    return model.index(0, 0, model.index(row, 0))
+
+
+def assertAncestry(model, row: int):
+    """Проверяет родство первого подэлемента загруженного элемента, находящегося в строке `row`."""
+    index = grandchild(model, row)
+    assert model.itemId(index.parent()) == "root-1-1"
+    assert model._ancestryPath(index) == ((row, 0), (0, 0))
+    assert mixin._pathFromRoot(index, showDisplayData=False) == "(-1,-1)'InvalidIndex' -> (%d,0) -> (0,0)" % row
+    for other in range(model.rowCount()):
+        assert mixin.isAncestor(model.index(other, 0), index) == (other == row)
+        assert mixin.isDescendant(index, QModelIndex(), other, other, 0, 0) == (other == row)
+    assert mixin.isDescendant(index, model.index(row, 0), 0, 0, 0, 0)
+    assert not mixin.isDescendant(index, model.index(row, 0), 0, 0, 0, 0, inclusive=False)
+
+
+def test_paths_follow_inserted_rows(model):
+    assertAncestry(model, 1)
+    insertRow(model, 0, "new")
+    assertAncestry(model, 2)
+    insertRow(model, model.rowCount(), "last")  # Вставка в конец не меняет пути уже существующих элементов.
+    assertAncestry(model, 2)
+
+
+def test_paths_follow_removed_rows(model):
+    assertAncestry(model, 1)
+    model._removeRow(0)
+    assertAncestry(model, 0)
+
+
+def test_paths_follow_moved_rows(model):
+    assertAncestry(model, 1)
+    assert model._moveRow(QModelIndex(), 1, QModelIndex(), 3)
+    assertAncestry(model, 2)
+    assert model._moveRow(QModelIndex(), 2, QModelIndex(), 0)
+    assertAncestry(model, 0)
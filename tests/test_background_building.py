@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import gc
+import threading
+
+from support import VNetworkData, Vns, spin, waitFor
+
+
+class ExpandedListModel(VNetworkData.src.abstract_model._VAbstractNetworkDataExpandedModel):
+    def __init__(self, server):
+        super().__init__()
+        self.server = server
+        self.createdInThreads = set()
+
+    def _createRootChildrenLoadingInfo(self):
+        return VNetworkData.VChildrenLoadingInfo(Vns.LoadingPolicy.Combined, VNetworkData.VAllTogetherPagination())
+
+    def _requestToLoadingChildren(self, parent):
+        return self.server.get("/list")
+
+    def _createItem(self, rawDict: dict, columns: int = None):
+        self.createdInThreads.add(threading.get_ident())
+        return super()._createItem(rawDict, columns)
+
+
+def itemBuildingThreads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith("VNetworkDataItemBuilding")]
+
+
+def test_roles_of_items_built_in_background(server):
+    model = ExpandedListModel(server)
+    model.setBackgroundItemBuilding(True)
+    waitFor(model.loadNextChildren())
+    assert model.rowCount() == server.perPage
+    assert threading.get_ident() not in model.createdInThreads
+    roles = {name: role for role, name in model.roleNames().items()}
+    assert model.data(model.index(1, 0), roles[b"name"]) == "n1"
+    model.setBackgroundItemBuilding(False)
+
+
+def test_item_building_threads_are_shut_down(server):
+    model = ExpandedListModel(server)
+    model.setBackgroundItemBuilding(True)
+    waitFor(model.loadNextChildren())
+    assert itemBuildingThreads()
+    model.setBackgroundItemBuilding(False)
+    assert spin(2000, lambda: not itemBuildingThreads())
+
+    model = ExpandedListModel(server)
+    model.setBackgroundItemBuilding(True)
+    waitFor(model.loadNextChildren())
+    model.deleteLater()
+    del model
+    spin(100)
+    gc.collect()
+    assert spin(2000, lambda: not itemBuildingThreads())
+
+
+def test_model_deleted_while_building(server):
+    built = threading.Event()
+
+    class SlowModel(ExpandedListModel):
+        def _createItem(self, rawDict: dict, columns: int = None):
+            built.wait(2)
+            return super()._createItem(rawDict, columns)
+
+    model = SlowModel(server)
+    model.setBackgroundItemBuilding(True)
+    model.loadNextChildren()
+    assert spin(2000, lambda: server.hits)
+    spin(200)  # Ответ пришел, и элементы строятся в рабочем потоке.
+    model.deleteLater()
+    del model
+    spin(100)
+    built.set()
+    spin(300)  # Уведомление о построенных элементах удаленной модели не должно приводить к ошибкам.
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import pytest
+
+from support import ListModel, VNetworkData, Vns, spin, waitFor
+
+TEMPLATE = VNetworkData.VChildrenLoadingTemplate(Vns.LoadingPolicy.Combined, VNetworkData.VAllTogetherPagination)
+
+
+class QueueModel(ListModel):
+    def _createItem(self, rawDict: dict, columns: int = None):
+        item = super()._createItem(rawDict, columns)
+        item.setData(TEMPLATE, Vns.ItemDataRole._ChildrenLoadingInfo)
+        return item
+
+
+@pytest.fixture
+def model(server):
+    server.pageCount = 1
+    server.perPage = 30
+    model = QueueModel(server, pagination=VNetworkData.VAllTogetherPagination)
+    waitFor(model.loadNextChildren())
+    server.delay = 0.05
+    return model
+
+
+def idle(model):
+    return not model.queuedChildrenLoadsCount() and not model.runningChildrenLoadsCount()
+
+
+def test_concurrency_limit(model):
+    model.setMaxConcurrentChildrenLoads(2)
+    running = []
+    model.childrenLoadingQueueChanged.connect(lambda queued, count: running.append(count))
+    actions = [model.loadNextChildren(model.index(row, 0)) for row in range(6)]
+    assert model.runningChildrenLoadsCount() == 2 and model.queuedChildrenLoadsCount() == 4
+    assert all(model.childrenLoadingIsInLoadingState(model.index(row, 0)) for row in range(6))
+    assert spin(5000, lambda: all(action.isFinished() for action in actions))
+    assert max(running) == 2
+    assert all(model.rowCount(model.index(row, 0)) == 30 for row in range(6))
+    assert idle(model) and not model._actions()
+
+
+def test_focused_and_visible_loads_start_first(model):
+    model.setMaxConcurrentChildrenLoads(1)
+    order = []
+    model.childrenLoadingFinished.connect(lambda parent: order.append(parent.row()))
+    for row in range(10):
+        model.loadNextChildren(model.index(row, 0))
+    model.setFocusedIndexes([model.index(9, 0)])
+    model.setVisibleRows(5, 6)
+    assert spin(5000, lambda: len(order) == 10)
+    # Первая загрузка стартовала сразу, остальные ждали в очереди.
+    assert order == [0, 9, 5, 6, 1, 2, 3, 4, 7, 8]
+
+
+def test_invisible_fetch_more_loads_are_dropped(model):
+    model.setMaxConcurrentChildrenLoads(1)
+    model.setVisibleRows(10, 12)
+    for row in range(10, 20):
+        model.fetchMore(model.index(row, 0))
+    assert spin(5000, lambda: idle(model))
+    assert model.droppedChildrenLoadsCount() == 7
+    assert [row for row in range(10, 20) if model.rowCount(model.index(row, 0))] == [10, 11, 12]
+    assert model.childrenLoadingState(model.index(15, 0)) == Vns.LoadingState.Idle
+    assert model.canFetchMore(model.index(15, 0))
+
+
+def test_cancel_queued_loads(model):
+    model.setMaxConcurrentChildrenLoads(1)
+    actions = [model.loadNextChildren(model.index(row, 0)) for row in range(3)]
+    assert model.cancelQueuedChildrenLoads(model.index(2, 0)) == 1
+    assert actions[2].isFinished() and actions[2].errorType() == Vns.ErrorType.CanceledError
+    assert model.childrenLoadingState(model.index(2, 0)) == Vns.LoadingState.Idle
+    assert spin(5000, lambda: idle(model))
+    assert not actions[0].isError() and not actions[1].isError()
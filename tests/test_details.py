@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import time
+
+import pytest
+
+from support import TreeModel, VNetworkData, Vns, spin, waitFor
+
+
+class DetailsModel(TreeModel):
+    failingIds = ()
+
+    def _requestToLoadingDetails(self, index):
+        if self.itemId(index) in self.failingIds:
+            return self.server.get("/error")
+        return super()._requestToLoadingDetails(index)
+
+
+@pytest.fixture
+def model(server):
+    server.pageCount = 1
+    server.perPage = 10
+    model = DetailsModel(server, pagination=VNetworkData.VAllTogetherPagination)
+    model.loadNextChildren()
+    assert spin(3000, lambda: model.rowCount() == 10)
+    return model
+
+
+def test_batch_details_are_loaded(model):
+    indexes = [model.index(row, 0) for row in range(model.rowCount())]
+    action = waitFor(model.reloadDetailsFor(indexes))
+    assert action.isFinished() and not action.isError()
+    assert all(model.hasLoadedDetails(index) for index in indexes)
+    assert model.data(indexes[3], Vns.ItemDataRole.ItemDict)["details"] == model.itemId(indexes[3])
+
+
+def test_batch_details_error_is_taken_from_failed_load(model):
+    model.failingIds = (model.itemId(model.index(2, 0)),)
+    unrelated = []
+
+    def raiseUnrelatedError():
+        # Ошибка другого действия, возникшая после ошибки загрузки, не должна попасть в общее действие.
+        if not unrelated:
+            unrelated.append(True)
+            model._setError(Vns.ErrorType.UnknownError, "unrelated")
+
+    model.errorOccurred.connect(raiseUnrelatedError)
+    action = waitFor(model.reloadDetailsFor([model.index(row, 0) for row in range(model.rowCount())]))
+    assert unrelated
+    assert action.isError()
+    assert action.errorType() == Vns.ErrorType.NetworkError
+    assert action.errorInformativeText() != "unrelated"
+    assert model.detailsLoadingState(model.index(2, 0)) == Vns.LoadingState.Error
+
+
+def test_failed_revalidation_is_postponed_without_model_errors(model, server):
+    model.setDetailsLoadingPolicy(Vns.LoadingPolicy.Automatically)
+    model.setDetailsLoadingDelay(0)
+    model.setDetailsTimeToLive(100)
+    model.setDetailsRevalidationInterval(50)
+    model.setVisibleRows(0, 0)
+    index = model.index(0, 0)
+    assert spin(3000, lambda: model.hasLoadedDetails(index))
+
+    model.failingIds = (model.itemId(index),)
+    errors = []
+    model.errorOccurred.connect(lambda: errors.append(model.errorType()))
+    hits = len(server.hits)
+    spin(1000)
+    retries = [hit for hit in server.hits[hits:] if hit == "/error"]
+    # Без отсрочки за секунду было бы около 20 повторных перепроверок (каждые 50 мс).
+    assert 1 <= len(retries) <= 5
+    assert not errors
+    assert model.detailsLoadingState(index) == Vns.LoadingState.Idle
+    assert model.hasLoadedDetails(index)
+
+
+def test_reload_details_during_batch_returns_running_load(model, monkeypatch):
+    index = model.index(1, 0)
+    model.reloadDetailsFor([index, model.index(2, 0)])
+    assert model.detailsLoadingState(index) == Vns.LoadingState.Loading
+    action = waitFor(model.reloadDetails(index))
+    assert not action.isError()
+    assert model.hasLoadedDetails(index)
+
+    # Если выполняющаяся загрузка элемента не найдена, то возвращается общее действие пакета.
+    batchAction = model.reloadDetailsFor([model.index(3, 0)])
+    monkeypatch.setattr(model, "_runningLoading", lambda index, type: None)
+    assert model.reloadDetails(model.index(3, 0)) is batchAction
+    waitFor(batchAction)
+    assert model.hasLoadedDetails(model.index(3, 0))
+
+
+def test_visible_details_are_loaded_after_scrolling_stops(model, server):
+    model.setDetailsLoadingDelay(100)
+    model.setDetailsLoadingPolicy(Vns.LoadingPolicy.Automatically)
+    hits = len(server.hits)
+    for first in (0, 3, 7):
+        model.setVisibleRows(first, first + 2)
+        spin(30)
+    assert len(server.hits) == hits  # Пока прокрутка продолжается, загрузка не начинается.
+    assert spin(3000, lambda: all(model.hasLoadedDetails(model.index(row, 0)) for row in range(7, 10)))
+    spin(200)
+    assert sorted(server.hits[hits:]) == ["/details?id=%s" % model.itemId(model.index(row, 0)) for row in range(7, 10)]
+    assert not any(model.hasLoadedDetails(model.index(row, 0)) for row in range(7))
+
+
+def test_failed_visible_details_are_not_reloaded_automatically(model, server):
+    model.failingIds = (model.itemId(model.index(1, 0)),)
+    model.setDetailsLoadingDelay(0)
+    model.setDetailsLoadingPolicy(Vns.LoadingPolicy.Automatically)
+    model.setVisibleRows(0, 2)
+    assert spin(3000, lambda: model.detailsLoadingState(model.index(1, 0)) == Vns.LoadingState.Error)
+    model.setVisibleRows(0, 2)
+    spin(300)
+    assert server.hits.count("/error") == 1
+    assert model.hasLoadedDetails(model.index(0, 0)) and model.hasLoadedDetails(model.index(2, 0))
+
+
+def test_revalidation_backoff_doubles_after_each_failure(model, monkeypatch):
+    index = model.index(0, 0)
+    model.setDetailsTimeToLive(0)
+    waitFor(model.reloadDetails(index))
+    requestedAt = []
+    requestToLoadingDetails = model._requestToLoadingDetails
+    monkeypatch.setattr(model, "_requestToLoadingDetails",
+            lambda index: requestedAt.append(time.monotonic()) or requestToLoadingDetails(index))
+    model.failingIds = (model.itemId(index),)
+    model.setDetailsRevalidationInterval(20)
+    model.setDetailsLoadingPolicy(Vns.LoadingPolicy.Automatically)
+    model.setVisibleRows(0, 0)
+    assert spin(3000, lambda: len(requestedAt) == 5)
+
+    gaps = [later - earlier for earlier, later in zip(requestedAt, requestedAt[1:])]
+    for failures, gap in enumerate(gaps, 1):
+        backoff = 0.02 * 2 ** (failures - 1)
+        assert backoff * 0.9 <= gap <= backoff + 0.2
+    info = model._getDetailsLoadingInfo(index)
+    assert info.revalidationFailures >= 4
+
+    # Успешная перепроверка сбрасывает отсрочку.
+    model.failingIds = ()
+    assert spin(3000, lambda: info.revalidationFailures == 0)
+    assert model.detailsLoadingState(index) == Vns.LoadingState.Idle
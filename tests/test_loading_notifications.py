@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import pytest
+
+from support import TreeModel, VNetworkData, Vns, spin, waitFor
+
+
+@pytest.fixture
+def model(server):
+    server.pageCount = 1
+    model = TreeModel(server, pagination=VNetworkData.VAllTogetherPagination)
+    waitFor(model.loadNextChildren())
+    model.setLoadingNotificationsBatching(True)
+    return model
+
+
+@pytest.fixture
+def notifications(model):
+    notifications = {"states": [], "batches": [], "dataChanged": []}
+    model.childrenLoadingStateChanged.connect(lambda parent: notifications["states"].append(model.itemId(parent)))
+    model.childrenLoadingStatesChanged.connect(
+            lambda parents: notifications["batches"].append([model.itemId(parent) for parent in parents]))
+    model.dataChanged.connect(lambda topLeft, bottomRight, roles: notifications["dataChanged"].append(
+            (topLeft.row(), bottomRight.row(), list(roles))))
+    return notifications
+
+
+def test_changes_of_one_turn_are_coalesced(model, notifications, server):
+    ids = [model.itemId(model.index(row, 0)) for row in range(3)]
+    for row in range(3):
+        model._setChildrenLoadingState(Vns.LoadingState.Loading, model.index(row, 0))
+        model._setChildrenLoadingState(Vns.LoadingState.Error, model.index(row, 0))
+    # Состояние третьего элемента вернулось к исходному, поэтому о нем не уведомляется.
+    model._setChildrenLoadingState(Vns.LoadingState.Idle, model.index(2, 0))
+    assert not notifications["states"]
+
+    spin(50)
+    assert notifications["states"] == ids[:2]
+    assert notifications["batches"] == [ids[:2]]
+    assert notifications["dataChanged"] == [(0, 1, [Vns.ItemDataRole.ChildrenLoadingState])]
+
+    # Загрузки, запущенные в одном круге цикла событий, дают по одному уведомлению на элемент.
+    notifications["states"].clear()
+    notifications["batches"].clear()
+    server.delay = 0.1  # Иначе загрузка может завершиться в том же круге, и ее состояние не изменится.
+    actions = [model.loadNextChildren(model.index(row, 0)) for row in range(3)]
+    assert spin(3000, lambda: all(action.isFinished() for action in actions))
+    spin(50)
+    assert notifications["batches"][0] == ids
+    assert all(notifications["states"].count(itemId) == 2 for itemId in ids)  # Loading, затем Idle.
+
+
+def test_removed_rows_are_not_notified(model, notifications):
+    removedId = model.itemId(model.index(0, 0))
+    keptId = model.itemId(model.index(1, 0))
+    model._setChildrenLoadingState(Vns.LoadingState.Error, model.index(0, 0))
+    model._setChildrenLoadingState(Vns.LoadingState.Error, model.index(1, 0))
+    model._removeRow(0)
+
+    spin(50)
+    assert removedId not in notifications["states"]
+    assert notifications["states"] == [keptId]
+    assert notifications["batches"] == [[keptId]]
+    assert notifications["dataChanged"] == [(0, 0, [Vns.ItemDataRole.ChildrenLoadingState])]
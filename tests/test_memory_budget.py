@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+from support import ListModel, VNetworkData, Vns, spin, waitFor
+
+TEMPLATE = VNetworkData.VChildrenLoadingTemplate(Vns.LoadingPolicy.Manually, VNetworkData.VAllTogetherPagination)
+
+
+class BudgetModel(ListModel):
+    def _createRootChildrenLoadingInfo(self):
+        return VNetworkData.VChildrenLoadingInfo(Vns.LoadingPolicy.Manually, VNetworkData.VAllTogetherPagination())
+
+    def _createItem(self, rawDict: dict, columns: int = None):
+        item = super()._createItem(rawDict, columns)
+        item.setData(TEMPLATE, Vns.ItemDataRole._ChildrenLoadingInfo)
+        return item
+
+
+def loadChildren(model, row):
+    parent = model.index(row, 0)
+    waitFor(model.loadNextChildren(parent))
+    spin(20)  # Бюджет памяти соблюдается отложенно.
+    return parent
+
+
+def test_least_recently_used_children_are_unloaded(server):
+    server.pageCount = 1
+    server.perPage = 5
+    model = BudgetModel(server)
+    model.setMemoryBudget(5 + 2 * 5)  # Корень и подэлементы двух элементов.
+    waitFor(model.loadNextChildren())
+    unloaded = []
+    model.childrenUnloaded.connect(lambda parent: unloaded.append(parent.row()))
+
+    loadChildren(model, 0)
+    loadChildren(model, 1)
+    assert model.memoryUsage() == 15 and not unloaded
+    loadChildren(model, 2)
+    assert unloaded == [0]
+    assert model.memoryUsage() <= 15
+    assert model.rowCount(model.index(0, 0)) == 0
+    assert model.canLoadNextChildren(model.index(0, 0))  # Выгруженные подэлементы можно загрузить заново.
+
+
+def test_touched_children_are_unloaded_later(server):
+    server.pageCount = 1
+    server.perPage = 5
+    model = BudgetModel(server)
+    model.setMemoryBudget(5 + 2 * 5)
+    waitFor(model.loadNextChildren())
+    unloaded = []
+    model.childrenUnloaded.connect(lambda parent: unloaded.append(parent.row()))
+
+    loadChildren(model, 0)
+    loadChildren(model, 1)
+    model.touchChildren(model.index(0, 0))
+    loadChildren(model, 2)
+    assert unloaded == [1]
+    assert model.rowCount(model.index(0, 0)) == 5
+
+
+def test_protected_children_are_not_unloaded(server):
+    server.pageCount = 1
+    server.perPage = 5
+    model = BudgetModel(server)
+    model.setMemoryBudget(5 + 2 * 5)
+    waitFor(model.loadNextChildren())
+    loadChildren(model, 0)
+    model.setProtectedIndexes([model.index(0, 0)])
+    loadChildren(model, 1)
+    loadChildren(model, 2)
+    assert model.rowCount(model.index(0, 0)) == 5
+    assert model.rowCount(model.index(1, 0)) == 0
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import pytest
+
+from PyQt5.QtCore import QModelIndex
+
+from support import TreeModel, VNetworkData, Vns, spin, waitFor
+
+
+@pytest.fixture
+def model(server):
+    server.pageCount = 1
+    server.delay = 0.1
+    return TreeModel(server, pagination=VNetworkData.VAllTogetherPagination)
+
+
+def test_load_follows_running_load_record(model, server):
+    model.fetchMore(QModelIndex())
+    first = model.loadNextChildren()
+    waitFor(first)
+    assert first.isFinished() and not first.isError()
+    assert model.rowCount() == 3 and len(server.hits) == 1
+
+
+def test_cancel_follower_of_load_record(model, server):
+    model.fetchMore(QModelIndex())  # Загрузка представления использует облегченную запись.
+    follower = model.loadNextChildren()
+    invalidated = []
+    follower.invalidated.connect(lambda: invalidated.append(True))
+    assert model._cancelChildrenLoading(follower)
+    assert invalidated and not follower.isValid()
+    assert model.childrenLoadingState() == Vns.LoadingState.Idle
+    spin(300)
+    assert model.rowCount() == 0
+    assert model.childrenLoadingState() == Vns.LoadingState.Idle
+    assert not model._actions() and not model.runningChildrenLoadsCount()
+    assert model.canLoadNextChildren()
+
+
+def test_cancel_pending_reload(model, server):
+    running = model.loadNextChildren()
+    pending = model.reloadChildren()
+    assert pending is not running
+    assert model.reloadChildren() is pending
+    assert model._cancelChildrenLoading(pending)
+    assert not pending.isValid()
+    assert not model._cancelChildrenLoading(pending)
+    waitFor(running)
+    spin(300)
+    assert running.isFinished() and not running.isError()
+    assert model.rowCount() == 3 and len(server.hits) == 1
+    assert model.childrenLoadingState() == Vns.LoadingState.Idle
+    # Новая отложенная перезагрузка создается заново.
+    assert model.reloadChildren() is not pending
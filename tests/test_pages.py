@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import pytest
+
+from support import ListModel, VNetworkData, Vns, spin, waitFor
+
+
+class PagesModel(ListModel):
+    """Модель, страницы подэлементов корня которой приходят с заданными задержками."""
+
+    def __init__(self, server):
+        super().__init__(server, pagination=VNetworkData.VPagesAccumulationPagination)
+        self.pageDelays = dict()  # Номер страницы -> задержка ответа (в секундах).
+        self.failingPage = None
+
+    def _requestToLoadingChildren(self, parent):
+        page = self.childrenPagination(parent).getRequiredPage()
+        path = "/error" if page == self.failingPage else "/list"
+        return self.server.get("%s?page=%d&parent=root&delay=%s" % (path, page, self.pageDelays.get(page, 0)))
+
+
+@pytest.fixture
+def model(server):
+    server.pageCount = 5
+    model = PagesModel(server)
+    waitFor(model.loadNextChildren())
+    model.childrenPagination().setMaxConcurrentPages(4)
+    return model
+
+
+def rowIds(model) -> list:
+    return [model.itemId(model.index(row, 0)) for row in range(model.rowCount())]
+
+
+def test_pages_are_inserted_in_order(model):
+    model.pageDelays = {2: 0.5, 3: 0.0, 4: 0.2, 5: 0.0}
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append(model.itemId(model.index(first, 0))))
+    action = model.loadRemainingChildren()
+    assert model.childrenLoadingState() == Vns.LoadingState.Loading
+    # Страницы 3 и 5 уже загружены, но ждут вставки страницы 2.
+    assert spin(3000, lambda: len(model.server.hits) == 5)
+    spin(200)
+    assert not inserted
+    assert model.childrenPageLoadingState(3) == Vns.LoadingState.Loading
+    waitFor(action)
+    assert action.isFinished() and not action.isError()
+    assert inserted == ["root-2-0", "root-3-0", "root-4-0", "root-5-0"]
+    assert rowIds(model) == ["root-%d-%d" % (page, row) for page in range(1, 6) for row in range(3)]
+    assert all(model.childrenPageLoadingState(page) == Vns.LoadingState.Idle for page in range(2, 6))
+    assert model.childrenLoadingState() == Vns.LoadingState.Idle
+    assert not model.canLoadNextChildren() and not model._actions()
+
+
+def test_failed_page_cancels_later_pages(model):
+    model.failingPage = 3
+    model.pageDelays = {2: 0.0, 3: 0.1, 4: 0.5, 5: 0.5}
+    errors = []
+    model.errorOccurred.connect(lambda: errors.append(model.errorType()))
+    action = waitFor(model.loadRemainingChildren(), 2000)
+    assert action.isFinished() and action.errorType() == Vns.ErrorType.NetworkError
+    assert errors == [Vns.ErrorType.NetworkError]
+    assert rowIds(model) == ["root-%d-%d" % (page, row) for page in range(1, 3) for row in range(3)]
+    assert model.childrenPageLoadingState(2) == Vns.LoadingState.Idle
+    assert all(model.childrenPageLoadingState(page) == Vns.LoadingState.Error for page in range(3, 6))
+    assert model.childrenLoadingState() == Vns.LoadingState.Error
+    assert not model._actions()
+
+    # Прерванные страницы больше не вставляются, а загрузку можно продолжить.
+    spin(700)
+    assert model.rowCount() == 6
+    model.failingPage = None
+    model.pageDelays = {}
+    waitFor(model.loadNextChildren())
+    assert rowIds(model)[6:] == ["root-3-%d" % row for row in range(3)]
+
+
+def test_cancel_pages_in_flight(model):
+    model.pageDelays = {page: 0.3 for page in range(2, 6)}
+    errors = []
+    model.errorOccurred.connect(lambda: errors.append(model.errorType()))
+    action = model.loadRemainingChildren()
+    assert spin(3000, lambda: len(model.server.hits) == 5)
+    assert model._cancelChildrenLoading(action)
+    assert not action.isValid()
+    assert model.childrenLoadingState() == Vns.LoadingState.Idle
+    assert all(model.childrenPageLoadingState(page) == Vns.LoadingState.Unknown for page in range(2, 6))
+    spin(600)
+    assert model.rowCount() == 3 and not errors
+    assert not model._actions()
+
+    model.pageDelays = {}
+    action = waitFor(model.loadRemainingChildren())
+    assert not action.isError() and model.rowCount() == 15
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import pytest
+
+from support import ListModel, VNetworkData, waitFor
+
+VPayloadCache = VNetworkData.VPayloadCache
+
+
+def test_cached_payload_can_not_be_mutated():
+    cache = VPayloadCache()
+    payload = [{"id": 1, "tags": ["a"]}, {"id": 2}]
+    frozen = cache.put("rows", payload)
+
+    payload[0]["id"] = 100  # Исходный объект остается во владении вызывающей стороны.
+    payload.append({"id": 3})
+    assert cache.get("rows") is frozen
+    assert [dict(row) for row in frozen] == [{"id": 1, "tags": ["a"]}, {"id": 2}]
+    with pytest.raises(TypeError):
+        frozen[0]["id"] = 5
+    with pytest.raises(AttributeError):
+        frozen.append({"id": 3})
+
+    copy = cache.getCopy("rows")
+    copy[0]["id"] = 7
+    copy.append({"id": 8})
+    assert cache.getCopy("rows") == [{"id": 1, "tags": ["a"]}, {"id": 2}]
+
+
+def test_cached_dict_round_trip():
+    cache = VPayloadCache()
+    cache.put("details", {"name": "x"})
+    with pytest.raises(TypeError):
+        cache.get("details")["name"] = "y"
+    copy = cache.getCopy("details")
+    copy["name"] = "y"
+    assert copy == {"name": "y"}
+    assert cache.getCopy("details") == {"name": "x"}
+    assert cache.get("missing") is None and cache.getCopy("missing") is None
+    assert cache.hits() == 3 and cache.misses() == 2
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = VPayloadCache(maxSize=2)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    assert cache.get("a") == (1,)
+    cache.put("c", [3])
+    assert cache.size() == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == (1,) and cache.get("c") == (3,)
+
+    cache.put("a", [10])  # Повторное сохранение обновляет запись и делает ее самой свежей.
+    cache.setMaxSize(1)
+    assert cache.size() == 1 and cache.getCopy("a") == [10]
+    cache.remove("a")
+    assert cache.size() == 0
+
+
+def test_keys_require_validators():
+    assert VPayloadCache.makeKey("http://host/list", "", "") is None
+    assert VPayloadCache.makeKey("http://host/list", '"tag"', "", "extra") == ("http://host/list", '"tag"', "", "extra")
+
+
+def test_models_get_their_own_copies(server):
+    server.pageCount = 1
+
+    class MarkingModel(ListModel):
+        def _prepareItemDict(self, rawDict: dict) -> dict:
+            rawDict["name"] += "!"  # Изменяет полученный словарь на месте.
+            return rawDict
+
+    cache = VPayloadCache()
+    models = [MarkingModel(server), MarkingModel(server)]
+    for model in models:
+        model.setPayloadCache(cache)
+        waitFor(model.loadNextChildren())
+    assert cache.hits() == 1
+    for model in models:
+        assert [model.data(model.index(row, 0), VNetworkData.Vns.ItemDataRole.ItemDict)["name"]
+                for row in range(model.rowCount())] == ["n0!", "n1!", "n2!"]
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import threading
+
+from PyQt5.QtCore import QCoreApplication, QThread
+
+from support import TreeModel, VNetworkData, Vns, waitFor
+
+
+def test_held_items_are_counted_only_when_read(server, monkeypatch):
+    server.pageCount = 1
+    model = TreeModel(server, pagination=VNetworkData.VAllTogetherPagination)
+    walks = []
+    countSubtreeItems = model._countSubtreeItems
+    monkeypatch.setattr(model, "_countSubtreeItems", lambda *args: walks.append(args) or countSubtreeItems(*args))
+
+    waitFor(model.loadNextChildren())
+    waitFor(model.loadNextChildren(model.index(0, 0)))
+    assert not walks  # Вставка строк не обходит их поддеревья.
+    assert model.property("heldItemsCount") == 6
+    assert model.property("heldItemsCount") == 6
+    assert len(walks) == 1
+
+    model._removeRow(0)
+    assert len(walks) == 1
+    assert model.property("heldItemsCount") == 2
+
+
+def test_dropped_queued_load_is_counted_as_canceled(server):
+    server.pageCount = 1
+    server.delay = 0.05
+    model = TreeModel(server, pagination=VNetworkData.VAllTogetherPagination)
+    waitFor(model.loadNextChildren())
+    model.setMaxConcurrentChildrenLoads(1)
+    running = model.loadNextChildren(model.index(0, 0))
+    queued = model.loadNextChildren(model.index(1, 0))
+    assert model.cancelQueuedChildrenLoads(model.index(1, 0)) == 1
+    assert queued.errorType() == Vns.ErrorType.CanceledError
+    waitFor(running)
+    assert model.performanceCounters()["errors"] == {"CanceledError": 1}
+
+
+def test_time_counted_in_the_model_thread_is_notified(server, monkeypatch):
+    model = TreeModel(server)
+    notified = []
+    monkeypatch.setattr(model, "_notifyPerformanceCounters", lambda: notified.append(QThread.currentThread()))
+
+    def countTime():
+        with model._countingTime("parse"):
+            pass
+
+    worker = threading.Thread(target=countTime)
+    worker.start()
+    worker.join()
+    assert not notified  # Рабочий поток не трогает таймер модели.
+
+    class ModelThread(QThread):
+        def run(self):
+            countTime()
+            model.moveToThread(QCoreApplication.instance().thread())
+
+    thread = ModelThread()
+    model.moveToThread(thread)
+    thread.start()
+    assert thread.wait(2000)
+    assert notified == [thread]  # Модель, живущая не в главном потоке, уведомляет из своего потока.
+    assert model.performanceCounters()["parseTime"]["count"] == 2
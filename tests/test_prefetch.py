@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import pytest
+
+from support import ListModel, VNetworkData, Vns, spin, waitFor
+
+
+@pytest.fixture
+def model(server):
+    server.pageCount = 10
+    server.perPage = 50
+    model = ListModel(server, pagination=VNetworkData.VPagesAccumulationPagination)
+    model.setChildrenLoadingPolicy(Vns.LoadingPolicy.Combined | Vns.LoadingPolicy.Prefetching)
+    return model
+
+
+def listHits(server) -> list:
+    return [hit for hit in server.hits if hit.startswith("/list")]
+
+
+def test_next_page_is_prefetched_near_the_end(model, server):
+    waitFor(model.loadNextChildren())
+    model.setChildrenPrefetchThreshold(5)
+    model.setVisibleRows(0, 40)
+    spin(200)
+    model.setVisibleRows(0, 43)
+    spin(100)
+    assert len(listHits(server)) == 1  # До конца загруженных строк дальше порога.
+
+    model.setVisibleRows(0, 44)
+    assert model.childrenLoadingState() == Vns.LoadingState.Loading
+    assert spin(3000, lambda: model.rowCount() == 100)
+    assert len(listHits(server)) == 2
+    spin(100)
+    assert len(listHits(server)) == 2
+
+
+def test_no_prefetch_without_policy_or_after_error(model, server):
+    waitFor(model.loadNextChildren())
+    model.setChildrenLoadingPolicy(Vns.LoadingPolicy.Combined)
+    model.setVisibleRows(0, 49)
+    spin(100)
+    assert len(listHits(server)) == 1
+
+    model.setChildrenLoadingPolicy(Vns.LoadingPolicy.Combined | Vns.LoadingPolicy.Prefetching)
+    model._setChildrenLoadingState(Vns.LoadingState.Error)
+    model.setVisibleRows(0, 49)
+    spin(100)
+    assert len(listHits(server)) == 1
+
+
+def test_threshold_adapts_to_scroll_speed_and_latency(model, server):
+    server.delay = 0.2
+    waitFor(model.loadNextChildren())  # Задержка загрузки порции около 0,2 секунды.
+    model.setChildrenPrefetchThreshold(0)
+    assert model.effectiveChildrenPrefetchThreshold() == 0
+
+    requestedAt = None
+    last = 0
+    while last < 49 and requestedAt is None:
+        model.setVisibleRows(0, last)
+        if len(listHits(server)) > 1 or model.childrenLoadingState() == Vns.LoadingState.Loading:
+            requestedAt = last
+        spin(20)
+        last += 2
+    # Около 100 строк в секунду за 0,2 секунды загрузки с запасом - порог в десятки строк.
+    threshold = model.effectiveChildrenPrefetchThreshold()
+    assert threshold >= 10
+    assert requestedAt is not None and requestedAt <= 49 - 10
+    assert spin(3000, lambda: model.rowCount() == 100)
+
+    # Медленная прокрутка уменьшает порог.
+    for step in range(10):
+        model.setVisibleRows(0, last + step // 5)
+        spin(50)
+    assert model.effectiveChildrenPrefetchThreshold() < threshold
+    assert len(listHits(server)) == 2
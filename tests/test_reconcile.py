@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import random
+
+import pytest
+
+from PyQt5.QtCore import QModelIndex, QPersistentModelIndex
+
+from support import VNetworkData, Vns, waitFor
+
+
+class ReconcileModelMixin:
+    """Модель, подэлементы корня которой (вместе с их подэлементами) берутся из списка `rows`."""
+
+    def __init__(self, server):
+        super().__init__()
+        self.server = server
+        self.rows = []
+        self.failingId = None
+        self.setChildrenKeyFunction(lambda rawDict: rawDict["id"])
+
+    def _createRootChildrenLoadingInfo(self):
+        return VNetworkData.VChildrenLoadingInfo(Vns.LoadingPolicy.Combined, VNetworkData.VAllTogetherPagination())
+
+    def _requestToLoadingChildren(self, parent):
+        return self.server.get("/list")
+
+    def convertToListOfDicts(self, string: str):
+        return [dict(rawDict) for rawDict in self.rows]
+
+    def _prepareItemDict(self, rawDict: dict) -> dict:
+        if rawDict["id"] == self.failingId:
+            self.failingId = None  # Ошибка возникает однократно.
+            raise ValueError(rawDict["id"])
+        return {field: value for field, value in rawDict.items() if field != "children"}
+
+    def _getListOfDictsForChildren(self, rawDict: dict):
+        return rawDict.get("children", [])
+
+    def reload(self):
+        action = self.reloadChildren() if self.hasLoadedChildren() else self.loadNextChildren()
+        waitFor(action)
+        assert not action.isError()
+
+    def itemDicts(self, parent=QModelIndex()):
+        return [self.data(self.index(row, 0, parent), Vns.ItemDataRole.ItemDict)
+                for row in range(self.rowCount(parent))]
+
+    def tree(self, parent=QModelIndex()):
+        result = []
+        for row in range(self.rowCount(parent)):
+            index = self.index(row, 0, parent)
+            itemDict = dict(self.data(index, Vns.ItemDataRole.ItemDict))
+            children = self.tree(index)
+            if children:
+                itemDict["children"] = children
+            result.append(itemDict)
+        return result
+
+
+class ReconcileModel(ReconcileModelMixin, VNetworkData.VAbstractNetworkDataModel):
+    pass
+
+
+class ExpandedReconcileModel(ReconcileModelMixin, VNetworkData.src.abstract_model._VAbstractNetworkDataExpandedModel):
+    pass
+
+
+def randomRows(rng: random.Random, ids: list, depth: int = 1) -> list:
+    rows = []
+    for id in ids:
+        row = {"id": id, "v": rng.randint(0, 2)}
+        if depth and rng.random() < 0.7:
+            row["children"] = randomRows(rng, rng.sample(range(10), rng.randint(1, 4)), depth - 1)
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_reconcile_matches_server_rows(server, seed):
+    rng = random.Random(seed)
+    model = ReconcileModel(server)
+    ids = list(range(20))
+    model.rows = randomRows(rng, ids)
+    model.reload()
+    for trial in range(40):
+        kept = rng.sample(ids, rng.randint(0, len(ids)))
+        ids = kept + [100 * (trial + 1) + k for k in range(rng.randint(0, 5))]
+        rng.shuffle(ids)
+        model.rows = randomRows(rng, ids)
+        persistent = {itemDict["id"]: QPersistentModelIndex(model.index(row, 0))
+                      for row, itemDict in enumerate(model.itemDicts())}
+        model.reload()
+        assert model.tree() == model.rows
+        # Сохраненные подэлементы не пересоздаются, а перемещаются.
+        for id in kept:
+            index = persistent[id]
+            assert index.isValid()
+            assert model.data(QModelIndex(index), Vns.ItemDataRole.ItemDict)["id"] == id
+
+
+def test_reconcile_moves_instead_of_reinserting(server):
+    model = ReconcileModel(server)
+    model.rows = [{"id": id} for id in range(10)]
+    model.reload()
+    events = []
+    model.rowsInserted.connect(lambda parent, first, last: events.append(("insert", first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: events.append(("remove", first, last)))
+    model.rowsMoved.connect(lambda parent, first, last, destination, row: events.append(("move", first, row)))
+    model.rows = [{"id": id} for id in [0, 1, 2, 3, 4, 5, 6, 7, 9, 8]]
+    model.reload()
+    assert len(events) == 1 and events[0][0] == "move"
+    assert [itemDict["id"] for itemDict in model.itemDicts()] == [0, 1, 2, 3, 4, 5, 6, 7, 9, 8]
+
+
+def test_reconcile_falls_back_to_full_replacement(server):
+    model = ReconcileModel(server)
+    model.rows = [{"id": id, "children": [{"id": 1}, {"id": 2}]} for id in range(5)]
+    model.reload()
+    # Элементы верхнего уровня уже перемещены и обновлены, когда при сопоставлении их подэлементов возникает ошибка.
+    model.rows = [{"id": id, "v": 1, "children": [{"id": 2}, {"id": 3}]} for id in reversed(range(5))]
+    model.failingId = 3
+    errors = []
+    model.errorOccurred.connect(lambda: errors.append(model.errorType()))
+    model.reload()
+    assert model.failingId is None
+    assert model.tree() == model.rows
+    assert not errors
+
+
+def test_reconcile_registers_roles_of_new_fields(server):
+    model = ExpandedReconcileModel(server)
+    model.rows = [{"id": id} for id in range(3)]
+    model.reload()
+    assert b"title" not in model.roleNames().values()
+    model.rows = [{"id": id, "title": "t%d" % id} for id in range(3)]
+    model.reload()
+    role = {name: role for role, name in model.roleNames().items()}[b"title"]
+    assert model.data(model.index(1, 0), role) == "t1"
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import json
+
+from urllib.parse import quote
+
+from support import ListModel, VNetworkData, spin, waitFor
+
+
+def detailsAction(server, itemId: str, charset: str = "utf-8"):
+    action = VNetworkData.VNetworkAction(server.get("/details?id=%s&charset=%s" % (quote(itemId), charset)))
+    assert spin(3000, action._replyIsFinished)
+    return action
+
+
+def decodedText(action):
+    """Возвращает уже декодированный текст тела ответа действия `action` или None, если он не декодировался."""
+    return action._VNetworkReplyReader__replyString
+
+
+def recordingParser(calls: list):
+    def parse(data):
+        calls.append(type(data))
+        return json.loads(data)
+
+    return parse
+
+
+def test_utf8_body_is_parsed_from_bytes(server):
+    action = detailsAction(server, "элемент")
+    assert action._replyBodyIsUtf8()
+    calls = []
+    parser = recordingParser(calls)
+    payload = action.replyPayload(parser)
+    assert payload == {"details": "элемент"}
+    assert calls == [bytes]
+    assert decodedText(action) is None  # Текст тела не декодировался.
+
+    # Повторный вызов с тем же парсером возвращает закэшированный объект, другой парсер разбирает тело заново.
+    assert action.replyPayload(parser) is payload and calls == [bytes]
+    assert action.replyPayload() == payload
+    assert action.replyPayload(parser) is not payload and calls == [bytes, bytes]
+
+    assert action.replyPayload(recordingParser(calls), acceptsBytes=False) == payload
+    assert calls[-1] is str
+
+
+def test_other_charsets_are_parsed_from_text(server):
+    action = detailsAction(server, "элемент", charset="windows-1251")
+    assert not action._replyBodyIsUtf8()
+    calls = []
+    assert action.replyPayload(recordingParser(calls)) == {"details": "элемент"}
+    assert calls == [str]
+    assert action.replyBodyStringData() == '{"details": "элемент"}'
+
+    # Если текст уже декодирован, то он используется и для тела в UTF-8.
+    action = detailsAction(server, "элемент")
+    assert action.replyBodyStringData()
+    calls = []
+    assert action.replyPayload(recordingParser(calls)) == {"details": "элемент"}
+    assert calls == [str]
+
+
+def test_overridden_converter_gets_text(server):
+    server.pageCount = 1
+    strings = []
+
+    class TextModel(ListModel):
+        def convertToListOfDicts(self, string: str):
+            strings.append(string)
+            return super().convertToListOfDicts(string)
+
+    model = TextModel(server, pagination=VNetworkData.VAllTogetherPagination)
+    waitFor(model.loadNextChildren())
+    assert len(strings) == 1 and isinstance(strings[0], str)
+    assert [row["id"] for row in json.loads(strings[0])] == ["root-1-0", "root-1-1", "root-1-2"]
+    assert model.rowCount() == 3
+
+    # Непереопределенный метод разбирает тело конвейером действия, не декодируя его в текст.
+    calls = []
+    parse = json.loads
+
+    class PipelineModel(ListModel):
+        def _parseReplyPayload(self, action, convert):
+            payload = super()._parseReplyPayload(action, convert)
+            calls.append((action.replyPayload(parse) is action.replyPayload(parse), decodedText(action)))
+            return payload
+
+    model = PipelineModel(server, pagination=VNetworkData.VAllTogetherPagination)
+    waitFor(model.loadNextChildren())
+    assert calls == [(True, None)] and model.rowCount() == 3
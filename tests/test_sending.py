@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import pytest
+
+from support import TreeModel, VNetworkData, Vns, spin, waitFor
+
+
+class SendingModel(TreeModel):
+    def _requestToSendingData(self, changes):
+        return self.server.patch("/patch", [dict(fields, id=self.itemId(index)) for index, fields in changes])
+
+
+@pytest.fixture
+def model(server):
+    server.pageCount = 1
+    server.perPage = 5
+    model = SendingModel(server, pagination=VNetworkData.VAllTogetherPagination)
+    waitFor(model.loadNextChildren())
+    return model
+
+
+def name(model, row) -> str:
+    return model.data(model.index(row, 0), Vns.ItemDataRole.ItemDict)["name"]
+
+
+def test_changes_are_sent_in_one_batch(model, server):
+    actions = [model.sendData(model.index(row, 0), "changed%d" % row, "name") for row in range(3)]
+    assert model.sendData(model.index(0, 0), {"extra": 1}) is actions[0]
+    assert model.pendingDataChangesCount() == 3
+    assert name(model, 1) == "changed1"  # Изменение видно сразу, до ответа сервера.
+    assert spin(3000, lambda: all(action.isFinished() for action in actions))
+    assert not any(action.isError() for action in actions)
+    assert server.patches == [[{"name": "changed0", "extra": 1, "id": "root-1-0"},
+                               {"name": "changed1", "id": "root-1-1"},
+                               {"name": "changed2", "id": "root-1-2"}]]
+    assert model.pendingDataChangesCount() == 0
+
+
+def test_failed_sending_is_rolled_back(model, server):
+    server.failPatches = True
+    first = model.sendData(model.index(0, 0), {"name": "bad", "new": 5})
+    second = model.sendData(model.index(1, 0), "bad", "name")
+    model.sendPendingData()
+    later = model.sendData(model.index(1, 0), "later", "name")  # Изменение поверх уже отправленного.
+    assert spin(3000, lambda: first.isFinished() and second.isFinished())
+    assert first.isError() and second.isError()
+    assert model.data(model.index(0, 0), Vns.ItemDataRole.ItemDict) == {"id": "root-1-0", "name": "n0"}
+    assert name(model, 1) == "later"
+    waitFor(later)
+    assert later.isError() and name(model, 1) == "n1"
+
+
+def test_sending_survives_batched_data_changes(model, server):
+    changed = []
+    model.dataChanged.connect(lambda topLeft, bottomRight: changed.append((topLeft.row(), bottomRight.row())))
+    with model._dataChangedBatch():
+        actions = [model.sendData(model.index(row, 0), "changed", "name") for row in range(2)]
+        assert model.pendingDataChangesCount() == 2
+    assert changed == [(0, 1)]
+    assert model.pendingDataChangesCount() == 2
+
+    # Пакетная загрузка подробных данных тоже пакетирует dataChanged, пока изменения ждут отправки.
+    details = waitFor(model.reloadDetailsFor([model.index(row, 0) for row in range(5)]))
+    assert not details.isError()
+    assert spin(3000, lambda: all(action.isFinished() for action in actions))
+    assert not any(action.isError() for action in actions)
+    assert server.patches == [[{"name": "changed", "id": "root-1-0"}, {"name": "changed", "id": "root-1-1"}]]
+    assert name(model, 0) == "changed"
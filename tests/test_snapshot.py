@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import json
+import zlib
+
+import pytest
+
+from support import ListModel, TreeModel, VNetworkData, Vns, spin, waitFor
+
+TEMPLATE = VNetworkData.VChildrenLoadingTemplate(Vns.LoadingPolicy.Manually, VNetworkData.VAllTogetherPagination)
+
+
+class SnapshotModel(TreeModel):
+    createdItems = 0
+
+    def _createItem(self, rawDict: dict, columns: int = None):
+        self.createdItems += 1
+        return super()._createItem(rawDict, columns)
+
+
+class BytesModel(SnapshotModel):
+    def _prepareItemDict(self, rawDict: dict) -> dict:
+        return dict(rawDict, raw=rawDict["id"].encode())  # Байты не представимы в JSON.
+
+
+class TemplateModel(ListModel):
+    def _createItem(self, rawDict: dict, columns: int = None):
+        item = super()._createItem(rawDict, columns)
+        item.setData(TEMPLATE, Vns.ItemDataRole._ChildrenLoadingInfo)
+        return item
+
+
+class CustomPagination(VNetworkData.VAllTogetherPagination):
+    """Пагинация наследника, не переопределяющая методы сохранения состояния."""
+
+    _saveState = VNetworkData.VAbstractPagination._saveState
+    _restoreState = VNetworkData.VAbstractPagination._restoreState
+
+
+class BrokenPagination(VNetworkData.VAllTogetherPagination):
+    def _saveState(self) -> dict:
+        raise RuntimeError("broken")
+
+
+@pytest.fixture
+def model(server):
+    server.pageCount = 2
+    model = SnapshotModel(server, pagination=VNetworkData.VPagesAccumulationPagination)
+    waitFor(model.loadNextChildren())
+    parent = model.index(0, 0)
+    waitFor(model.loadNextChildren(parent))
+    waitFor(model.reloadDetails(parent))
+    return model
+
+
+def readSnapshot(path) -> dict:
+    data = path.read_bytes()
+    assert data.startswith(VNetworkData.VAbstractNetworkDataModel.SNAPSHOT_MAGIC)
+    return json.loads(zlib.decompress(data[len(VNetworkData.VAbstractNetworkDataModel.SNAPSHOT_MAGIC):]))
+
+
+def test_snapshot_round_trip(model, server, tmp_path):
+    path = tmp_path / "snapshot"
+    assert model.saveSnapshot(str(path))
+    assert readSnapshot(path)["rows"][0]["item"] == model.data(model.index(0, 0), Vns.ItemDataRole.ItemDict)
+
+    restored = SnapshotModel(server, pagination=VNetworkData.VPagesAccumulationPagination)
+    server.hits.clear()
+    assert restored.restoreSnapshot(str(path), revalidate=False)
+    assert restored.createdItems == 0  # Словари снимка уже обработаны, поэтому _createItem() не вызывается.
+    assert restored.rowCount() == 3
+    parent = restored.index(0, 0)
+    assert restored.rowCount(parent) == 3
+    assert restored.hasLoadedDetails(parent) and not restored.hasLoadedDetails(restored.index(1, 0))
+    assert restored.detailsValidators(parent) == model.detailsValidators(model.index(0, 0))
+    assert restored.childrenValidators(parent) == {b"ETag": b'"root-1-0-1"'}
+    assert restored.childrenPagination().getCurrentPage() == 1
+    assert restored.canLoadNextChildren()
+    assert restored.canReloadChildren(restored.index(1, 0))
+    spin(100)
+    assert not server.hits
+
+    waitFor(restored.loadNextChildren())
+    assert restored.rowCount() == 6
+
+
+def test_snapshot_templates_stay_shared(server, tmp_path):
+    server.pageCount = 1
+    model = TemplateModel(server)
+    waitFor(model.loadNextChildren())
+    waitFor(model.loadNextChildren(model.index(0, 0)))
+    path = str(tmp_path / "snapshot")
+    assert model.saveSnapshot(path)
+
+    restored = TemplateModel(server)
+    assert restored.restoreSnapshot(path, revalidate=False)
+    infos = [restored._mapToLocal(restored.index(row, 0)).data(Vns.ItemDataRole._ChildrenLoadingInfo)
+             for row in range(3)]
+    assert isinstance(infos[0], VNetworkData.VChildrenLoadingInfo)
+    assert infos[1] is infos[2] and isinstance(infos[1], VNetworkData.VChildrenLoadingTemplate)
+    assert restored.rowCount(restored.index(0, 0)) == 3
+
+
+def test_custom_pagination_without_saved_state(model, server, tmp_path):
+    model._getChildrenLoadingInfo(model.index(1, 0)).pagination = CustomPagination()
+    path = str(tmp_path / "snapshot")
+    assert model.saveSnapshot(path)
+    restored = SnapshotModel(server, pagination=VNetworkData.VPagesAccumulationPagination)
+    assert restored.restoreSnapshot(path, revalidate=False)
+    assert isinstance(restored.childrenPagination(restored.index(1, 0)), CustomPagination)
+
+
+def test_failed_save_keeps_previous_snapshot(model, tmp_path):
+    path = tmp_path / "snapshot"
+    assert model.saveSnapshot(str(path))
+    previous = path.read_bytes()
+
+    info = model._getChildrenLoadingInfo(model.index(0, 0))
+    pagination, info.pagination = info.pagination, BrokenPagination()
+    info.pagination._setLoaded(True)
+    assert not model.saveSnapshot(str(path))
+    info.pagination = pagination
+    assert path.read_bytes() == previous
+    assert not (tmp_path / "snapshot.tmp").exists()
+
+
+def test_item_dicts_not_representable_in_json_are_not_saved(server, tmp_path):
+    server.pageCount = 1
+    model = BytesModel(server, pagination=VNetworkData.VPagesAccumulationPagination)
+    waitFor(model.loadNextChildren())
+    assert not model.saveSnapshot(str(tmp_path / "snapshot"))
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("paginationClass", ["os:system", "not_imported_module:Pagination", "builtins:dict"])
+def test_tampered_snapshot_is_rejected(model, server, tmp_path, paginationClass):
+    path = tmp_path / "snapshot"
+    assert model.saveSnapshot(str(path))
+    snapshot = readSnapshot(path)
+    snapshot["rows"][2]["children"]["paginationClass"] = paginationClass
+    path.write_bytes(VNetworkData.VAbstractNetworkDataModel.SNAPSHOT_MAGIC
+            + zlib.compress(json.dumps(snapshot).encode("utf-8")))
+
+    restored = SnapshotModel(server, pagination=VNetworkData.VPagesAccumulationPagination)
+    waitFor(restored.loadNextChildren())
+    assert not restored.restoreSnapshot(str(path), revalidate=False)
+    assert restored.rowCount() == 3 and restored.rowCount(restored.index(0, 0)) == 0
+
+
+def test_missing_snapshot_is_not_an_error(model, tmp_path, capsys):
+    assert not model.restoreSnapshot(str(tmp_path / "missing"))
+    assert model.rowCount() == 3
+    assert capsys.readouterr().err == ""
+
+    path = tmp_path / "corrupt"
+    path.write_bytes(VNetworkData.VAbstractNetworkDataModel.SNAPSHOT_MAGIC + b"not zlib")
+    assert not model.restoreSnapshot(str(path))
+    assert "Traceback" in capsys.readouterr().err  # Испорченный снимок по-прежнему сообщает об ошибке.
@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+from PyQt5.QtCore import QModelIndex
+
+from support import TreeModel, VNetworkData, Vns, spin
+
+
+def loadingStates(model, parent=QModelIndex()):
+    states = [model.childrenLoadingState(parent)]
+    for row in range(model.rowCount(parent)):
+        states.extend(loadingStates(model, model.index(row, 0, parent)))
+    return states
+
+
+def test_subtree_is_loaded(server):
+    server.pageCount = 2
+    model = TreeModel(server, pagination=VNetworkData.VPagesAccumulationPagination)
+    action = model.loadSubtree(maxDepth=2)
+    assert spin(5000, action.isFinished)
+    assert not action.isError()
+    assert model.rowCount() == 6
+    assert all(model.rowCount(model.index(row, 0)) == 3 for row in range(model.rowCount()))
+
+
+def test_cancel_before_start(server):
+    model = TreeModel(server, pagination=VNetworkData.VPagesAccumulationPagination)
+    action = model.loadSubtree()
+    action.cancel()
+    assert action.isFinished() and action.errorType() == Vns.ErrorType.CanceledError
+    spin(200)
+    assert not server.hits
+    model.childrenLoadingFinished.emit(QModelIndex())  # Действие уже отключено от модели.
+
+
+def test_cancel_running_loads_without_model_errors(server):
+    server.pageCount = 2
+    server.delay = 0.2
+    model = TreeModel(server, pagination=VNetworkData.VPagesAccumulationPagination)
+    model.loadNextChildren()
+    assert spin(3000, lambda: model.rowCount() > 0)
+    errors = []
+    model.errorOccurred.connect(lambda: errors.append(model.errorType()))
+    action = model.loadSubtree(maxConcurrency=3)
+    assert spin(3000, lambda: Vns.LoadingState.Loading in loadingStates(model))
+    action.cancel()
+    assert action.errorType() == Vns.ErrorType.CanceledError
+    spin(500)
+    assert not errors
+    assert Vns.LoadingState.Loading not in loadingStates(model)
+    assert Vns.LoadingState.Error not in loadingStates(model)
+    assert not model._actions()
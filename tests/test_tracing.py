@@ -0,0 +1,30 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+from support import ListModel, VNetworkData, waitFor
+
+
+def test_span_arguments_are_computed_only_when_tracing(server, monkeypatch):
+    server.pageCount = 1
+    model = ListModel(server, pagination=VNetworkData.VAllTogetherPagination)
+    spans = []
+    traceSpan = model._traceSpan
+
+    def recordSpan(name, *args, **kwargs):
+        span = traceSpan(name, *args, **kwargs)
+        spans.append((name, span.isEnabled()))
+        return span
+
+    monkeypatch.setattr(model, "_traceSpan", recordSpan)
+    waitFor(model.loadNextChildren())
+    assert ("decode", False) in spans and all(not enabled for name, enabled in spans)
+
+    tracer = VNetworkData.VActionTracer()
+    model.setTracer(tracer)
+    waitFor(model.reloadChildren())
+    decodes = [event for event in tracer.events() if event['name'] == "decode"]
+    assert decodes and all(event['args']['bytes'] > 0 for event in decodes)
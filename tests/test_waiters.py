@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""
+Этот файл принадлежит проекту "VNetworkData".
+Автор: Волков Семён.
+"""
+import time
+
+import pytest
+
+from PyQt5.QtCore import QCoreApplication, QEvent
+
+from support import TreeModel, VNetworkData, Vns, spin, waitFor
+
+
+@pytest.fixture
+def model(server):
+    server.pageCount = 1
+    return TreeModel(server, pagination=VNetworkData.VAllTogetherPagination)
+
+
+def test_waiter_is_resolved_when_load_finishes(model, server):
+    ready = model.whenCanLoadNextChildren()
+    assert ready.isRunning()  # Даже доступная загрузка завершает ожидание отложенно.
+    waitFor(ready)
+    assert ready.isFinished() and not ready.isError()
+
+    server.delay = 0.2
+    load = model.loadNextChildren()
+    waiters = [model.whenCanReloadChildren(), model.whenCanReloadChildren()]
+    spin(100)
+    assert all(waiter.isRunning() for waiter in waiters)
+    waitFor(load)
+    assert spin(1000, lambda: all(waiter.isFinished() for waiter in waiters))
+    assert not any(waiter.isError() for waiter in waiters)
+    assert model.canReloadChildren()
+
+
+def test_waiters_time_out_by_their_deadlines(model, server):
+    server.delay = 0.6
+    load = model.loadNextChildren()
+    startedAt = time.monotonic()
+    later = model.whenCanReloadChildren(timeout=200)
+    sooner = model.whenCanReloadChildren(timeout=50)
+    unlimited = model.whenCanReloadChildren()
+    expired = dict()
+    for waiter in (sooner, later):
+        waiter.finished.connect(lambda waiter=waiter: expired.setdefault(waiter, time.monotonic() - startedAt))
+
+    assert spin(1000, sooner.isFinished)
+    assert later.isRunning()
+    assert sooner.errorType() == Vns.ErrorType.TimeoutError
+    assert spin(1000, later.isFinished)
+    assert later.errorType() == Vns.ErrorType.TimeoutError
+    assert 0.05 <= expired[sooner] < expired[later] < 0.5
+    assert unlimited.isRunning()
+
+    waitFor(load)
+    assert spin(1000, unlimited.isFinished) and not unlimited.isError()
+
+
+def test_waiters_of_removed_item_are_invalidated(model, server):
+    waitFor(model.loadNextChildren())
+    server.delay = 0.3
+    model.loadNextChildren(model.index(0, 0))
+    waiter = model.whenCanReloadChildren(model.index(0, 0), timeout=500)
+    other = model.whenCanReloadChildren(model.index(1, 0))
+    model._removeRow(0)
+    assert not waiter.isValid()
+    waitFor(other)
+    assert other.isFinished() and not other.isError()
+    spin(600)  # Истекший крайний срок удаленного ожидания ни к чему не приводит.
+
+
+def test_model_destroyed_while_waiting(model, server):
+    server.delay = 0.3
+    model.loadNextChildren()
+    futures = [model.whenCanReloadChildren(timeout=100).toConcurrentFuture(),
+               model.whenCanReloadChildren().toConcurrentFuture()]
+    model.deleteLater()
+    del model
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    assert spin(1000, lambda: all(future.done() for future in futures))
+    assert all(future.cancelled() for future in futures)
+    spin(500)  # Ни таймер крайних сроков, ни ответ на запрос удаленной модели не должны приводить к ошибкам.